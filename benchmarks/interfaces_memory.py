@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+import gc
+import tracemalloc
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional
+
+import click
+from lxml import etree
+from lxml.etree import _Element  # noqa
+
+from eznet.inventory.device.info.interfaces import Interface
+from eznet.parsers.xml import text, number
+
+
+# layout of info/interfaces.py models before __slots__ and interning
+@dataclass
+class LegacyAF:
+    address: Optional[str]
+    network: Optional[str]
+
+
+@dataclass
+class LegacyUnitTraffic:
+    input_packets: Optional[int]
+    output_packets: Optional[int]
+
+
+@dataclass
+class LegacyUnit:
+    description: Optional[str]
+    family: Dict[Optional[str], LegacyAF]
+    traffic: LegacyUnitTraffic
+
+
+@dataclass
+class LegacyTraffic:
+    input_bps: Optional[int]
+    input_pps: Optional[int]
+    output_bps: Optional[int]
+    output_pps: Optional[int]
+
+
+@dataclass
+class LegacyInterface:
+    admin: Optional[str]
+    oper: Optional[str]
+    description: Optional[str]
+    speed: Optional[str]
+    units: Dict[int, LegacyUnit]
+    traffic: LegacyTraffic
+    ae: Optional[str]
+
+
+def legacy_from_xml(xml: _Element) -> LegacyInterface:
+    return LegacyInterface(
+        admin=text(xml, "admin-status"),
+        oper=text(xml, "oper-status"),
+        description=text(xml, "description"),
+        speed=text(xml, "speed"),
+        units={
+            int(f"{text(e, 'name')}".split(".")[1]): LegacyUnit(
+                description=text(e, "description"),
+                family={
+                    text(af, "address-family-name"): LegacyAF(
+                        address=text(af, "interface-address/ifa-local"),
+                        network=text(af, "interface-address/ifa-destination"),
+                    )
+                    for af in e.findall("address-family")
+                },
+                traffic=LegacyUnitTraffic(
+                    input_packets=number(e, "traffic-statistics/input-packets"),
+                    output_packets=number(e, "traffic-statistics/output-packets"),
+                ),
+            )
+            for e in xml.findall("logical-interface")
+        },
+        traffic=LegacyTraffic(
+            input_bps=number(xml, "traffic-statistics/input-bps"),
+            input_pps=number(xml, "traffic-statistics/input-pps"),
+            output_bps=number(xml, "traffic-statistics/output-bps"),
+            output_pps=number(xml, "traffic-statistics/output-pps"),
+        ),
+        ae=None,
+    )
+
+
+def show_interfaces(interfaces: int, units: int) -> _Element:
+    root = etree.Element("rpc-reply")
+    info = etree.SubElement(root, "interface-information")
+    for i in range(interfaces):
+        ifd = etree.SubElement(info, "physical-interface")
+        for tag, value in [
+            ("name", f"et-0/0/{i}"),
+            ("admin-status", "up"),
+            ("oper-status", "up" if i % 2 else "down"),
+            ("description", f"link to peer {i}"),
+            ("speed", "100Gbps"),
+        ]:
+            etree.SubElement(ifd, tag).text = value
+        stats = etree.SubElement(ifd, "traffic-statistics")
+        for tag in ["input-bps", "input-pps", "output-bps", "output-pps"]:
+            etree.SubElement(stats, tag).text = f"{i * 1000}"
+        for u in range(units):
+            ifl = etree.SubElement(ifd, "logical-interface")
+            etree.SubElement(ifl, "name").text = f"et-0/0/{i}.{u}"
+            etree.SubElement(ifl, "description").text = f"vlan {u}"
+            af = etree.SubElement(ifl, "address-family")
+            etree.SubElement(af, "address-family-name").text = "inet"
+            address = etree.SubElement(af, "interface-address")
+            etree.SubElement(address, "ifa-local").text = f"10.{i // 256 % 256}.{i % 256}.{u % 256}"
+            etree.SubElement(address, "ifa-destination").text = f"10.{i // 256 % 256}.{i % 256}.0/24"
+            stats = etree.SubElement(ifl, "traffic-statistics")
+            etree.SubElement(stats, "input-packets").text = f"{u}"
+            etree.SubElement(stats, "output-packets").text = f"{u}"
+    return root
+
+
+def measure(xml: _Element, from_xml: Callable[[_Element], Any]) -> int:
+    gc.collect()
+    tracemalloc.start()
+    snapshot = tracemalloc.take_snapshot()
+    interfaces = {
+        f"{text(e, 'name')}": from_xml(e)
+        for e in xml.findall("interface-information/physical-interface")
+    }
+    size = sum(stat.size_diff for stat in tracemalloc.take_snapshot().compare_to(snapshot, "filename"))
+    tracemalloc.stop()
+    del interfaces
+    return size
+
+
+@click.command()
+@click.option("--interfaces", "-n", default=2000, show_default=True)
+@click.option("--units", "-u", default=8, show_default=True)
+def main(interfaces: int, units: int) -> None:
+    xml = show_interfaces(interfaces, units)
+    legacy = measure(xml, legacy_from_xml)
+    compact = measure(xml, Interface.from_xml)
+    print(f"{interfaces} interfaces x {units} units")
+    print(f"legacy dataclasses:  {legacy:>14,} bytes")
+    print(f"slotted + interned:  {compact:>14,} bytes  ({compact / legacy:.0%})")
+
+
+if __name__ == "__main__":
+    main()
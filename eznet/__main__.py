@@ -4,9 +4,9 @@ from __future__ import annotations
 
 import asyncio
 from datetime import datetime
-from time import sleep
+import sys
+from time import monotonic, sleep
 from typing import Callable, Dict, Any, List, Iterable, Optional, Union, Tuple
-import fnmatch
 from pathlib import Path
 import logging
 
@@ -15,7 +15,17 @@ from rich.console import Console
 
 from eznet import Device, Inventory
 from eznet import tables
+from eznet.inventory import SelectorError
+from eznet import planner
+from eznet.data import Data
+from eznet import stream
+from eznet.dashboard import Dashboard
 from eznet.logger import config_logger
+from eznet.store import Store
+from eznet.journal import Journal, DEFAULT_JOBS_PATH, DEFAULT_JOB_RETENTION
+from eznet.scheduler import Scheduler, DEFAULT_INTERVALS
+from eznet.inventory.watcher import Diff, Watcher
+from eznet.inventory.device.drivers.ssh import extend_connections, limit_connections
 
 JOB_TS_FORMAT = "%Y%m%d-%H%M%S"
 
@@ -25,7 +35,9 @@ JOB_TS_FORMAT = "%Y%m%d-%H%M%S"
     "--inventory", "-i", help="Inventory path", required=True, type=click.types.Path(exists=True),
 )
 @click.option(
-    "--device", "-d", "devices_id", help="device id filter", default=("*",), multiple=True,
+    "--device", "-d", "devices_id", default=("*",), multiple=True,
+    help="device selector: id glob, site:<glob>, model:<glob>, tag:<tag>, vars.<path>=<glob>; "
+         "space separated terms are joined with AND, `!` negates a term",
 )
 @click.option(
     "--terminal/--no-terminal", "-t", "force_terminal", help="force terminale", default=None,
@@ -41,6 +53,55 @@ JOB_TS_FORMAT = "%Y%m%d-%H%M%S"
     "--error-if-any/--no-error-if-any", help="exit code 2 if connect error to ANY device",
     default=False, show_default=True,
 )
+@click.option(
+    "--store", "-s", "store_path", help="snapshot store path", type=click.types.Path(),
+)
+@click.option(
+    "--offline/--no-offline", help="do not connect to devices, show data from snapshot store",
+    default=False, show_default=True,
+)
+@click.option(
+    "--cache/--no-cache", "inventory_cache", help="cache parsed inventory files",
+    default=True, show_default=True,
+)
+@click.option(
+    "--daemon/--no-daemon",
+    help="keep connections open and poll data on intervals until interrupted, inventory changes are applied",
+    default=False, show_default=True,
+)
+@click.option(
+    "--poll", "polls", multiple=True, metavar="NAME=SECONDS",
+    help="daemon poll interval of data (0 disables), "
+         f"defaults: {', '.join(f'{name}={interval}' for name, interval in DEFAULT_INTERVALS.items())}",
+)
+@click.option(
+    "--max-connections", help="daemon max open connections [default: number of devices]", type=int,
+)
+@click.option(
+    "--stream", "stream_format", type=click.Choice(["json", "table"]),
+    help="write results of every device as soon as it is processed: "
+         "json lines to stdout (console and logs go to stderr) or table rows",
+)
+@click.option(
+    "--journal/--no-journal", "use_journal",
+    help="record completed devices and fetches of job to resume it, results go to job store if --store is not set, "
+         "job is removed when all devices are done",
+    default=False, show_default=True,
+)
+@click.option(
+    "--jobs-path", help="job journals path", type=click.types.Path(), default=f"{DEFAULT_JOBS_PATH}", show_default=True,
+)
+@click.option(
+    "--jobs-retention", metavar="DAYS", help="remove unfinished jobs not updated for this number of days",
+    type=float, default=DEFAULT_JOB_RETENTION / 86400, show_default=True,
+)
+@click.option(
+    "--resume", "resume_job", metavar="JOB", help="resume interrupted job, completed devices and fetches are skipped",
+)
+@click.option(
+    "--dashboard/--no-dashboard", help="live view of job progress, only warnings are logged",
+    default=False, show_default=True,
+)
 def run(
     inventory: Union[Inventory, str, Path],
     devices_id: Optional[Tuple[str, ...]],
@@ -48,41 +109,194 @@ def run(
     width: Optional[int] = None,
     error_if_all: bool = True,
     error_if_any: bool = False,
+    store_path: Optional[str] = None,
+    offline: bool = False,
+    inventory_cache: bool = True,
+    daemon: bool = False,
+    polls: Tuple[str, ...] = (),
+    max_connections: Optional[int] = None,
+    stream_format: Optional[str] = None,
+    use_journal: bool = False,
+    jobs_path: Union[str, Path] = DEFAULT_JOBS_PATH,
+    jobs_retention: float = DEFAULT_JOB_RETENTION / 86400,
+    resume_job: Optional[str] = None,
+    dashboard: bool = False,
 ) -> None:
     console = Console(
         force_terminal=force_terminal,
         width=width,
+        stderr=stream_format == "json",
     )
     config_logger(
-        logging.INFO,
+        logging.WARNING if dashboard else logging.INFO,
         force_terminal=force_terminal,
         width=width,
+        stderr=stream_format == "json",
     )
+    streamer: Optional[stream.Stream] = None
+    if stream_format == "json":
+        streamer = stream.JsonLines(sys.stdout)
+    elif stream_format == "table":
+        streamer = stream.Rows(console)
 
     if not isinstance(inventory, Inventory):
-        inventory = Inventory().load(inventory)
+        inventory = Inventory().load(inventory, cache=inventory_cache)
+
+    try:
+        devices = inventory.select(*devices_id) if devices_id is not None else inventory.devices
+    except SelectorError as err:
+        console.print(f"[white on red]{err}")
+        raise SystemExit(1)
+    # only selected devices are validated, invalid ones are excluded from job
+    invalid = inventory.validate(devices)
+    selected = {device.id for device in devices if device.id not in invalid}
 
     def device_filter(device: Device) -> bool:
-        return devices_id is None or any(fnmatch.fnmatch(device.id, device_id) for device_id in devices_id)
+        return device.id in selected
+
+    intervals = dict(DEFAULT_INTERVALS)
+    for poll in polls:
+        name, _, seconds = poll.partition("=")
+        try:
+            intervals[name] = float(seconds)
+        except ValueError:
+            console.print(f"[white on red]wrong poll interval `{poll}`")
+            raise SystemExit(1)
+    intervals = {name: interval for name, interval in intervals.items() if interval > 0}
+    if unknown := set(intervals) - {data.name for data in Device(name="").info}:
+        console.print(f"[white on red]unknown data to poll: {', '.join(sorted(unknown))}")
+        raise SystemExit(1)
+
+    if offline and store_path is None:
+        console.print("[white on red]--offline requires --store")
+        raise SystemExit(1)
+    if resume_job is not None and not Journal.exists(jobs_path, resume_job):
+        console.print(f"[white on red]no journal of job `{resume_job}` in {jobs_path}")
+        raise SystemExit(1)
 
     time_start = datetime.now()
-    job_name = time_start.strftime(JOB_TS_FORMAT)
-    console.print(f"{job_name}: [black on white]job started at {time_start}")
+    job_name = resume_job or time_start.strftime(JOB_TS_FORMAT)
+
+    # daemon has no completion to record
+    journal: Optional[Journal] = None
+    if resume_job is not None or (use_journal and not offline and not daemon):
+        for name in Journal.cleanup(jobs_path, jobs_retention * 86400, keep=job_name):
+            console.print(f"{name}: expired job removed")
+        journal = Journal(jobs_path, job_name)
+        # results of skipped fetches of resumed job are loaded from the store
+        if store_path is None:
+            store_path = f"{journal.store_path}"
+
+    store: Optional[Store] = None
+    if store_path is not None:
+        store = Store(store_path)
+        store.attach(device for device in inventory.devices if device_filter(device))
+
+    if resume_job is not None:
+        console.print(f"{job_name}: [black on white]job resumed at {time_start}")
+    else:
+        console.print(f"{job_name}: [black on white]job started at {time_start}")
+
+    def fetch_kwargs(device: Device, name: str) -> Dict[str, Any]:
+        if name == "interfaces":
+            return {"names": tuple(device.vars.interface_names()) or None}
+        return {}
 
     async def main() -> None:
         async def process(device: Device) -> None:
+            if journal is not None and journal.done(device.id):
+                return
+            targets: List[planner.Target] = [
+                device.info.system.info,
+                device.info.system.alarms,
+                device.info.system.sw,
+                device.info.system.uptime,
+                device.info.system.coredumps,
+                device.info.lldp.neighbors,
+                device.info.lldp.local,
+                (device.info.interfaces, fetch_kwargs(device, "interfaces")),
+            ]
+            if journal is not None:
+                targets = [
+                    target for target in targets
+                    if not journal.done(device.id, (target[0] if isinstance(target, tuple) else target).name)
+                ]
+
+            def done(data: Data[Any, Any]) -> None:
+                if journal is not None:
+                    journal.mark(device.id, data.name)
+
             if device.ssh:
                 async with device.ssh:
-                    await device.info.system.info.fetch()
-                    await device.info.system.alarms.fetch()
-                    await device.info.system.sw.fetch()
-                    await device.info.system.uptime.fetch()
-                    await device.info.system.coredumps.fetch()
-                    await device.info.interfaces.fetch()
+                    results = await planner.fetch(targets, done=done)
+                # fetches without data are retried on resume
+                if journal is not None and all(result is not None for result in results.values()):
+                    journal.mark(device.id)
+
+        async def process_stream(device: Device) -> None:
+            t0 = monotonic()
+            try:
+                await process(device)
+            except Exception as err:
+                if streamer is not None:
+                    streamer.device(device, err, monotonic() - t0)
+                raise
+            if streamer is not None:
+                streamer.device(device, None, monotonic() - t0)
 
+        dashboard_task: Optional[asyncio.Task[None]] = None
         try:
+            if offline:
+                return
+
+            if dashboard:
+                dashboard_task = asyncio.create_task(
+                    Dashboard((device for device in inventory.devices if device_filter(device)), console).run()
+                )
+
+            if daemon:
+                polled = [device for device in inventory.devices if device_filter(device)]
+                connections = max_connections or max(len(polled), 1)
+                limit_connections(connections)
+                scheduler = Scheduler(intervals, kwargs=fetch_kwargs)
+
+                def disconnect(devices: Iterable[Device]) -> None:
+                    for device in devices:
+                        if device.loaded("ssh") and device.ssh is not None:
+                            device.ssh.disconnect()
+
+                def reload(diff: Diff) -> None:
+                    # selector is applied again to reloaded inventory,
+                    # removed and replaced devices are dropped from scheduler and disconnected
+                    nonlocal connections
+                    try:
+                        devices = inventory.select(*devices_id) if devices_id is not None else inventory.devices
+                    except SelectorError as err:
+                        console.print(f"[white on red]{err}")
+                        return
+                    invalid = inventory.validate(devices)
+                    polled = {device.id: device for device in devices if device.id not in invalid}
+                    dropped = [device for device in scheduler.devices.values() if polled.get(device.id) is not device]
+                    scheduler.remove(dropped)
+                    scheduler.add(polled.values())
+                    disconnect(dropped)
+                    selected.clear()
+                    selected.update(polled)
+                    if max_connections is None and len(polled) > connections:
+                        extend_connections(len(polled) - connections)
+                        connections = len(polled)
+
+                watch_task = asyncio.create_task(Watcher(inventory).watch(reload))
+                try:
+                    await scheduler.run(polled)
+                finally:
+                    watch_task.cancel()
+                    await asyncio.gather(watch_task, return_exceptions=True)
+                    disconnect(scheduler.devices.values())
+                return
+
             errors = [ret is not None for ret in await asyncio.gather(*(
-                process(device) for device in inventory.devices if device_filter(device)
+                process_stream(device) for device in inventory.devices if device_filter(device)
             ), return_exceptions=True)]
 
             if error_if_all and all(errors):
@@ -94,10 +308,20 @@ def run(
             console.print()
 
         finally:
-            console.print(tables.inventory.DevStatus(inventory, device_filter=device_filter))
-            console.print(tables.inventory.DevSummary(inventory, device_filter=device_filter))
-            console.print(tables.inventory.DevAlarms(inventory, device_filter=device_filter))
-            console.print(tables.inventory.DevInterfaces(inventory, device_filter=device_filter))
+            if dashboard_task is not None:
+                dashboard_task.cancel()
+                await asyncio.gather(dashboard_task, return_exceptions=True)
+            if streamer is not None:
+                # status and summary were streamed as rows
+                if stream_format == "table":
+                    console.print(tables.inventory.DevAlarms(inventory, device_filter=device_filter))
+                    console.print(tables.inventory.DevInterfaces(inventory, device_filter=device_filter))
+                streamer.summary((datetime.now() - time_start).total_seconds())
+            else:
+                console.print(tables.inventory.DevStatus(inventory, device_filter=device_filter))
+                console.print(tables.inventory.DevSummary(inventory, device_filter=device_filter))
+                console.print(tables.inventory.DevAlarms(inventory, device_filter=device_filter))
+                console.print(tables.inventory.DevInterfaces(inventory, device_filter=device_filter))
 
     try:
         asyncio.run(main())
@@ -105,6 +329,15 @@ def run(
         console.print(f"{job_name}: [white on red]keyboard interrupted")
         raise SystemExit(130)
     finally:
+        if journal is not None:
+            journal.close()
+        if store is not None:
+            store.close()
+        if journal is not None:
+            if all(journal.done(device.id) for device in inventory.devices if device_filter(device)):
+                journal.remove()
+            else:
+                console.print(f"{job_name}: resume with `--resume {job_name}`")
         time_stop = datetime.now()
         console.print(f"{job_name}: [black on white]job finished at {time_stop}")
 
@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import dataclasses
+import fnmatch
+import logging
+from dataclasses import dataclass
+from enum import Enum, auto
+from typing import Any, Callable, Iterable, Iterator, List, Optional, Set, Tuple, Union, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from eznet import Device
+    from eznet.data import Data
+
+logger = logging.getLogger(__name__)
+
+Path = Tuple[Union[str, int], ...]
+
+
+class Kind(Enum):
+    ADDED = auto()
+    REMOVED = auto()
+    CHANGED = auto()
+
+    def __repr__(self) -> str:
+        return self.name
+
+    def __str__(self) -> str:
+        return self.name
+
+
+@dataclass
+class Change:
+    device: str
+    data: str
+    path: Path
+    kind: Kind
+    old: Any = None
+    new: Any = None
+
+    def __str__(self) -> str:
+        path = ".".join(f"{p}" for p in self.path)
+        return f"{self.device}: {self.data}{'.' + path if path else ''}: {self.kind}: {self.old} -> {self.new}"
+
+
+def diff(old: Any, new: Any, path: Path = ()) -> Iterator[Tuple[Path, Kind, Any, Any]]:
+    if old is None and new is None:
+        return
+    if old is None:
+        yield path, Kind.ADDED, None, new
+    elif new is None:
+        yield path, Kind.REMOVED, old, None
+    elif dataclasses.is_dataclass(old) and type(old) is type(new):
+        for f in dataclasses.fields(old):
+            yield from diff(getattr(old, f.name), getattr(new, f.name), path + (f.name,))
+    elif isinstance(old, dict) and isinstance(new, dict):
+        for key, value in old.items():
+            if key not in new:
+                yield path + (key,), Kind.REMOVED, value, None
+            else:
+                yield from diff(value, new[key], path + (key,))
+        for key, value in new.items():
+            if key not in old:
+                yield path + (key,), Kind.ADDED, None, value
+    elif isinstance(old, list) and isinstance(new, list):
+        # lists (alarms, core dumps) have no keys: compare them as sets of items
+        for i, value in enumerate(old):
+            if value not in new:
+                yield path + (i,), Kind.REMOVED, value, None
+        for i, value in enumerate(new):
+            if value not in old:
+                yield path + (i,), Kind.ADDED, None, value
+    elif old != new:
+        yield path, Kind.CHANGED, old, new
+
+
+Callback = Callable[["Data[Any, Any]", List[Change]], None]
+
+
+@dataclass(eq=False)
+class Subscription:
+    callback: Callback
+    names: Optional[List[str]] = None
+
+    def match(self, name: str) -> bool:
+        return self.names is None or any(fnmatch.fnmatch(name, pattern) for pattern in self.names)
+
+
+subscriptions: List[Subscription] = []
+
+
+def subscribe(callback: Callback, names: Optional[Iterable[str]] = None) -> Callable[[], None]:
+    subscription = Subscription(callback, None if names is None else list(names))
+    subscriptions.append(subscription)
+
+    def unsubscribe() -> None:
+        if subscription in subscriptions:
+            subscriptions.remove(subscription)
+
+    return unsubscribe
+
+
+def publish(data: Data[Any, Any], old: Any, new: Any) -> None:
+    if data.name is None:
+        return
+    targets = [subscription for subscription in subscriptions if subscription.match(data.name)]
+    if not targets:
+        return
+    changes = [
+        Change(f"{data.obj}", data.name, path, kind, old_value, new_value)
+        for path, kind, old_value, new_value in diff(old, new)
+    ]
+    if not changes:
+        return
+    for subscription in targets:
+        try:
+            subscription.callback(data, changes)
+        except Exception as err:
+            logger.error(f"changes: {data}: callback error: {err.__class__.__name__}: {err}")
+
+
+class Collector:
+    def __init__(self, names: Optional[Iterable[str]] = None) -> None:
+        self.changes: List[Change] = []
+        self.devices: Set[str] = set()
+        self.unsubscribe = subscribe(self.collect, names)
+
+    def collect(self, data: Data[Any, Any], changes: List[Change]) -> None:
+        self.changes.extend(changes)
+        self.devices.update(change.device for change in changes)
+
+    def device_filter(self, device: Device) -> bool:
+        return device.id in self.devices
+
+    def reset(self) -> None:
+        self.changes = []
+        self.devices = set()
+
+    def close(self) -> None:
+        self.unsubscribe()
@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import re as regexp
+from collections import defaultdict
+from pathlib import Path
+from time import time
+from typing import Dict, Iterable, List, Literal, Optional, Set, Tuple, Union
+
+from eznet import Device
+from eznet.inventory.device.info.system import CoreDump
+
+logger = logging.getLogger(__name__)
+
+# bytes of downloads started per second: asyncssh scp could not be throttled during transfer,
+# so this limits average bandwidth of many downloads, not speed of every transfer
+DEFAULT_START_RATE = 10 * 2 ** 20
+
+Key = Tuple[Optional[str], Optional[int], Optional[str], Optional[str], Optional[bool]]
+
+
+def core_key(core: CoreDump) -> Key:
+    return core.name, core.size, None if core.ts is None else core.ts.isoformat(), core.re, core.host
+
+
+class Tracker:
+    # per device index of already seen core dumps, optionally persisted as json
+    def __init__(self, path: Union[None, str, Path] = None) -> None:
+        self.path = Path(path).expanduser() if isinstance(path, str) else path
+        self.seen: Dict[str, Set[Key]] = defaultdict(set)
+        self.checksums: Dict[str, str] = {}
+        if self.path is not None and self.path.exists():
+            self.load()
+
+    def load(self) -> None:
+        assert self.path is not None
+        with open(self.path) as io:
+            data = json.load(io)
+        for device_id, keys in data.get("devices", {}).items():
+            self.seen[device_id] = {tuple(key) for key in keys}
+        self.checksums = data.get("checksums", {})
+
+    def save(self) -> None:
+        if self.path is None:
+            return
+        if not self.path.parent.exists():
+            self.path.parent.mkdir(parents=True)
+        with open(self.path, "w") as io:
+            json.dump({
+                "devices": {device_id: sorted(keys, key=str) for device_id, keys in self.seen.items()},
+                "checksums": self.checksums,
+            }, io, indent=2)
+
+    def new(self, device: Device, cores: Optional[Iterable[CoreDump]] = None, mark: bool = True) -> List[CoreDump]:
+        if cores is None:
+            cores = device.info.system.coredumps.v or []
+        seen = self.seen[device.id]
+        new_cores = [core for core in cores if core_key(core) not in seen]
+        if mark:
+            self.mark(device, new_cores)
+        return new_cores
+
+    def mark(self, device: Device, cores: Iterable[CoreDump]) -> None:
+        self.seen[device.id].update(core_key(core) for core in cores)
+
+    async def fetch(self, device: Device, both_re: bool = True, mark: bool = True) -> List[CoreDump]:
+        cores = await device.info.system.coredumps.fetch(both_re=both_re)
+        if cores is None:
+            return []
+        return self.new(device, cores, mark=mark)
+
+
+class StartRate:
+    # token bucket shared by all downloads of a job, the whole file size is taken when download starts
+    def __init__(self, rate: float = DEFAULT_START_RATE) -> None:
+        self.rate = rate
+        self.tokens = rate
+        self.ts = time()
+        self.lock = asyncio.Lock()
+
+    async def acquire(self, size: int) -> None:
+        async with self.lock:
+            while True:
+                now = time()
+                self.tokens = min(self.rate, self.tokens + (now - self.ts) * self.rate)
+                self.ts = now
+                # files bigger than the bucket wait for a full bucket
+                need = min(size, self.rate)
+                if self.tokens >= need:
+                    self.tokens -= size
+                    return
+                await asyncio.sleep((need - self.tokens) / self.rate)
+
+
+async def checksum(device: Device, core: CoreDump) -> Optional[str]:
+    if core.name is None:
+        return None
+    path = core.name
+    if core.host:
+        path = "/hostvar" + path[len("/var"):] if path.startswith("/var/") else path
+    if core.re is not None:
+        path = f"{core.re}:{path}"
+    output = await device.junos.run_cmd(f"file checksum sha-256 {path}")
+    if output is not None and (match := regexp.search(r"=\s*([0-9a-fA-F]{64})", output)) is not None:
+        return match.group(1).lower()
+    return None
+
+
+class Pipeline:
+    def __init__(
+        self,
+        tracker: Tracker,
+        path: Union[str, Path],
+        start_rate: float = DEFAULT_START_RATE,
+        dedupe: bool = True,
+    ) -> None:
+        self.tracker = tracker
+        self.path = Path(path)
+        self.start_rate = StartRate(start_rate)
+        self.dedupe = dedupe
+        # checksums of downloads in progress: the same core of other RE waits for the result
+        self.pending: Dict[str, asyncio.Future[bool]] = {}
+
+    async def download(self, device: Device, core: CoreDump, lock: asyncio.Lock) -> bool:
+        if core.name is None:
+            return False
+        async with lock:
+            if self.dedupe and (sha := await checksum(device, core)) is not None:
+                if sha not in self.tracker.checksums and (pending := self.pending.get(sha)) is not None:
+                    await asyncio.shield(pending)
+                if sha in self.tracker.checksums:
+                    logger.info(f"{device}: core `{core.name}` is a duplicate of {self.tracker.checksums[sha]}")
+                    return True
+                self.pending[sha] = asyncio.get_running_loop().create_future()
+            else:
+                sha = None
+            done = False
+            try:
+                await self.start_rate.acquire(core.size or 0)
+                local_path = self.path / device.id / (core.re or "") / ("host" if core.host else "")
+                re: Literal["re0", "re1", ""] = "re0" if core.re == "re0" else "re1" if core.re == "re1" else ""
+                done = await device.junos.download(core.name, local_path, re=re, host=bool(core.host))
+                if done and sha is not None:
+                    self.tracker.checksums[sha] = f"{local_path / Path(core.name).name}"
+            finally:
+                if sha is not None and (future := self.pending.pop(sha, None)) is not None:
+                    future.set_result(done)
+            return done
+
+    async def process(self, device: Device, both_re: bool = True) -> List[CoreDump]:
+        cores = await self.tracker.fetch(device, both_re=both_re, mark=False)
+        # downloads of one device run concurrently per RE and host
+        locks: Dict[Tuple[Optional[str], Optional[bool]], asyncio.Lock] = defaultdict(asyncio.Lock)
+        results = await asyncio.gather(*(
+            self.download(device, core, locks[core.re, core.host]) for core in cores
+        ))
+        done = [core for core, result in zip(cores, results) if result]
+        self.tracker.mark(device, done)
+        return done
+
+    async def run(self, devices: Iterable[Device], both_re: bool = True) -> Dict[str, List[CoreDump]]:
+        devices = list(devices)
+        results = await asyncio.gather(
+            *(self.process(device, both_re=both_re) for device in devices), return_exceptions=True,
+        )
+        self.tracker.save()
+        done: Dict[str, List[CoreDump]] = {}
+        for device, result in zip(devices, results):
+            if isinstance(result, BaseException):
+                logger.error(f"{device}: core dumps: {result.__class__.__name__}: {result}")
+            else:
+                done[device.id] = result
+        return done
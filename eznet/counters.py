@@ -0,0 +1,210 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import re as regexp
+from time import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import numpy.typing as npt
+from lxml.etree import _Element  # noqa
+
+from eznet import Device
+from eznet.inventory.device.drivers.base import ConnectError
+
+logger = logging.getLogger(__name__)
+
+COUNTERS = {
+    "input_bytes": "traffic-statistics/input-bytes",
+    "output_bytes": "traffic-statistics/output-bytes",
+    "input_packets": "traffic-statistics/input-packets",
+    "output_packets": "traffic-statistics/output-packets",
+    "input_errors": "input-error-list/input-errors",
+    "output_errors": "output-error-list/output-errors",
+}
+COUNTER_INDEX = {name: i for i, name in enumerate(COUNTERS)}
+# junos counters are 64 bit: uint64 arithmetic corrects wraps,
+# a delta above this threshold is a counter reset (clear or reboot)
+COUNTER_RESET_THRESHOLD = 2 ** 63
+
+INTERFACE_PREFIXES = ("ae", "ge", "xe", "et")
+
+DEFAULT_DEPTH = 60
+DEFAULT_INTERVAL = 60
+
+SPEED_UNITS = {"": 1, "k": 10 ** 3, "m": 10 ** 6, "g": 10 ** 9, "t": 10 ** 12}
+
+
+def speed_bps(speed: Optional[str]) -> Optional[int]:
+    # junos speed format: `10Gbps`, `100mbps`, `1000mbps`
+    if speed is None:
+        return None
+    match = regexp.match(r"(\d+)\s*([kmgt]?)bps", speed.strip().lower())
+    if match is None:
+        return None
+    return int(match.group(1)) * SPEED_UNITS[match.group(2)]
+
+
+def parse(xml: _Element) -> Tuple[List[str], npt.NDArray[np.uint64], List[Optional[int]]]:
+    names: List[str] = []
+    speeds: List[Optional[int]] = []
+    rows: List[List[int]] = []
+    for e in xml.iterfind("interface-information/physical-interface"):
+        name = (e.findtext("name") or "").strip()
+        if name[:2] not in INTERFACE_PREFIXES:
+            continue
+        names.append(name)
+        speeds.append(speed_bps(e.findtext("speed")))
+        row = []
+        for xpath in COUNTERS.values():
+            value = (e.findtext(xpath) or "").strip()
+            row.append(int(value) if value.isdigit() else 0)
+        rows.append(row)
+    return names, np.array(rows, dtype=np.uint64).reshape(len(rows), len(COUNTERS)), speeds
+
+
+async def fetch(device: Device) -> Optional[Tuple[List[str], npt.NDArray[np.uint64], List[Optional[int]]]]:
+    xml = await device.junos.run_xml_cmd("show interfaces statistics detail")
+    if xml is None:
+        return None
+    return parse(xml)
+
+
+class Series:
+    # ring buffer of counter samples of one device: values[sample, interface, counter]
+    def __init__(self, depth: int = DEFAULT_DEPTH) -> None:
+        self.depth = depth
+        self.interfaces: Dict[str, int] = {}
+        self.speeds = np.zeros(0, dtype=np.float64)
+        self.ts = np.zeros(depth, dtype=np.float64)
+        self.values = np.zeros((depth, 0, len(COUNTERS)), dtype=np.uint64)
+        self.valid = np.zeros((depth, 0), dtype=np.bool_)
+        self.head = 0
+        self.size = 0
+
+    def __len__(self) -> int:
+        return self.size
+
+    def grow(self, names: Iterable[str]) -> None:
+        new = [name for name in names if name not in self.interfaces]
+        if not new:
+            return
+        for name in new:
+            self.interfaces[name] = len(self.interfaces)
+        self.values = np.concatenate(
+            [self.values, np.zeros((self.depth, len(new), len(COUNTERS)), dtype=np.uint64)], axis=1,
+        )
+        self.valid = np.concatenate([self.valid, np.zeros((self.depth, len(new)), dtype=np.bool_)], axis=1)
+        self.speeds = np.concatenate([self.speeds, np.full(len(new), np.nan)])
+
+    def append(
+        self,
+        ts: float,
+        names: List[str],
+        values: npt.NDArray[np.uint64],
+        speeds: Optional[List[Optional[int]]] = None,
+    ) -> None:
+        self.grow(names)
+        index = np.array([self.interfaces[name] for name in names], dtype=np.intp)
+        self.ts[self.head] = ts
+        self.values[self.head] = 0
+        self.valid[self.head] = False
+        if len(index) > 0:
+            self.values[self.head, index] = values
+            self.valid[self.head, index] = True
+        if speeds is not None:
+            for i, speed in zip(index, speeds):
+                self.speeds[i] = np.nan if speed is None else speed
+        self.head = (self.head + 1) % self.depth
+        self.size = min(self.size + 1, self.depth)
+
+    def order(self, n: Optional[int] = None) -> npt.NDArray[np.intp]:
+        # ring buffer positions of the last n samples from the oldest to the latest
+        n = self.size if n is None else min(n, self.size)
+        return (self.head - n + np.arange(n)) % self.depth
+
+    def deltas(
+        self,
+        n: Optional[int] = None,
+    ) -> Tuple[npt.NDArray[np.float64], npt.NDArray[np.float64], npt.NDArray[np.uint64], npt.NDArray[np.bool_]]:
+        # returns (ts, dt, deltas, valid) between n last samples
+        order = self.order(n)
+        ts = self.ts[order]
+        values = self.values[order]
+        valid = self.valid[order]
+        deltas = values[1:] - values[:-1]
+        reset = deltas >= COUNTER_RESET_THRESHOLD
+        deltas[reset] = values[1:][reset]
+        return ts[1:], ts[1:] - ts[:-1], deltas, valid[1:] & valid[:-1]
+
+    def rates(self, n: Optional[int] = None) -> Tuple[npt.NDArray[np.float64], npt.NDArray[np.float64]]:
+        # returns (ts, rates[sample, interface, counter]) per second, NaN where unknown
+        ts, dt, deltas, valid = self.deltas(n)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            rates = deltas.astype(np.float64) / dt[:, None, None]
+        rates[~valid] = np.nan
+        rates[dt <= 0] = np.nan
+        return ts, rates
+
+    def utilization(self, n: Optional[int] = None) -> Tuple[npt.NDArray[np.float64], npt.NDArray[np.float64]]:
+        # returns (ts, utilization[sample, interface, direction]) as a fraction of interface speed
+        ts, rates = self.rates(n)
+        bps = rates[:, :, [COUNTER_INDEX["input_bytes"], COUNTER_INDEX["output_bytes"]]] * 8
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return ts, bps / self.speeds[None, :, None]
+
+    def rate(self, interface: str, counter: str) -> Optional[float]:
+        if self.size < 2 or interface not in self.interfaces:
+            return None
+        _, rates = self.rates(2)
+        value = rates[-1, self.interfaces[interface], COUNTER_INDEX[counter]]
+        return None if np.isnan(value) else float(value)
+
+
+class Poller:
+    # library only, not run by `eznet` cli: series are kept in memory for the caller,
+    # connections are opened on first poll, kept between polls and closed when `run` ends
+    def __init__(
+        self,
+        devices: Iterable[Device],
+        interval: float = DEFAULT_INTERVAL,
+        depth: int = DEFAULT_DEPTH,
+    ) -> None:
+        self.devices = list(devices)
+        self.interval = interval
+        self.series: Dict[str, Series] = {device.id: Series(depth) for device in self.devices}
+
+    async def poll_device(self, device: Device) -> None:
+        ssh = device.ssh
+        if ssh is not None and ssh.connection is None:
+            try:
+                await ssh.connect()
+            except ConnectError:
+                return
+        try:
+            result = await fetch(device)
+        except Exception as err:
+            logger.error(f"{device}: counters: {err.__class__.__name__}: {err}")
+            return
+        if result is not None:
+            names, values, speeds = result
+            self.series[device.id].append(time(), names, values, speeds)
+
+    async def poll(self) -> None:
+        await asyncio.gather(*(self.poll_device(device) for device in self.devices))
+
+    async def run(self, count: Optional[int] = None) -> None:
+        try:
+            while count is None or count > 0:
+                started = time()
+                await self.poll()
+                if count is not None:
+                    count -= 1
+                    if count == 0:
+                        break
+                await asyncio.sleep(max(0.0, self.interval - (time() - started)))
+        finally:
+            for device in self.devices:
+                if device.loaded("ssh") and device.ssh is not None:
+                    device.ssh.disconnect()
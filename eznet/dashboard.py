@@ -0,0 +1,198 @@
+from __future__ import annotations
+
+import asyncio
+import heapq
+from collections import deque
+from dataclasses import dataclass, field
+from time import time
+from typing import Deque, Dict, Iterable, List, Optional, Tuple
+
+from rich.console import Console, Group, RenderableType
+from rich.live import Live
+from rich.progress_bar import ProgressBar
+from rich.table import Table as RichTable
+from rich.text import Text
+
+from eznet import Device
+from eznet.inventory.device.drivers.base import State
+from eznet.inventory.device.drivers.ssh import CmdRequest, FileRequest, Registry, request_registry
+
+REFRESH_PER_SECOND = 2
+# rates are averaged over this number of seconds
+RATE_WINDOW = 10
+MAX_ROWS = 10
+
+
+def size(value: float) -> str:
+    for unit in ["B", "KB", "MB", "GB"]:
+        if abs(value) < 1024:
+            return f"{value:.0f} {unit}" if unit == "B" else f"{value:.1f} {unit}"
+        value /= 1024
+    return f"{value:.1f} TB"
+
+
+@dataclass
+class Snapshot:
+    # plain values copied from registry in event loop, rendered out of it
+    time: float
+    devices: int = 0
+    states: Dict[State, int] = field(default_factory=dict)
+    commands: int = 0
+    received: int = 0
+    cmd_queued: int = 0
+    cmd_running: int = 0
+    transfer_queued: int = 0
+    transfer_running: int = 0
+    # device, request, age, received bytes, request is running
+    slowest: List[Tuple[str, str, float, int, bool]] = field(default_factory=list)
+    # device, file, received, total, speed
+    transfers: List[Tuple[str, str, int, int, float]] = field(default_factory=list)
+
+
+class Dashboard:
+    # live view of in-flight requests of a job, refreshed at fixed rate:
+    # snapshot is taken in event loop, rendering and output is done in executor
+    def __init__(
+        self,
+        devices: Iterable[Device],
+        console: Console,
+        refresh_per_second: float = REFRESH_PER_SECOND,
+        max_rows: int = MAX_ROWS,
+    ) -> None:
+        self.devices = list(devices)
+        self.console = console
+        self.refresh_per_second = refresh_per_second
+        self.max_rows = max_rows
+        self.samples: Deque[Tuple[float, int, int]] = deque()
+
+    def snapshot(self, registry: Registry) -> Snapshot:
+        now = time()
+        snapshot = Snapshot(time=now, devices=len(self.devices))
+        for device in self.devices:
+            # devices without built driver are not connected yet
+            state = device.ssh.state if device.loaded("ssh") and device.ssh is not None else State.DISCONNECTED
+            snapshot.states[state] = snapshot.states.get(state, 0) + 1
+
+        oldest: Dict[str, Tuple[float, str, int, bool]] = {}
+        transfers: List[Tuple[str, str, int, int, float]] = []
+        received = registry.received
+        for request, ssh in registry.requests.items():
+            device_id = ssh.device_id or ssh.ip
+            received += request.received
+            if isinstance(request, CmdRequest):
+                name = request.cmd
+                if request.started is None:
+                    snapshot.cmd_queued += 1
+                else:
+                    snapshot.cmd_running += 1
+            else:
+                name = f"{request.file_name}" if isinstance(request, FileRequest) else f"{request}"
+                if request.started is None:
+                    snapshot.transfer_queued += 1
+                else:
+                    snapshot.transfer_running += 1
+                    if isinstance(request, FileRequest):
+                        transfers.append((
+                            device_id, name, request.received_bytes, request.total_bytes, request.speed,
+                        ))
+            if device_id not in oldest or request.queued < oldest[device_id][0]:
+                oldest[device_id] = (request.queued, name, request.received, request.started is not None)
+
+        snapshot.commands = registry.commands
+        snapshot.received = received
+        snapshot.slowest = [
+            (device_id, name, now - queued, device_received, running)
+            for device_id, (queued, name, device_received, running) in heapq.nsmallest(
+                self.max_rows, oldest.items(), key=lambda item: item[1][0],
+            )
+        ]
+        snapshot.transfers = transfers[:self.max_rows]
+        return snapshot
+
+    def rates(self, snapshot: Snapshot) -> Tuple[float, float]:
+        # commands and bytes per second over last RATE_WINDOW seconds
+        self.samples.append((snapshot.time, snapshot.commands, snapshot.received))
+        while len(self.samples) > 2 and snapshot.time - self.samples[0][0] > RATE_WINDOW:
+            self.samples.popleft()
+        t0, commands, received = self.samples[0]
+        duration = snapshot.time - t0
+        if duration <= 0:
+            return 0, 0
+        return (snapshot.commands - commands) / duration, (snapshot.received - received) / duration
+
+    def render(self, snapshot: Snapshot, rates: Tuple[float, float]) -> RenderableType:
+        states = snapshot.states
+        header = Text.assemble(
+            ("devices ", "bold"),
+            f"{snapshot.devices}: ",
+            (f"{states.get(State.CONNECTED, 0)} connected", "green"), ", ",
+            f"{states.get(State.CONNECTING, 0)} connecting, ",
+            (f"{states.get(State.WAITING_CONNECT, 0) + states.get(State.WAITING_RECONNECT, 0)} waiting", "yellow"),
+            "\n",
+            ("commands ", "bold"),
+            f"{snapshot.cmd_running} running, ",
+            (f"{snapshot.cmd_queued} queued", "yellow"),
+            f", {snapshot.commands} done, {rates[0]:.1f}/s",
+            "\n",
+            ("transfers ", "bold"),
+            f"{snapshot.transfer_running} running, ",
+            (f"{snapshot.transfer_queued} queued", "yellow"),
+            "\n",
+            ("received ", "bold"),
+            f"{size(snapshot.received)}, {size(rates[1])}/s",
+        )
+
+        slowest = RichTable(title="slowest devices", expand=True)
+        slowest.add_column("device")
+        slowest.add_column("request", ratio=1)
+        slowest.add_column("state", width=7)
+        slowest.add_column("age", justify="right", width=8)
+        slowest.add_column("received", justify="right", width=10)
+        for device_id, name, age, received, running in snapshot.slowest:
+            slowest.add_row(
+                device_id,
+                name,
+                "running" if running else Text("queued", style="yellow"),
+                f"{age:.0f}s",
+                size(received),
+            )
+
+        renderables: List[RenderableType] = [header, slowest]
+        if snapshot.transfers:
+            transfers = RichTable(title="transfers", expand=True)
+            transfers.add_column("device")
+            transfers.add_column("file", ratio=1)
+            transfers.add_column("progress", width=22)
+            transfers.add_column("received", justify="right", width=22)
+            transfers.add_column("speed", justify="right", width=12)
+            for device_id, name, received, total, speed in snapshot.transfers:
+                transfers.add_row(
+                    device_id,
+                    name,
+                    ProgressBar(total=total or None, completed=received, width=20),
+                    f"{size(received)} of {size(total)}",
+                    f"{size(speed)}/s",
+                )
+            renderables.append(transfers)
+        return Group(*renderables)
+
+    def show(self, live: Live, snapshot: Snapshot, rates: Tuple[float, float]) -> None:
+        live.update(self.render(snapshot, rates), refresh=True)
+
+    async def run(self, registry: Optional[Registry] = None) -> None:
+        loop = asyncio.get_running_loop()
+        if registry is None:
+            registry = request_registry[loop]
+        interval = 1 / self.refresh_per_second
+        # json lines stream keeps stdout for itself
+        with Live(
+            console=self.console,
+            auto_refresh=False,
+            redirect_stdout=not self.console.stderr,
+            redirect_stderr=True,
+        ) as live:
+            while True:
+                t0 = loop.time()
+                snapshot = self.snapshot(registry)
+                await loop.run_in_executor(None, self.show, live, snapshot, self.rates(snapshot))
+                await asyncio.sleep(max(interval - (loop.time() - t0), 0))
@@ -1,28 +1,174 @@
 from __future__ import annotations
 
-from typing import Generic, TypeVar, Dict, Callable, Awaitable, Any, get_type_hints, Optional, List, Tuple
+import asyncio
+from dataclasses import dataclass
+from typing import (
+    Generic, TypeVar, Dict, Callable, Awaitable, Any, get_type_hints, Optional, List, Tuple, Hashable, Iterator,
+    Iterable, TYPE_CHECKING,
+)
 from typing_extensions import ParamSpec, Concatenate
 from datetime import datetime
+from time import time
+
+from eznet import changes
+
+if TYPE_CHECKING:
+    from eznet.store import Store
 
 P = ParamSpec('P')
 T = TypeVar('T')
 V = TypeVar("V")
 
+DEFAULT_HISTORY_DEPTH = 16
+
 
 class DataError(Exception):
     pass
 
 
+# ring buffer of (value, timestamp), index 0 is the latest value,
+# every value keeps the key of fetch arguments it was fetched with
+class History(Generic[V]):
+    def __init__(
+        self,
+        depth: int = DEFAULT_HISTORY_DEPTH,
+        max_age: Optional[float] = None,
+    ) -> None:
+        if depth < 1:
+            raise ValueError(f"history depth should be positive, got {depth}")
+        self.depth = depth
+        self.max_age = max_age
+        self.slots: List[Optional[Tuple[V, datetime]]] = [None] * depth
+        self.keys: List[Optional[Hashable]] = [None] * depth
+        self.head = 0
+        self.size = 0
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __bool__(self) -> bool:
+        return self.size > 0
+
+    def __getitem__(self, i: int) -> Tuple[V, datetime]:
+        if i < 0:
+            i += self.size
+        if not 0 <= i < self.size:
+            raise IndexError(i)
+        item = self.slots[(self.head - 1 - i) % self.depth]
+        assert item is not None
+        return item
+
+    def key(self, i: int) -> Optional[Hashable]:
+        if i < 0:
+            i += self.size
+        if not 0 <= i < self.size:
+            raise IndexError(i)
+        return self.keys[(self.head - 1 - i) % self.depth]
+
+    def latest(self, key: Optional[Hashable]) -> Optional[Tuple[V, datetime]]:
+        # newest value fetched with the same arguments
+        for i in range(self.size):
+            if self.key(i) == key:
+                return self[i]
+        return None
+
+    def __iter__(self) -> Iterator[Tuple[V, datetime]]:
+        for i in range(self.size):
+            yield self[i]
+
+    def append(self, value: V, ts: Optional[datetime] = None, key: Optional[Hashable] = None) -> None:
+        if ts is None:
+            ts = datetime.now()
+        self.slots[self.head] = (value, ts)
+        self.keys[self.head] = key
+        self.head = (self.head + 1) % self.depth
+        if self.size < self.depth:
+            self.size += 1
+        self.expire(ts)
+
+    def expire(self, now: Optional[datetime] = None) -> None:
+        if self.max_age is None:
+            return
+        if now is None:
+            now = datetime.now()
+        while self.size > 0:
+            tail = (self.head - self.size) % self.depth
+            item = self.slots[tail]
+            assert item is not None
+            if (now - item[1]).total_seconds() <= self.max_age:
+                break
+            self.slots[tail] = None
+            self.keys[tail] = None
+            self.size -= 1
+
+    def as_of(self, ts: datetime) -> Optional[Tuple[V, datetime]]:
+        # timestamps are decreasing with index: find first entry not newer than ts
+        lo, hi = 0, self.size
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self[mid][1] <= ts:
+                hi = mid
+            else:
+                lo = mid + 1
+        if lo < self.size:
+            return self[lo]
+        return None
+
+    def clear(self) -> None:
+        self.slots = [None] * self.depth
+        self.keys = [None] * self.depth
+        self.head = 0
+        self.size = 0
+
+
+@dataclass
+class Stats:
+    hits: int = 0
+    merged: int = 0
+    fetches: int = 0
+    errors: int = 0
+    fetch_time: float = 0
+    last_fetch_time: Optional[float] = None
+
+    @property
+    def avg_fetch_time(self) -> Optional[float]:
+        if self.fetches > 0:
+            return self.fetch_time / self.fetches
+        return None
+
+
 class Data(Generic[T, V]):
     def __init__(
         self,
         obj: T,
         fetcher: Callable[Concatenate[T, P], Awaitable[Optional[V]]],
+        name: Optional[str] = None,
+        history_depth: int = DEFAULT_HISTORY_DEPTH,
+        history_age: Optional[float] = None,
+        depends: Iterable[Data[Any, Any]] = (),
     ) -> None:
         # self.cls = get_type_hints(fetcher)['return']
-        self.data: List[Tuple[V, datetime]] = []
+        self._data: History[V] = History(history_depth, history_age)
         self.obj = obj
         self.fetcher = fetcher
+        self.name = name
+        self.depends: List[Data[Any, Any]] = list(depends)
+        self.store: Optional[Store] = None
+        self.loaded = False
+        self.stats = Stats()
+        self.pending: Dict[Hashable, asyncio.Future[Optional[V]]] = {}
+
+    def __repr__(self) -> str:
+        return f"Data({self.obj}, {self.name or self.fetcher.__qualname__})"
+
+    @property
+    def data(self) -> History[V]:
+        # snapshots from the store are loaded lazily on first access
+        if not self.loaded and self.store is not None and self.name is not None:
+            self.loaded = True
+            for value, ts in self.store.load(f"{self.obj}", self.name, limit=self._data.depth):
+                self._data.append(value, ts)
+        return self._data
 
     # def __getitem__(self, tag: int) -> V:
     #     return self.data[tag]
@@ -45,10 +191,83 @@ class Data(Generic[T, V]):
         else:
             return None
 
-    async def fetch(self, *args: P.args, **kwargs: P.kwargs) -> Optional[V]:
-        data = await self.fetcher(self.obj, *args, **kwargs)
+    @property
+    def ts(self) -> Optional[datetime]:
+        if len(self.data) > 0:
+            return self.data[0][1]
+        else:
+            return None
+
+    def as_of(self, ts: datetime) -> Optional[V]:
+        item = self.data.as_of(ts)
+        if item is not None:
+            return item[0]
+        return None
+
+    def age(self) -> Optional[float]:
+        if len(self.data) > 0:
+            return (datetime.now() - self.data[0][1]).total_seconds()
+        else:
+            return None
+
+    async def fetch(
+        self,
+        *args: Any,
+        max_age: Optional[float] = None,
+        **kwargs: Any,
+    ) -> Optional[V]:
+        key = (args, tuple(sorted(kwargs.items())))
+        try:
+            hash(key)
+        except TypeError:  # unhashable arguments, could not be cached or merged
+            return await self._fetch(None, *args, **kwargs)
+
+        # only values fetched with the same arguments are reused
+        if max_age is not None:
+            now = datetime.now()
+            for i, (value, ts) in enumerate(self.data):
+                if (now - ts).total_seconds() > max_age:
+                    break
+                if self.data.key(i) == key:
+                    self.stats.hits += 1
+                    return value
+
+        # concurrent callers with the same arguments wait for the same fetch
+        future = self.pending.get(key)
+        if future is not None:
+            self.stats.merged += 1
+            return await asyncio.shield(future)
+
+        future = asyncio.ensure_future(self._fetch(key, *args, **kwargs))
+        self.pending[key] = future
+
+        def done(f: asyncio.Future[Optional[V]]) -> None:
+            self.pending.pop(key, None)
+            if not f.cancelled():
+                f.exception()
+
+        future.add_done_callback(done)
+        return await asyncio.shield(future)
+
+    async def _fetch(self, key: Optional[Hashable], *args: Any, **kwargs: Any) -> Optional[V]:
+        t0 = time()
+        try:
+            data = await self.fetcher(self.obj, *args, **kwargs)
+        except Exception:
+            self.stats.errors += 1
+            raise
+        finally:
+            self.stats.fetches += 1
+            self.stats.last_fetch_time = time() - t0
+            self.stats.fetch_time += self.stats.last_fetch_time
         if data is not None:
-            self.data.insert(0, (data, datetime.now()))
+            # values fetched with other arguments are not comparable, e.g. filtered interfaces
+            last = self.data.latest(key)
+            old = last[0] if last is not None else None
+            self.data.append(data, key=key)
+            changes.publish(self, old, data)
+            if self.store is not None and self.name is not None:
+                self.store.save(f"{self.obj}", self.name, data, self.data[0][1])
             return self.data[0][0]
         return None
 
@@ -0,0 +1,182 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple, Union
+
+import yaml
+
+from eznet import Device
+from eznet import planner
+from eznet.inventory.device.info.lldp import Neighbor
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CONCURRENCY = 32
+DEFAULT_DEPTH = 16
+
+
+@dataclass
+class Found:
+    name: str
+    ip: Optional[str]
+    depth: int
+    chassis_id: Optional[str] = None
+    hostname: Optional[str] = None
+    model: Optional[str] = None
+    error: Optional[str] = None
+
+
+class Discovery:
+    def __init__(
+        self,
+        user_name: Optional[str] = None,
+        user_pass: Optional[str] = None,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        max_depth: int = DEFAULT_DEPTH,
+        site: Optional[str] = None,
+    ) -> None:
+        self.user_name = user_name
+        self.user_pass = user_pass
+        self.concurrency = concurrency
+        self.max_depth = max_depth
+        self.site = site
+
+        # visited index: chassis ids, system names and addresses of all queued devices
+        self.visited: Set[str] = set()
+        self.found: Dict[str, Found] = {}
+
+    @staticmethod
+    def keys(
+        name: Optional[str] = None,
+        ip: Optional[str] = None,
+        chassis_id: Optional[str] = None,
+    ) -> List[str]:
+        keys = []
+        if name is not None:
+            keys.append(f"name:{name.lower().split('.')[0]}")
+        if ip is not None:
+            keys.append(f"ip:{ip}")
+        if chassis_id is not None:
+            keys.append(f"chassis:{chassis_id.lower()}")
+        return keys
+
+    def visit(self, *keys: str) -> bool:
+        # returns False if any of keys was already visited
+        if any(key in self.visited for key in keys):
+            self.visited.update(keys)
+            return False
+        self.visited.update(keys)
+        return True
+
+    async def explore(self, device: Device, found: Found) -> List[Tuple[str, str, Optional[str]]]:
+        # returns list of (name, address, chassis id) of neighbors
+        if device.ssh is None:
+            found.error = "no ip"
+            return []
+        try:
+            async with device.ssh:
+                await planner.fetch([
+                    device.info.system.info,
+                    device.info.lldp.local,
+                    device.info.lldp.neighbors,
+                ])
+                neighbors: Dict[str, Neighbor] = device.info.lldp.neighbors.v or {}
+                addresses = {
+                    interface: neighbor.mgmt_address for interface, neighbor in neighbors.items()
+                }
+                # brief output has no management address, ask details per interface
+                missing = [interface for interface, address in addresses.items() if address is None]
+                for interface, neighbor in zip(missing, await planner.gather(
+                    device, *(Neighbor.fetch_interface(device, interface) for interface in missing)
+                )):
+                    if neighbor is not None:
+                        addresses[interface] = neighbor.mgmt_address
+        except Exception as err:
+            found.error = f"{err.__class__.__name__}"
+            logger.error(f"discovery: {device}: {err.__class__.__name__}: {err}")
+            return []
+
+        if device.info.lldp.local:
+            found.chassis_id = device.info.lldp.local().chassis_id
+        if device.info.system.info:
+            found.hostname = device.info.system.info().hostname
+            found.model = device.info.system.info().hw_model
+        self.visit(*self.keys(name=found.hostname, chassis_id=found.chassis_id))
+
+        return [
+            (neighbor.system_name.split(".")[0], address, neighbor.chassis_id)
+            for interface, neighbor in neighbors.items()
+            if neighbor.system_name is not None and (address := addresses[interface]) is not None
+        ]
+
+    async def crawl(self, seeds: Iterable[Device]) -> List[Found]:
+        queue: asyncio.Queue[Tuple[Device, Found]] = asyncio.Queue()
+
+        for seed in seeds:
+            self.user_name = self.user_name or (seed.ssh.user_name if seed.ssh else None)
+            self.user_pass = self.user_pass or (seed.ssh.user_pass if seed.ssh else None)
+            ip = seed.ssh.ip if seed.ssh else None
+            if self.visit(*self.keys(name=seed.name, ip=ip)):
+                found = self.found[seed.name] = Found(name=seed.name, ip=ip, depth=0)
+                queue.put_nowait((seed, found))
+
+        async def worker() -> None:
+            while True:
+                device, found = await queue.get()
+                try:
+                    neighbors = await self.explore(device, found)
+                    logger.info(f"discovery: {device}: {len(neighbors)} neighbors at depth {found.depth}")
+                    if found.depth >= self.max_depth:
+                        continue
+                    for name, ip, chassis_id in neighbors:
+                        if not self.visit(*self.keys(name=name, ip=ip, chassis_id=chassis_id)):
+                            continue
+                        neighbor_found = self.found[name] = Found(
+                            name=name, ip=ip, depth=found.depth + 1, chassis_id=chassis_id,
+                        )
+                        queue.put_nowait((Device(
+                            name=name,
+                            site=self.site,
+                            ip=ip,
+                            user_name=self.user_name,
+                            user_pass=self.user_pass,
+                        ), neighbor_found))
+                finally:
+                    queue.task_done()
+
+        workers = [asyncio.create_task(worker()) for _ in range(self.concurrency)]
+        try:
+            await queue.join()
+        finally:
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+        return list(self.found.values())
+
+    def inventory(self) -> Dict[str, Any]:
+        # compatible with `Inventory.imp0rt`
+        return {
+            "devices": [
+                {
+                    "name": found.name,
+                    **({"site": self.site} if self.site is not None else {}),
+                    **({"ip": found.ip} if found.ip is not None else {}),
+                }
+                for found in sorted(self.found.values(), key=lambda found: found.name)
+            ]
+        }
+
+    def save(self, path: Union[str, Path]) -> None:
+        if isinstance(path, str):
+            path = Path(path)
+        if not path.parent.exists():
+            path.parent.mkdir(parents=True)
+        with open(path, "w") as io:
+            if path.suffix == ".json":
+                json.dump(self.inventory(), io, indent=2)
+            else:
+                yaml.safe_dump(self.inventory(), io, sort_keys=False)
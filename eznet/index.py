@@ -0,0 +1,233 @@
+from __future__ import annotations
+
+import ipaddress
+import logging
+import re as regexp
+from typing import Any, Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Set, Tuple, Union, TYPE_CHECKING
+
+from eznet import Device
+from eznet import changes
+from eznet.inventory.device.info.interfaces import Interface
+
+if TYPE_CHECKING:
+    from eznet.data import Data
+
+logger = logging.getLogger(__name__)
+
+TOKEN_RE = regexp.compile(r"[a-z0-9]+")
+
+Network = Union[ipaddress.IPv4Network, ipaddress.IPv6Network]
+
+
+class Entry(NamedTuple):
+    device: str
+    interface: str
+    unit: Optional[int] = None
+    family: Optional[str] = None
+    prefix: Optional[str] = None
+
+
+# (kind, key, entry), kinds are:
+#   - "net": key is network, entry is an address or network of unit family
+#   - "token": key is token of description, entry is interface or unit
+#   - "text": key is lower case description, entry is interface or unit
+Posting = Tuple[str, Any, Entry]
+
+
+def tokens(description: str) -> List[str]:
+    return TOKEN_RE.findall(description.lower())
+
+
+def network(prefix: Union[str, Network]) -> Optional[Network]:
+    if isinstance(prefix, (ipaddress.IPv4Network, ipaddress.IPv6Network)):
+        return prefix
+    try:
+        return ipaddress.ip_network(prefix, strict=False)
+    except ValueError:
+        return None
+
+
+class Node:
+    __slots__ = ("children", "entries")
+
+    def __init__(self) -> None:
+        self.children: List[Optional[Node]] = [None, None]
+        self.entries: Set[Entry] = set()
+
+
+class Trie:
+    # binary trie of network bits, one per ip version
+    def __init__(self, bits: int) -> None:
+        self.bits = bits
+        self.root = Node()
+
+    def path(self, net: Network) -> Iterator[int]:
+        value = int(net.network_address)
+        for i in range(net.prefixlen):
+            yield (value >> (self.bits - 1 - i)) & 1
+
+    def add(self, net: Network, entry: Entry) -> None:
+        node = self.root
+        for bit in self.path(net):
+            child = node.children[bit]
+            if child is None:
+                child = node.children[bit] = Node()
+            node = child
+        node.entries.add(entry)
+
+    def remove(self, net: Network, entry: Entry) -> None:
+        nodes = [self.root]
+        bits = list(self.path(net))
+        for bit in bits:
+            child = nodes[-1].children[bit]
+            if child is None:
+                return
+            nodes.append(child)
+        nodes[-1].entries.discard(entry)
+        # prune empty branch
+        for bit, parent, node in zip(reversed(bits), reversed(nodes[:-1]), reversed(nodes[1:])):
+            if node.entries or node.children[0] is not None or node.children[1] is not None:
+                break
+            parent.children[bit] = None
+
+    def covering(self, net: Network) -> List[Entry]:
+        # entries of all networks containing `net`, longest prefix first
+        found: List[Entry] = []
+        node: Optional[Node] = self.root
+        for bit in self.path(net):
+            assert node is not None
+            found[:0] = node.entries
+            node = node.children[bit]
+            if node is None:
+                return found
+        assert node is not None
+        found[:0] = node.entries
+        return found
+
+    def within(self, net: Network) -> List[Entry]:
+        # entries of all networks and addresses inside `net`
+        node: Optional[Node] = self.root
+        for bit in self.path(net):
+            assert node is not None
+            node = node.children[bit]
+            if node is None:
+                return []
+        found: List[Entry] = []
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            assert node is not None
+            found.extend(node.entries)
+            stack.extend(child for child in node.children if child is not None)
+        return found
+
+
+class Index:
+    def __init__(self) -> None:
+        self.tries = {4: Trie(32), 6: Trie(128)}
+        self.tokens: Dict[str, Set[Entry]] = {}
+        self.descriptions: Dict[Entry, str] = {}
+        self.postings: Dict[str, Set[Posting]] = {}
+        self.unsubscribe: Optional[Callable[[], None]] = None
+
+    @staticmethod
+    def index(device_id: str, interfaces: Optional[Dict[str, Interface]]) -> Set[Posting]:
+        postings: Set[Posting] = set()
+
+        def describe(entry: Entry, description: Optional[str]) -> None:
+            if description is None:
+                return
+            postings.add(("text", description.lower(), entry))
+            postings.update(("token", token, entry) for token in tokens(description))
+
+        for interface_name, interface in (interfaces or {}).items():
+            describe(Entry(device_id, interface_name), interface.description)
+            for unit_id, unit in interface.units.items():
+                describe(Entry(device_id, interface_name, unit_id), unit.description)
+                for family_name, af in unit.family.items():
+                    for prefix in (af.address, af.network):
+                        if prefix is not None and (net := network(prefix)) is not None:
+                            postings.add(("net", net, Entry(device_id, interface_name, unit_id, family_name, prefix)))
+        return postings
+
+    def add(self, posting: Posting) -> None:
+        kind, key, entry = posting
+        if kind == "net":
+            self.tries[key.version].add(key, entry)
+        elif kind == "token":
+            self.tokens.setdefault(key, set()).add(entry)
+        elif kind == "text":
+            self.descriptions[entry] = key
+
+    def remove(self, posting: Posting) -> None:
+        kind, key, entry = posting
+        if kind == "net":
+            self.tries[key.version].remove(key, entry)
+        elif kind == "token":
+            entries = self.tokens.get(key)
+            if entries is not None:
+                entries.discard(entry)
+                if not entries:
+                    del self.tokens[key]
+        elif kind == "text":
+            self.descriptions.pop(entry, None)
+
+    def update(self, device_id: str, interfaces: Optional[Dict[str, Interface]]) -> None:
+        # only difference with previous snapshot of device is applied
+        old = self.postings.get(device_id, set())
+        new = self.index(device_id, interfaces)
+        for posting in old - new:
+            self.remove(posting)
+        for posting in new - old:
+            self.add(posting)
+        if new:
+            self.postings[device_id] = new
+        else:
+            self.postings.pop(device_id, None)
+
+    @classmethod
+    def build(cls, devices: Iterable[Device], attach: bool = False) -> Index:
+        index = cls()
+        for device in devices:
+            index.update(device.id, device.info.interfaces.v)
+        if attach:
+            index.attach()
+        return index
+
+    def on_change(self, data: Data[Any, Any], _: List[changes.Change]) -> None:
+        self.update(f"{data.obj}", data.v)
+
+    def attach(self) -> None:
+        if self.unsubscribe is None:
+            self.unsubscribe = changes.subscribe(self.on_change, ["interfaces"])
+
+    def close(self) -> None:
+        if self.unsubscribe is not None:
+            self.unsubscribe()
+            self.unsubscribe = None
+
+    def address(self, prefix: Union[str, Network], within: bool = True) -> List[Entry]:
+        # networks covering `prefix`, longest match first,
+        # then (with `within`) addresses and networks inside `prefix`
+        net = network(prefix)
+        if net is None:
+            return []
+        trie = self.tries[net.version]
+        found = trie.covering(net)
+        if within:
+            seen = set(found)
+            found.extend(entry for entry in trie.within(net) if entry not in seen)
+        return found
+
+    def description(self, text: str) -> List[Entry]:
+        # all tokens should match, then phrase is checked as substring of description
+        query = tokens(text)
+        if not query:
+            return []
+        postings = sorted((self.tokens.get(token, set()) for token in query), key=len)
+        entries = set(postings[0]).intersection(*postings[1:])
+        phrase = text.lower()
+        return sorted((entry for entry in entries if phrase in self.descriptions.get(entry, "")), key=str)
+
+    def __len__(self) -> int:
+        return sum(len(postings) for postings in self.postings.values())
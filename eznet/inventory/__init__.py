@@ -1,18 +1,19 @@
 from __future__ import annotations
 
 import logging
-from typing import List, Union, Dict, Any, Optional
+from typing import List, Union, Dict, Any, Optional, Set, Iterable
 from typing_extensions import Self
+from io import StringIO
 from pathlib import Path
-import json
-from collections import defaultdict
 
-import yaml
-# import _jsonnet
+from marshmallow import ValidationError
 
 from .device import Device
+from . import exporters
+from . import loader
+from .selector import Selector, SelectorError
 
-__all__ = ["Inventory", "Device"]
+__all__ = ["Inventory", "Device", "Selector", "SelectorError"]
 
 logger = logging.getLogger(__name__)
 
@@ -20,82 +21,168 @@ logger = logging.getLogger(__name__)
 class Inventory:
     def __init__(self) -> None:
         self.devices: List[Device] = []
+        self.by_id: Dict[str, Device] = {}
+        self.by_site: Dict[Optional[str], List[Device]] = {}
+        # attribute -> value -> device ids, built on first use by selectors
+        self.indexes: Dict[str, Dict[str, Set[str]]] = {}
+        # loaded paths and device ids of every loaded file, used by watcher to reload
+        self.paths: List[Path] = []
+        self.sources: Dict[Path, List[str]] = {}
+        self.cache: Optional[loader.Cache] = None
 
     def device(self, device_id: str) -> Optional[Device]:
-        for dev in self.devices:
-            if dev.id == device_id:
-                return dev
+        return self.by_id.get(device_id)
+
+    @staticmethod
+    def values(device: Device, attribute: str) -> List[str]:
+        # raw vars are used: selecting devices does not validate them
+        value: Any
+        if attribute == "site":
+            value = device.site
+        elif attribute == "model":
+            value = device.kwargs.get("model")
+        elif attribute == "tag":
+            value = device.kwargs.get("tags")
+        elif attribute.startswith("vars."):
+            value = device.kwargs
+            for name in attribute.split(".")[1:]:
+                value = value.get(name) if isinstance(value, dict) else None
         else:
+            raise SelectorError(f"unknown attribute `{attribute}`")
+        if value is None:
+            return []
+        if isinstance(value, (list, tuple, set, dict)):
+            return [f"{v}" for v in value]
+        return [f"{value}"]
+
+    def validate(self, devices: Optional[Iterable[Device]] = None) -> Dict[str, ValidationError]:
+        # vars of all (or given) devices in one pass, errors are reported together
+        errors: Dict[str, ValidationError] = {}
+        for device in (self.devices if devices is None else devices):
+            if (error := device.validate()) is not None:
+                errors[device.id] = error
+        for device_id, error in errors.items():
+            logger.error(f"inventory: {device_id}: vars validation error: {error.messages}")
+        return errors
+
+    def index(self, attribute: str) -> Dict[str, Set[str]]:
+        index = self.indexes.get(attribute)
+        if index is None:
+            index = self.indexes[attribute] = {}
+            for device in self.devices:
+                for value in self.values(device, attribute):
+                    index.setdefault(value, set()).add(device.id)
+        return index
+
+    def add(self, device: Device) -> bool:
+        if device.id in self.by_id:
+            logger.error(f"Load error: Duplicate device with {device.id}")
+            return False
+        self.devices.append(device)
+        self.by_id[device.id] = device
+        self.by_site.setdefault(device.site, []).append(device)
+        self.reindex(device)
+        return True
+
+    def remove(self, device_id: str) -> Optional[Device]:
+        device = self.by_id.pop(device_id, None)
+        if device is None:
             return None
+        self.devices.remove(device)
+        self.by_site[device.site].remove(device)
+        if not self.by_site[device.site]:
+            del self.by_site[device.site]
+        self.unindex(device)
+        return device
+
+    def unindex(self, device: Device) -> None:
+        for attribute, index in self.indexes.items():
+            for value in self.values(device, attribute):
+                if (ids := index.get(value)) is not None:
+                    ids.discard(device.id)
+                    if not ids:
+                        del index[value]
+
+    def reindex(self, device: Device) -> None:
+        for attribute, index in self.indexes.items():
+            for value in self.values(device, attribute):
+                index.setdefault(value, set()).add(device.id)
 
-    def load(self, path: Union[str, Path]) -> Self:
+    def replace(self, device: Device, other: Device) -> None:
+        # `other` with the same id takes place of `device`
+        self.unindex(device)
+        self.devices[self.devices.index(device)] = other
+        site = self.by_site[device.site]
+        site[site.index(device)] = other
+        self.by_id[device.id] = other
+        self.reindex(other)
+
+    def update(self, device: Device, other: Device) -> None:
+        # `device` gets vars of `other`, its info and connections are kept
+        self.unindex(device)
+        device.update(other)
+        self.reindex(device)
+
+    def select(self, *expressions: Union[str, Selector]) -> List[Device]:
+        # devices matched by any of selectors, in inventory order
+        ids: Set[str] = set()
+        for expression in expressions:
+            selector = expression if isinstance(expression, Selector) else Selector(expression)
+            ids |= selector.resolve(self)
+        if len(ids) == len(self.devices):
+            return list(self.devices)
+        return [device for device in self.devices if device.id in ids]
+
+    def load(
+        self,
+        path: Union[str, Path],
+        cache: Union[None, bool, str, Path] = None,
+        workers: Optional[int] = None,
+    ) -> Self:
+        # `cache=True` keeps parsed files in default cache path
         if not isinstance(path, Path):
             path = Path(path)
         path = path.expanduser()
         if not path.exists():
             logger.error(f"inventory load error: {path} not found")
-        if path.is_dir():
-            logger.info(f"inventory: load from {path}/")
-            for child in sorted(path.glob("*")):
-                if child.is_dir() or child.suffix in [".yaml", ".yml", ".json", ".jsonnet"]:
-                    self.load(child)
-        elif path.suffix in [".yaml", ".yml"]:
-            logger.info(f"inventory: load from {path}")
+            return self
+        if cache is True:
+            self.cache = loader.Cache()
+        elif cache is not None and cache is not False:
+            self.cache = loader.Cache(cache)
+        self.paths.append(path)
+
+        for file, data in loader.load(loader.files(path), cache=self.cache, workers=workers):
+            if isinstance(data, Exception):
+                logger.error(f"inventory: load from {file}: {data.__class__.__name__}: {data}")
+                continue
+            logger.info(f"inventory: load from {file}")
             try:
-                with open(path) as io:
-                    self.imp0rt(
-                        yaml.safe_load(io.read()) or {},
-                        site=path.with_suffix("").name,
-                    )
+                self.sources[file] = [device.id for device in self.imp0rt(data, site=file.with_suffix("").name)]
             except Exception as err:
-                logger.error(f"inventory: load from {path}: {err.__class__.__name__}: {err}")
-        elif path.suffix == ".json":
-            logger.info(f"inventory: load from {path}")
-            try:
-                with open(path) as io:
-                    self.imp0rt(
-                        json.loads(io.read()),
-                        site=path.with_suffix("").name,
-                    )
-            except Exception as exc:
-                logger.error(f"inventory: load from {path}: {exc.__class__.__name__}: {exc}")
-        # elif path.suffix == ".jsonnet":
-        #     logger.info(f"inventory: load from {path}")
-        #     try:
-        #         self.imp0rt(
-        #             json.loads(_jsonnet.evaluate_file(f"{path}")),
-        #             site=path.with_suffix("").name,
-        #         )
-        #     except Exception as exc:
-        #         logger.error(f"inventory: load from {path}: {exc.__class__.__name__}: {exc}")
-        else:
-            logger.error(f"unknown inventory file format {path.suffix[1:]}")
+                logger.error(f"inventory: load from {file}: {err.__class__.__name__}: {err}")
 
         return self
 
-    def imp0rt(self, data: Dict[str, Any], site: Optional[str] = None) -> None:
+    @staticmethod
+    def parse(data: Dict[str, Any], site: Optional[str] = None) -> List[Device]:
         devices: List[Dict[Any, Any]] = data.get("devices", [])
         if not isinstance(devices, list):
-            return
+            return []
+        parsed = []
         for device_data in devices:
             device_data.setdefault("site", site)
-            d = Device(**device_data)
-            if d in self.devices:
-                logger.error(f"Load error: Duplicate device with {d.id}")
-            else:
-                self.devices.append(d)
+            parsed.append(Device(**device_data))
+        return parsed
+
+    def imp0rt(self, data: Dict[str, Any], site: Optional[str] = None) -> List[Device]:
+        return [device for device in self.parse(data, site) if self.add(device)]
 
     @property
     def sites(self) -> Dict[Union[str, None], List[Device]]:
-        sites: Dict[Union[str, None], List[Device]] = defaultdict(list)
-        for d in self.devices:
-            sites[d.site].append(d)
-        return sites
+        return self.by_site
 
     def export_as_rundeck(self) -> str:
-        return yaml.safe_dump({
-            dev.id: {
-                "nodename": dev.id,
-                **({"hostname": dev.ssh.ip} if dev.ssh is not None else {})
-            } for dev in self.devices
-        })
+        io = StringIO()
+        exporters.Rundeck(io).export(self.devices)
+        return io.getvalue()
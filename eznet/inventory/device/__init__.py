@@ -1,4 +1,7 @@
-from typing import Union, Optional, Any, List, Dict
+from __future__ import annotations
+
+from functools import cached_property
+from typing import Union, Optional, Any, List, Dict, Tuple, cast
 
 import marshmallow
 import marshmallow_dataclass
@@ -15,8 +18,14 @@ class BaseSchema(marshmallow.Schema):
 
 device_vars_schema = marshmallow_dataclass.class_schema(vars.Device, base_schema=BaseSchema)()
 
+# `vars` and `info` modules are shadowed by properties in class body
+Vars = vars.Device
+Info = info.Device
+
 
 class Device:
+    # vars are validated, info and drivers are built on first access:
+    # devices not selected for a job cost only their raw data
     def __init__(
         self,
         name: str,
@@ -30,24 +39,58 @@ class Device:
         self.name = name
         self.site = site
         self.id = self.name if self.site is None else self.site + "." + self.name
-        self.vars: vars.Device = device_vars_schema.load(kwargs)
-        self.info = info.Device(self)
-        self.ssh: Optional[drivers.SSH] = None
+        self.ip = ip
+        self.user_name = user_name
+        self.user_pass = user_pass
+        self.root_pass = root_pass
+        self.kwargs = kwargs
+
+    @cached_property
+    def vars(self) -> Vars:
+        return cast(Vars, device_vars_schema.load(self.kwargs))
+
+    def validate(self) -> Optional[marshmallow.ValidationError]:
+        try:
+            self.vars
+        except marshmallow.ValidationError as err:
+            return err
+        return None
+
+    def connection(self) -> Tuple[Any, ...]:
+        return self.ip, self.user_name, self.user_pass, self.root_pass
 
+    def update(self, other: Device) -> None:
+        # new vars are validated on next access, info and drivers are kept
+        self.kwargs = other.kwargs
+        self.__dict__.pop("vars", None)
+
+    def loaded(self, name: str) -> bool:
+        # lazy attribute (`vars`, `info`, `ssh`, `junos`) was already built
+        return name in self.__dict__
+
+    @cached_property
+    def info(self) -> Info:
+        return Info(self)
+
+    @cached_property
+    def ssh(self) -> Optional[drivers.SSH]:
         ssh = dict(
-            user_name=user_name,
-            user_pass=user_pass,
-            root_pass=root_pass,
+            user_name=self.user_name,
+            user_pass=self.user_pass,
+            root_pass=self.root_pass,
             device_id=self.id,
         )
-        if isinstance(ip, str):
-            self.ssh = drivers.SSH(ip=ip, **ssh)
-        elif isinstance(ip, list) and len(ip) > 0:
-            self.ssh = drivers.SSH(ip=ip[0], **ssh)
-        elif isinstance(ip, dict) and len(ip) > 0:
-            self.ssh = drivers.SSH(list(ip.values())[0], **ssh)
+        if isinstance(self.ip, str):
+            return drivers.SSH(ip=self.ip, **ssh)
+        elif isinstance(self.ip, list) and len(self.ip) > 0:
+            return drivers.SSH(ip=self.ip[0], **ssh)
+        elif isinstance(self.ip, dict) and len(self.ip) > 0:
+            return drivers.SSH(list(self.ip.values())[0], **ssh)
+        return None
 
-        self.junos = drivers.Junos(self.ssh, device_id=self.id)
+    @cached_property
+    def junos(self) -> drivers.Junos:
+        return drivers.Junos(self.ssh, device_id=self.id)
 
     def __str__(self) -> str:
         return self.id
@@ -57,3 +100,6 @@ class Device:
 
     def __eq__(self, other: Any) -> bool:
         return isinstance(other, Device) and self.id == other.id
+
+    def __hash__(self) -> int:
+        return hash(self.id)
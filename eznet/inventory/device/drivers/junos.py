@@ -305,20 +305,24 @@ class Junos:
             local_path.mkdir(parents=True)
         local_file_name = remote_path.name
         tmp_file_name = ''.join(random.choices(string.ascii_lowercase, k=4)) + "." + local_file_name
-        if re in ["re0", "both"]:
-            await self.run_cmd(f"file copy re0:{remote_path} {tmp_folder}/re0.{tmp_file_name}", timeout=300)
-            await self.ssh.download(f"{tmp_folder}/re0.{tmp_file_name}", f"{local_path}/re0.{local_file_name}")
-            await self.run_cmd(f"file delete {tmp_folder}/re0.{tmp_file_name}")
-
-        if re in ["re1", "both"]:
-            await self.run_cmd(f"file copy re1:{remote_path} {tmp_folder}/re1.{tmp_file_name}", timeout=300)
-            await self.ssh.download(f"{tmp_folder}/re1.{tmp_file_name}", f"{local_path}/re1.{local_file_name}")
-            await self.run_cmd(f"file delete {tmp_folder}/re1.{tmp_file_name}")
+        # failed copy or transfer of any file fails the download
+        done = True
+        for re_name in ["re0", "re1"]:
+            if re not in [re_name, "both"]:
+                continue
+            tmp_file = f"{tmp_folder}/{re_name}.{tmp_file_name}"
+            if await self.run_cmd(f"file copy {re_name}:{remote_path} {tmp_file}", timeout=300) is None:
+                done = False
+                continue
+            if not await self.ssh.download(tmp_file, f"{local_path}/{re_name}.{local_file_name}"):
+                done = False
+            await self.run_cmd(f"file delete {tmp_file}")
 
         if re == "":
-            await self.ssh.download(f"{remote_path}", f"{local_path}/{local_file_name}")
+            if not await self.ssh.download(f"{remote_path}", f"{local_path}/{local_file_name}"):
+                done = False
 
-        return True
+        return done
 
     async def download_tar(
         self,
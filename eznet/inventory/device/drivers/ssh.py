@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import Optional, Type, Dict, Tuple, List, Union
+from typing import AsyncIterator, Optional, Type, Dict, Tuple, List, Set, Union
 from types import TracebackType
 
 import asyncssh
@@ -9,6 +9,7 @@ import os
 import logging
 import socket
 from collections import defaultdict
+from contextlib import asynccontextmanager
 from time import time
 from pathlib import Path
 
@@ -43,6 +44,44 @@ upload_semaphore: Dict[asyncio.AbstractEventLoop, asyncio.Semaphore] = defaultdi
 )
 
 
+class Registry:
+    # in-flight requests of all connections of a job and totals of finished ones,
+    # insertion ordered dict keeps add and remove O(1)
+    def __init__(self) -> None:
+        self.requests: Dict[Request, SSH] = {}
+        self.commands = 0
+        self.received = 0
+
+    def __len__(self) -> int:
+        return len(self.requests)
+
+    def add(self, ssh: SSH, request: Request) -> None:
+        self.requests[request] = ssh
+
+    def remove(self, request: Request) -> None:
+        if self.requests.pop(request, None) is None:
+            return
+        if isinstance(request, CmdRequest):
+            self.commands += 1
+        self.received += request.received
+
+
+request_registry: Dict[asyncio.AbstractEventLoop, Registry] = defaultdict(Registry)
+
+
+def limit_connections(limit: int) -> None:
+    # connections are counted while open: long-running jobs keeping connections need higher limit,
+    # should be called from running loop before first connect
+    connection_semaphore[asyncio.get_running_loop()] = asyncio.Semaphore(limit)
+
+
+def extend_connections(count: int) -> None:
+    # raises limit of running loop, e.g. for devices added to running daemon
+    semaphore = connection_semaphore[asyncio.get_running_loop()]
+    for _ in range(count):
+        semaphore.release()
+
+
 class SSH:
     def __init__(
         self,
@@ -68,7 +107,7 @@ class SSH:
         self.error: Optional[str] = None
         self.lock: Dict[asyncio.AbstractEventLoop, asyncio.Lock] = defaultdict(asyncio.Lock)
 
-        self.requests: List[Request] = []
+        self.requests: Set[Request] = set()
 
     def __str__(self) -> str:
         if self.device_id is not None:
@@ -87,6 +126,25 @@ class SSH:
     ) -> None:
         self.disconnect()
 
+    def track(self, request: Request) -> None:
+        self.requests.add(request)
+        request_registry[asyncio.get_running_loop()].add(self, request)
+
+    def untrack(self, request: Request) -> None:
+        self.requests.discard(request)
+        request_registry[asyncio.get_running_loop()].remove(request)
+
+    @asynccontextmanager
+    async def slot(self, semaphore: asyncio.Semaphore, request: Request) -> AsyncIterator[None]:
+        # request is queued until it gets a slot of semaphore, and tracked until it is finished
+        self.track(request)
+        try:
+            async with semaphore:
+                request.start()
+                yield
+        finally:
+            self.untrack(request)
+
     async def connect(
         self,
         attempts: int = 1,
@@ -168,9 +226,7 @@ class SSH:
             raise RequestError("Not connected")
 
         request = CmdRequest(cmd)
-        self.requests.append(request)
-
-        async with execute_semaphore[asyncio.get_running_loop()]:
+        async with self.slot(execute_semaphore[asyncio.get_running_loop()], request):
             try:
                 chan, session = await self.connection.create_session(
                     create_session_factory(self, request), cmd, encoding=None,
@@ -232,14 +288,13 @@ class SSH:
                         f"{self}: execute `{cmd}`: stderr:\n{request.stderr}"
                     )
 
-                self.requests.remove(request)
                 return request.stdout, request.stderr
 
     async def download(self, src: str, dst: Union[str, Path]) -> List[str]:
         download_files: List[str] = []
 
-        async with download_semaphore[asyncio.get_running_loop()]:
-            request = FileRequest(src)
+        request = FileRequest(src)
+        async with self.slot(download_semaphore[asyncio.get_running_loop()], request):
             t0 = t1 = time()
             r1 = 0
 
@@ -251,9 +306,10 @@ class SSH:
                 nonlocal t0, t1, r1, request
 
                 if request.file_name != src_file.decode(DEFAULT_ENCODING):
-                    self.requests.remove(request)
+                    self.untrack(request)
                     request = FileRequest(src_file.decode(DEFAULT_ENCODING))
-                    self.requests.append(request)
+                    self.track(request)
+                    request.start()
 
                 request.received_bytes = received
                 request.total_bytes = total
@@ -282,7 +338,6 @@ class SSH:
                     request.speed = speed
 
             try:
-                self.requests.append(request)
                 # workaround for avoiding async.scp stucks during cancel
                 done = asyncio.Event()
 
@@ -313,14 +368,14 @@ class SSH:
             else:
                 self.logger.info(f"{self}: download `{src}` --> `{dst}`: DONE")
             finally:
-                self.requests.remove(request)
+                self.untrack(request)
                 return download_files
 
     async def upload(self, src: Union[str, Path], dst: str) -> List[str]:
         upload_files: List[str] = []
 
-        async with upload_semaphore[asyncio.get_running_loop()]:
-            request = FileRequest(src)
+        request = FileRequest(src)
+        async with self.slot(upload_semaphore[asyncio.get_running_loop()], request):
             t0 = t1 = time()
             r1 = 0
 
@@ -332,9 +387,10 @@ class SSH:
                 nonlocal t0, t1, r1, request
 
                 if request.file_name != src_file.decode(DEFAULT_ENCODING):
-                    self.requests.remove(request)
+                    self.untrack(request)
                     request = FileRequest(src_file.decode(DEFAULT_ENCODING))
-                    self.requests.append(request)
+                    self.track(request)
+                    request.start()
 
                 request.received_bytes = received
                 request.total_bytes = total
@@ -363,7 +419,6 @@ class SSH:
                     request.speed = speed
 
             try:
-                self.requests.append(request)
                 # workaround for avoiding async.scp stucks during cancel
                 done = asyncio.Event()
 
@@ -394,20 +449,35 @@ class SSH:
             else:
                 self.logger.info(f"{self}: upload `{src}` --> `{dst}`: DONE")
             finally:
-                self.requests.remove(request)
+                self.untrack(request)
                 return upload_files
 
 
 class Request:
-    pass
+    def __init__(self) -> None:
+        self.queued = time()
+        # None while request waits for a slot
+        self.started: Optional[float] = None
+
+    def start(self) -> None:
+        self.started = time()
+
+    @property
+    def received(self) -> int:
+        return 0
 
 
 class CmdRequest(Request):
     def __init__(self, cmd: str):
+        super().__init__()
         self.cmd = cmd
         self.stdout_bytes = bytearray()
         self.stderr_bytes = bytearray()
 
+    @property
+    def received(self) -> int:
+        return len(self.stdout_bytes) + len(self.stderr_bytes)
+
     @property
     def stdout(self) -> str:
         return self.stdout_bytes.decode(encoding=DEFAULT_ENCODING, errors="ignore")
@@ -422,11 +492,16 @@ class CmdRequest(Request):
 
 class FileRequest(Request):
     def __init__(self, file_name: Union[str, Path], received_bytes: int = 0, total_bytes: int = 0):
+        super().__init__()
         self.file_name = file_name
         self.received_bytes = received_bytes
         self.total_bytes = total_bytes
         self.speed: float = 0
 
+    @property
+    def received(self) -> int:
+        return self.received_bytes
+
     def __repr__(self) -> str:
         received_part = (
             self.received_bytes / self.total_bytes if self.total_bytes > 0 else 1
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
+from typing import Iterator, Any
 
 import eznet
 from eznet.data import Data
@@ -17,4 +18,19 @@ class Device:
         self.chassis = Chassis(device)
         self.lldp = LLDP(device)
 
-        self.interfaces = Data(device, Interface.fetch)
+        self.interfaces = Data(device, Interface.fetch, "interfaces")
+
+    def __iter__(self) -> Iterator[Data[Any, Any]]:
+        for item in vars(self).values():
+            if isinstance(item, Data):
+                yield item
+            else:
+                for sub_item in vars(item).values():
+                    if isinstance(sub_item, Data):
+                        yield sub_item
+
+    def data(self, name: str) -> Data[Any, Any]:
+        for item in self:
+            if item.name == name:
+                return item
+        raise KeyError(name)
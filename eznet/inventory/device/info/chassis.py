@@ -6,9 +6,12 @@ from typing import Dict, Any, Optional, List
 
 from lxml.etree import _Element  # noqa
 
-from eznet.parsers.xml import text, number, timestamp
+from eznet.parsers.xml import text, number, Fields, Field, element, element_number, element_timestamp
 import eznet
 from eznet.data import Data
+from eznet import planner
+
+from .system import ALARM_FIELDS
 
 
 @dataclass
@@ -20,12 +23,7 @@ class Alarm:
 
     @staticmethod
     def from_xml(alarm: _Element) -> Alarm:
-        return Alarm(
-            ts=timestamp(alarm, "alarm-time"),
-            cls=text(alarm, "alarm-class"),
-            description=text(alarm, "alarm-description"),
-            type=text(alarm, "alarm-type"),
-        )
+        return Alarm(**ALARM_FIELDS(alarm))
 
     @staticmethod
     async def fetch(device: eznet.Device) -> Optional[List[Alarm]]:
@@ -42,6 +40,13 @@ class Alarm:
         return None
 
 
+PORT_FIELDS = Fields(
+    cable_type="cable-type",
+    fiber_mode="fiber-mode",
+    wavelength="wavelength",
+)
+
+
 @dataclass
 class Port:
     cable_type: Optional[str]
@@ -50,11 +55,13 @@ class Port:
 
     @staticmethod
     def from_xml(port: _Element) -> Port:
-        return Port(
-            cable_type=text(port, "cable-type"),
-            fiber_mode=text(port, "fiber-mode"),
-            wavelength=text(port, "wavelength"),
-        )
+        return Port(**PORT_FIELDS(port))
+
+
+PIC_FIELDS = Fields(
+    state="pic-state",
+    type="pic-type",
+)
 
 
 @dataclass
@@ -65,10 +72,20 @@ class PIC:
 
     @staticmethod
     def from_xml(pic: _Element) -> PIC:
-        return PIC(
-            state=text(pic, "pic-state"),
-            type=text(pic, "pic-type"),
-        )
+        return PIC(**PIC_FIELDS(pic))
+
+
+FPC_FIELDS = Fields(
+    state="state",
+    comment="comment",
+    cpu_utilization_total=Field("cpu-total", element_number),
+    cpu_utilization_interrupt=Field("cpu-interrupt", element_number),
+    memory_dram=Field("memory-dram-size", element_number),
+    memory_heap_utilization=Field("memory-heap-utilization", element_number),
+    memory_buffer_utilization=Field("memory-buffer-utilization", element_number),
+    description="description",
+    pics=Field("pic", element, many=True),
+)
 
 
 @dataclass
@@ -85,24 +102,20 @@ class FPC:
 
     @staticmethod
     def from_xml(fpc: _Element) -> FPC:
-        return FPC(
-            state=text(fpc, "state"),
-            comment=text(fpc, "comment"),
-            cpu_utilization_total=number(fpc, "cpu-total"),
-            cpu_utilization_interrupt=number(fpc, "cpu-interrupt"),
-            memory_dram=number(fpc, "memory-dram-size"),
-            memory_heap_utilization=number(fpc, "memory-heap-utilization"),
-            memory_buffer_utilization=number(fpc, "memory-buffer-utilization"),
-            description=text(fpc, "description"),
-            pics={
-                pic_slot: PIC.from_xml(pic)
-                for pic in fpc.findall("pic")
-                if (pic_slot := number(pic, "pic-slot")) is not None
-            },
-        )
+        fields = FPC_FIELDS(fpc)
+        fields["pics"] = {
+            pic_slot: PIC.from_xml(pic)
+            for pic in fields["pics"]
+            if (pic_slot := number(pic, "pic-slot")) is not None
+        }
+        return FPC(**fields)
 
     @staticmethod
-    async def fetch(device: eznet.Device, get_ports: bool = False) -> Optional[Dict[int, FPC]]:
+    async def fetch(
+        device: eznet.Device,
+        get_ports: bool = False,
+        refresh: bool = False,
+    ) -> Optional[Dict[int, FPC]]:
         show_chassis_fpc = await device.junos.run_xml_cmd("show chassis fpc pic-status")
         if show_chassis_fpc is not None:
             fpc_info = show_chassis_fpc.find("fpc-information")
@@ -115,22 +128,47 @@ class FPC:
 
                 if not get_ports:
                     return fpc_dict
-                else:
-                    for fpc_number, fpc in fpc_dict.items():
-                        for pic_number, pic in fpc.pics.items():
-                            xml = await device.junos.run_xml_cmd(
-                                f"show chassis pic fpc-slot {fpc_number} pic-slot {pic_number}",
-                            )
-                            if xml is not None:
-                                pic.ports = {
-                                    port_number: Port.from_xml(port)
-                                    for port in xml.findall("fpc-information/fpc/pic-detail/port-information/port")
-                                    if (port_number := number(port, "port-number")) is not None
-                                }
-                    return fpc_dict
+
+                async def fetch_ports(fpc_number: int, pic_number: int, pic: PIC) -> None:
+                    cmd = f"show chassis pic fpc-slot {fpc_number} pic-slot {pic_number}"
+                    xml = await device.junos.run_xml_cmd(cmd)
+                    if xml is not None:
+                        pic.ports = {
+                            port_number: Port.from_xml(port)
+                            for port in xml.findall("fpc-information/fpc/pic-detail/port-information/port")
+                            if (port_number := number(port, "port-number")) is not None
+                        }
+
+                # ports of PICs with the same type and state as in the last snapshot are not refreshed
+                last_fpc_dict = device.info.chassis.fpc.v or {}
+                stale = []
+                for fpc_number, fpc in fpc_dict.items():
+                    for pic_number, pic in fpc.pics.items():
+                        last_fpc = last_fpc_dict.get(fpc_number)
+                        last_pic = last_fpc.pics.get(pic_number) if last_fpc is not None else None
+                        if (
+                            not refresh and last_pic is not None and last_pic.ports is not None
+                            and last_pic.state == pic.state and last_pic.type == pic.type
+                        ):
+                            pic.ports = last_pic.ports
+                        else:
+                            stale.append(fetch_ports(fpc_number, pic_number, pic))
+
+                await planner.gather(device, *stale)
+                return fpc_dict
         return None
 
 
+FW_FIELDS = Fields(
+    firmware=Field("firmware", element, many=True),
+)
+
+FIRMWARE_FIELDS = Fields(
+    type="type",
+    version="firmware-version",
+)
+
+
 @dataclass
 class FW:
     fw: Dict[str, str]
@@ -138,9 +176,9 @@ class FW:
     @staticmethod
     def from_xml(xml: _Element) -> FW:
         fw = {
-            fw_type: text(e, "firmware-version")
-            for e in xml.findall("firmware")
-            if (fw_type := text(e, "type")) is not None
+            firmware["type"]: firmware["version"]
+            for e in FW_FIELDS(xml)["firmware"]
+            if (firmware := FIRMWARE_FIELDS(e))["type"] is not None
         }
         if "ONIE/DIAG" in fw and (onie_diag := fw.pop("ONIE/DIAG")) is not None:
             try:
@@ -167,6 +205,15 @@ class FW:
         return None
 
 
+RE_FIELDS = Fields(
+    model="model",
+    status="status",
+    mastership="mastership-state",
+    start_time=Field("start-time", element_timestamp),
+    reboot_reason="last-reboot-reason",
+)
+
+
 @dataclass
 class RE:
     model: Optional[str]
@@ -177,13 +224,7 @@ class RE:
 
     @staticmethod
     def from_xml(xml: _Element) -> RE:
-        return RE(
-            model=text(xml, "model"),
-            status=text(xml, "status"),
-            mastership=text(xml, "mastership-state"),
-            start_time=timestamp(xml, "start-time"),
-            reboot_reason=text(xml, "last-reboot-reason"),
-        )
+        return RE(**RE_FIELDS(xml))
 
     @staticmethod
     async def fetch(device: eznet.Device) -> Optional[Dict[int, RE]]:
@@ -201,6 +242,6 @@ class RE:
 
 class Chassis:
     def __init__(self, device: eznet.Device):
-        self.fpc = Data(device, FPC.fetch)
-        self.re = Data(device, RE.fetch)
-        self.fw = Data(device, FW.fetch)
+        self.fpc = Data(device, FPC.fetch, "chassis.fpc")
+        self.re = Data(device, RE.fetch, "chassis.re")
+        self.fw = Data(device, FW.fetch, "chassis.fw")
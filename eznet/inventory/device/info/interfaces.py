@@ -1,78 +1,147 @@
 from __future__ import annotations
 
+import fnmatch
+import sys
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Iterable, Literal
 
 from lxml.etree import _Element  # noqa
 
-from eznet.parsers.xml import text, number, timestamp
+from eznet.parsers.xml import (
+    text, Fields, Field, element, element_number, element_symbol, element_text_strip,
+)
 import eznet
+from eznet import planner
+from eznet.inventory.device.drivers.ssh import DEFAULT_CMD_TIMEOUT
+
+INTERFACE_PREFIXES = ["ae", "ge", "xe", "et"]
+# above this number of interfaces one full `show interfaces` is cheaper than requests per interface
+MAX_TARGETED_INTERFACES = 16
+# fields available from `show interfaces terse`
+TERSE_FIELDS = {"admin", "oper", "units"}
+# max age of `chassis.fpc` used to plan shards
+SHARD_PLAN_AGE = 3600
+
+
+AF_FIELDS = Fields(
+    name=Field("address-family-name", element_symbol),
+    address="interface-address/ifa-local",
+    network="interface-address/ifa-destination",
+    ae_bundle="ae-bundle-name",
+)
+
+UNIT_FIELDS = Fields(
+    name=Field("name", element_text_strip),
+    description="description",
+    family=Field("address-family", element, many=True),
+    input_packets=Field("traffic-statistics/input-packets", element_number),
+    output_packets=Field("traffic-statistics/output-packets", element_number),
+)
+
+INTERFACE_FIELDS = Fields(
+    description="description",
+    admin=Field("admin-status", element_symbol),
+    oper=Field("oper-status", element_symbol),
+    speed=Field("speed", element_symbol),
+    units=Field("logical-interface", element, many=True),
+    input_bps=Field("traffic-statistics/input-bps", element_number),
+    input_pps=Field("traffic-statistics/input-pps", element_number),
+    output_bps=Field("traffic-statistics/output-bps", element_number),
+    output_pps=Field("traffic-statistics/output-pps", element_number),
+)
 
 
 @dataclass
 class AF:
+    __slots__ = ("address", "network")
+
     address: Optional[str]
     network: Optional[str]
 
     @staticmethod
-    def from_xml(xml: _Element) -> AF:
+    def from_fields(fields: Dict[str, Any]) -> AF:
         return AF(
-            address=text(xml, "interface-address/ifa-local"),
-            network=text(xml, "interface-address/ifa-destination"),
+            address=fields["address"],
+            network=fields["network"],
         )
 
+    @staticmethod
+    def from_xml(xml: _Element) -> AF:
+        return AF.from_fields(AF_FIELDS(xml))
+
 
 @dataclass
 class UnitTraffic:
+    __slots__ = ("input_packets", "output_packets")
+
     input_packets: Optional[int]
     output_packets: Optional[int]
 
     @staticmethod
-    def from_xml(xml: _Element) -> UnitTraffic:
+    def from_fields(fields: Dict[str, Any]) -> UnitTraffic:
         return UnitTraffic(
-            input_packets=number(xml, "traffic-statistics/input-packets"),
-            output_packets=number(xml, "traffic-statistics/output-packets"),
+            input_packets=fields["input_packets"],
+            output_packets=fields["output_packets"],
         )
 
+    @staticmethod
+    def from_xml(xml: _Element) -> UnitTraffic:
+        return UnitTraffic.from_fields(UNIT_FIELDS(xml))
+
 
 @dataclass
 class Unit:
+    __slots__ = ("description", "family", "traffic")
+
     description: str
     family: Dict[str, AF]
     traffic: UnitTraffic
 
     @staticmethod
-    def from_xml(xml: _Element) -> Unit:
+    def from_fields(fields: Dict[str, Any], families: List[Dict[str, Any]]) -> Unit:
         return Unit(
-            description=text(xml, "description"),
+            description=fields["description"],
             family={
-                text(e, "address-family-name"): AF.from_xml(e)
-                for e in xml.findall("address-family")
+                af_fields["name"]: AF.from_fields(af_fields)
+                for af_fields in families
             },
-            traffic=UnitTraffic.from_xml(xml),
+            traffic=UnitTraffic.from_fields(fields),
         )
 
+    @staticmethod
+    def from_xml(xml: _Element) -> Unit:
+        fields = UNIT_FIELDS(xml)
+        return Unit.from_fields(fields, [AF_FIELDS(e) for e in fields["family"]])
+
 
 @dataclass
 class Traffic:
+    __slots__ = ("input_bps", "input_pps", "output_bps", "output_pps")
+
     input_bps: int
     input_pps: int
     output_bps: int
     output_pps: int
 
     @staticmethod
-    def from_xml(xml: _Element) -> Traffic:
+    def from_fields(fields: Dict[str, Any]) -> Traffic:
         return Traffic(
-            input_bps=number(xml, "traffic-statistics/input-bps"),
-            input_pps=number(xml, "traffic-statistics/input-pps"),
-            output_bps=number(xml, "traffic-statistics/output-bps"),
-            output_pps=number(xml, "traffic-statistics/output-pps"),
+            input_bps=fields["input_bps"],
+            input_pps=fields["input_pps"],
+            output_bps=fields["output_bps"],
+            output_pps=fields["output_pps"],
         )
 
+    @staticmethod
+    def from_xml(xml: _Element) -> Traffic:
+        return Traffic.from_fields(INTERFACE_FIELDS(xml))
+
 
 @dataclass
 class Interface:
+    __slots__ = ("admin", "oper", "description", "speed", "units", "traffic", "ae")
+
     admin: Optional[str]
     oper: Optional[str]
     description: Optional[str]
@@ -83,29 +152,114 @@ class Interface:
 
     @staticmethod
     def from_xml(xml: _Element) -> Interface:
-        ae = text(xml, "logical-interface/address-family[address-family-name=\"aenet\"]ae-bundle-name")
-        if ae is not None:
-            ae = ae.split(".")[0]
+        fields = INTERFACE_FIELDS(xml)
+        units: Dict[int, Unit] = {}
+        ae: Optional[str] = None
+        for e in fields["units"]:
+            unit_fields = UNIT_FIELDS(e)
+            families = [AF_FIELDS(af) for af in unit_fields["family"]]
+            for af_fields in families:
+                if ae is None and af_fields["name"] == "aenet" and af_fields["ae_bundle"] is not None:
+                    ae = sys.intern(af_fields["ae_bundle"].split(".")[0])
+            units[int(f"{unit_fields['name']}".split(".")[1])] = Unit.from_fields(unit_fields, families)
         return Interface(
-            description=text(xml, "description"),
-            admin=text(xml, "admin-status"),
-            oper=text(xml, "oper-status"),
-            speed=text(xml, "speed"),
-            units={
-                int(text(e, "name").split(".")[1]): Unit.from_xml(e)
-                for e in xml.findall("logical-interface")
-            },
-            traffic=Traffic.from_xml(xml),
+            description=fields["description"],
+            admin=fields["admin"],
+            oper=fields["oper"],
+            speed=fields["speed"],
+            units=units,
+            traffic=Traffic.from_fields(fields),
             ae=ae,
         )
 
     @classmethod
-    async def fetch(cls, device: eznet.Device) -> Optional[Dict[str, Interface]]:
-        show_interfaces = await device.junos.run_xml_cmd("show interfaces")
-        if show_interfaces is not None:
-            interface_information = show_interfaces.find("interface-information")
+    async def fetch(
+        cls,
+        device: eznet.Device,
+        names: Optional[Iterable[str]] = None,
+        level: Optional[Literal["terse", "brief", "detail", "extensive"]] = None,
+        fields: Optional[Iterable[str]] = None,
+        shard: bool = False,
+        timeout: int = DEFAULT_CMD_TIMEOUT,
+    ) -> Optional[Dict[str, Interface]]:
+        if level is None and fields is not None and set(fields) <= TERSE_FIELDS:
+            level = "terse"
+        cmd_level = "" if level is None else f" {level}"
+
+        if names is not None:
+            names = sorted(set(names))
+        elif shard:
+            names = await shards(device)
+            if names is not None:
+                return await fetch_patterns(device, names, cmd_level, timeout, shard=True)
+
+        if names is None or len(names) > MAX_TARGETED_INTERFACES:
+            interfaces = parse(
+                await device.junos.run_xml_cmd(f"show interfaces{cmd_level}", timeout=timeout),
+                prefixes=INTERFACE_PREFIXES,
+            )
+            if interfaces is None or names is None:
+                return interfaces
+            return {
+                name: interface
+                for name, interface in interfaces.items()
+                if any(fnmatch.fnmatchcase(name, pattern) for pattern in names)
+            }
+
+        return await fetch_patterns(device, names, cmd_level, timeout)
+
+
+async def shards(device: eznet.Device) -> Optional[List[str]]:
+    # one shard per interface type per online FPC, only sharded fetch depends on chassis.fpc
+    fpc, = await planner.gather(device, device.info.chassis.fpc.fetch(max_age=SHARD_PLAN_AGE))
+    if not fpc:
+        return None
+    return ["ae*"] + [
+        f"{prefix}-{fpc_number}/*"
+        for fpc_number, fpc_info in sorted(fpc.items())
+        if fpc_info.state is None or fpc_info.state.lower() == "online"
+        for prefix in INTERFACE_PREFIXES if prefix != "ae"
+    ]
+
+
+async def fetch_patterns(
+    device: eznet.Device,
+    patterns: List[str],
+    cmd_level: str,
+    timeout: int,
+    shard: bool = False,
+) -> Optional[Dict[str, Interface]]:
+    async def fetch_pattern(pattern: str) -> Optional[Dict[str, Interface]]:
+        return parse(
+            await device.junos.run_xml_cmd(f"show interfaces {pattern}{cmd_level}", timeout=timeout),
+            prefixes=INTERFACE_PREFIXES if shard else None,
+        )
+
+    results = await planner.gather(
+        device, *(fetch_pattern(pattern) for pattern in patterns), return_exceptions=True,
+    )
+    failed = [pattern for pattern, result in zip(patterns, results) if isinstance(result, BaseException)]
+    if failed:
+        device.junos.logger.warning(
+            f"{device.junos}: show interfaces: {len(failed)} of {len(patterns)} requests failed: {', '.join(failed)}"
+        )
+    if not any(isinstance(result, dict) for result in results):
+        return None
+    return {
+        name: interface
+        for result in results if isinstance(result, dict)
+        for name, interface in result.items()
+    }
+
+
+def parse(xml: Optional[_Element], prefixes: Optional[Iterable[str]] = None) -> Optional[Dict[str, Interface]]:
+    if xml is not None:
+        interface_information = xml.find("interface-information")
+        if interface_information is not None:
             return {
-                text(e, "name"): Interface.from_xml(e)
-                for e in interface_information.findall("physical-interface")
-                if text(e, "name")[:2] in ["ae", "ge", "xe", "et"]
+                name: Interface.from_xml(e)
+                for e in interface_information.iterfind("physical-interface")
+                if (name := text(e, "name", strip=True)) is not None
+                and (prefixes is None or name[:2] in prefixes)
             }
+    return None
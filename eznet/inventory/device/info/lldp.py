@@ -8,7 +8,21 @@ from lxml.etree import _Element  # noqa
 
 import eznet
 from eznet.data import Data
-from eznet.parsers.xml import text, timestamp, number
+from eznet.parsers.xml import text, timestamp, number, Fields
+
+
+NEIGHBOR_FIELDS = Fields(
+    system_name="lldp-remote-system-name",
+    chassis_id="lldp-remote-chassis-id",
+    port_id="lldp-remote-port-id",
+    port_description="lldp-remote-port-description",
+    mgmt_address="lldp-remote-management-address",
+)
+
+LOCAL_FIELDS = Fields(
+    chassis_id="lldp-local-chassis-id",
+    system_name="lldp-local-system-name",
+)
 
 
 @dataclass
@@ -16,27 +30,64 @@ class Neighbor:
     system_name: str
     chassis_id: str
     port_id: str
+    port_description: Optional[str] = None
+    mgmt_address: Optional[str] = None
+
+    @property
+    def port(self) -> str:
+        # remote port id could be an ifindex, interface name is in port description then
+        if self.port_id is not None and self.port_id.isdigit() and self.port_description is not None:
+            return self.port_description
+        return self.port_id
 
     @classmethod
-    def from_xml(cls, xml: _Element):
-        return cls(
-            system_name=text(xml, "lldp-remote-system-name"),
-            chassis_id=text(xml, "lldp-remote-chassis-id"),
-            port_id=text(xml, "lldp-remote-port-id"),
-        )
+    def from_xml(cls, xml: _Element) -> Neighbor:
+        return cls(**NEIGHBOR_FIELDS(xml))
 
     @classmethod
     async def fetch(cls, device: eznet.Device) -> Optional[Dict[str, Neighbor]]:
         show_neighbors = await device.junos.run_xml_cmd("show lldp neighbors")
         if show_neighbors is not None:
             neighbors_information = show_neighbors.find("lldp-neighbors-information")
-            return {
-                port_id: Neighbor.from_xml(e)
-                for e in neighbors_information.findall("lldp-neighbor-information")
-                if (port_id := text(e, "lldp-local-port-id")) is not None
-            }
+            if neighbors_information is not None:
+                return {
+                    port_id: Neighbor.from_xml(e)
+                    for e in neighbors_information.findall("lldp-neighbor-information")
+                    if (port_id := text(e, "lldp-local-port-id")) is not None
+                }
+        return None
+
+    @classmethod
+    async def fetch_interface(cls, device: eznet.Device, interface: str) -> Optional[Neighbor]:
+        # per interface output has details: management address, port description
+        xml = await device.junos.run_xml_cmd(f"show lldp neighbors interface {interface}")
+        if xml is not None:
+            e = xml.find("lldp-neighbors-information/lldp-neighbor-information")
+            if e is not None:
+                return Neighbor.from_xml(e)
+        return None
+
+
+@dataclass
+class Local:
+    chassis_id: Optional[str]
+    system_name: Optional[str]
+
+    @staticmethod
+    def from_xml(xml: _Element) -> Local:
+        return Local(**LOCAL_FIELDS(xml))
+
+    @staticmethod
+    async def fetch(device: eznet.Device) -> Optional[Local]:
+        xml = await device.junos.run_xml_cmd("show lldp local-information")
+        if xml is not None:
+            local_info = xml.find("lldp-local-info")
+            if local_info is not None:
+                return Local.from_xml(local_info)
+        return None
 
 
 class LLDP:
     def __init__(self, device: eznet.Device) -> None:
-        self.neighbors = Data(device, Neighbor.fetch)
+        self.neighbors = Data(device, Neighbor.fetch, "lldp.neighbors")
+        self.local = Data(device, Local.fetch, "lldp.local")
@@ -8,7 +8,16 @@ from lxml.etree import _Element  # noqa
 
 import eznet
 from eznet.data import Data
-from eznet.parsers.xml import text, timestamp, number
+from eznet.parsers.xml import text, Fields, Field, element_number, element_text_strip, element_timestamp
+
+
+INFO_FIELDS = Fields(
+    hostname="host-name",
+    sw_family="os-name",
+    sw_version="os-version",
+    hw_model="hardware-model",
+    hw_sn="serial-number",
+)
 
 
 @dataclass
@@ -21,13 +30,7 @@ class Info:
 
     @staticmethod
     def from_xml(system_info: _Element) -> Info:
-        return Info(
-            hostname=text(system_info, "host-name"),
-            sw_family=text(system_info, "os-name"),
-            sw_version=text(system_info, "os-version"),
-            hw_model=text(system_info, "hardware-model"),
-            hw_sn=text(system_info, "serial-number"),
-        )
+        return Info(**INFO_FIELDS(system_info))
 
     @staticmethod
     async def fetch(device: eznet.Device) -> Optional[Info]:
@@ -41,6 +44,14 @@ class Info:
         return None
 
 
+ALARM_FIELDS = Fields(
+    ts=Field("alarm-time", element_timestamp),
+    cls="alarm-class",
+    description="alarm-description",
+    type="alarm-type",
+)
+
+
 @dataclass
 class Alarm:
     ts: Optional[datetime]
@@ -50,12 +61,7 @@ class Alarm:
 
     @staticmethod
     def from_xml(alarm: _Element) -> Alarm:
-        return Alarm(
-            ts=timestamp(alarm, "alarm-time"),
-            cls=text(alarm, "alarm-class"),
-            description=text(alarm, "alarm-description"),
-            type=text(alarm, "alarm-type"),
-        )
+        return Alarm(**ALARM_FIELDS(alarm))
 
     @staticmethod
     async def fetch(device: eznet.Device) -> Optional[List[Alarm]]:
@@ -72,6 +78,14 @@ class Alarm:
         return None
 
 
+SW_FIELDS = Fields(
+    hostname="host-name",
+    product_model="product-model",
+    product_name="product-name",
+    junos="junos-version",
+)
+
+
 @dataclass
 class SW:
     hostname: Optional[str]
@@ -81,12 +95,7 @@ class SW:
 
     @staticmethod
     def from_xml(soft_info: _Element) -> SW:
-        return SW(
-            hostname=text(soft_info, "host-name"),
-            product_model=text(soft_info, "product-model"),
-            product_name=text(soft_info, "product-name"),
-            junos=text(soft_info, "junos-version"),
-        )
+        return SW(**SW_FIELDS(soft_info))
 
     @staticmethod
     async def fetch(device: eznet.Device, both_re: bool = False) -> Optional[Dict[str, SW]]:
@@ -116,6 +125,15 @@ class SW:
         return None
 
 
+UPTIME_FIELDS = Fields(
+    current_time=Field("current-time/date-time", element_timestamp),
+    system_boot_time=Field("system-booted-time/date-time", element_timestamp),
+    protocol_start_time=Field("protocols-started-time/date-time", element_timestamp),
+    last_config_time=Field("last-configured-time/date-time", element_timestamp),
+    time_source=Field("time-source", element_text_strip),
+)
+
+
 @dataclass
 class Uptime:
     current_time: Optional[datetime]
@@ -126,13 +144,7 @@ class Uptime:
 
     @staticmethod
     def from_xml(uptime_info: _Element) -> Uptime:
-        return Uptime(
-            current_time=timestamp(uptime_info, "current-time/date-time"),
-            system_boot_time=timestamp(uptime_info, "system-booted-time/date-time"),
-            protocol_start_time=timestamp(uptime_info, "protocols-started-time/date-time"),
-            last_config_time=timestamp(uptime_info, "last-configured-time/date-time"),
-            time_source=text(uptime_info, "time-source", strip=True),
-        )
+        return Uptime(**UPTIME_FIELDS(uptime_info))
 
     @staticmethod
     async def fetch(device: eznet.Device, both_re: bool = False) -> Optional[Dict[str, Uptime]]:
@@ -157,6 +169,13 @@ class Uptime:
         return None
 
 
+CORE_DUMP_FIELDS = Fields(
+    name="file-name",
+    size=Field("file-size", element_number),
+    ts=Field("file-date", element_timestamp),
+)
+
+
 @dataclass
 class CoreDump:
     name: Optional[str]
@@ -166,14 +185,20 @@ class CoreDump:
     host: Optional[bool] = None
 
     @staticmethod
-    def from_xml(file_info: _Element) -> CoreDump:
-        return CoreDump(
-            name=text(file_info, "file-name"),
-            size=number(file_info, "file-size"),
-            ts=timestamp(file_info, "file-date"),
-            re=text(file_info, "../../../re-name"),
-            host=file_info.find("../..").attrib.get("style") == "host" or None,  # type: ignore[union-attr]
-        )
+    def from_xml(file_info: _Element, re: Optional[str] = None, host: Optional[bool] = None) -> CoreDump:
+        return CoreDump(**CORE_DUMP_FIELDS(file_info), re=re, host=host)
+
+    @staticmethod
+    def parse(xml: _Element) -> List[CoreDump]:
+        # RE and host are the same for all files of a directory list
+        cores = []
+        for directory_list in xml.iterfind(".//directory-list"):
+            parent = directory_list.getparent()
+            re = text(parent, "re-name") if parent is not None else None
+            host = directory_list.attrib.get("style") == "host" or None
+            for file_info in directory_list.iterfind("directory/file-information"):
+                cores.append(CoreDump.from_xml(file_info, re, host))
+        return cores
 
     @staticmethod
     async def fetch(device: eznet.Device, both_re: bool = False) -> Optional[List[CoreDump]]:
@@ -186,17 +211,14 @@ class CoreDump:
                 "show system core-dumps routing-engine both",
             )
         if xml is not None:
-            return [
-                CoreDump.from_xml(file_info)
-                for file_info in xml.findall(".//directory-list/directory/file-information")
-            ]
+            return CoreDump.parse(xml)
         return None
 
 
 class System:
     def __init__(self, device: eznet.Device) -> None:
-        self.info = Data(device, Info.fetch)
-        self.alarms = Data(device, Alarm.fetch)
-        self.sw = Data(device, SW.fetch)
-        self.uptime = Data(device, Uptime.fetch)
-        self.coredumps = Data(device, CoreDump.fetch)
+        self.info = Data(device, Info.fetch, "system.info")
+        self.alarms = Data(device, Alarm.fetch, "system.alarms")
+        self.sw = Data(device, SW.fetch, "system.sw")
+        self.uptime = Data(device, Uptime.fetch, "system.uptime")
+        self.coredumps = Data(device, CoreDump.fetch, "system.coredumps")
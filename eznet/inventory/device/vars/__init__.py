@@ -1,5 +1,5 @@
 from dataclasses import dataclass, field
-from typing import Optional, Dict
+from typing import Optional, Dict, List
 
 from .system import System
 from .interfaces import Interface
@@ -8,4 +8,12 @@ from .interfaces import Interface
 @dataclass
 class Device:
     system: Optional[System] = None
+    model: Optional[str] = None
+    tags: List[str] = field(default_factory=list)
     interfaces: Dict[str, Interface] = field(default_factory=dict)
+
+    def interface_names(self) -> List[str]:
+        return [
+            *self.interfaces.keys(),
+            *(member for interface in self.interfaces.values() for member in interface.members.keys()),
+        ]
@@ -0,0 +1,229 @@
+from __future__ import annotations
+
+import csv
+import hashlib
+import json
+import logging
+import os
+from abc import ABCMeta, abstractmethod
+from itertools import groupby
+from pathlib import Path
+from typing import Any, ClassVar, Dict, Iterable, List, Optional, Set, TextIO, Type, Union
+
+import yaml
+
+try:
+    from yaml import CSafeDumper as SafeDumper
+except ImportError:  # pragma: no cover
+    from yaml import SafeDumper  # type: ignore[assignment]
+
+from .device import Device
+
+logger = logging.getLogger(__name__)
+
+Record = Dict[str, Any]
+
+
+def address(device: Device) -> Optional[str]:
+    # the same address as used by ssh driver, without building driver
+    if isinstance(device.ip, str):
+        return device.ip
+    elif isinstance(device.ip, list) and len(device.ip) > 0:
+        return device.ip[0]
+    elif isinstance(device.ip, dict) and len(device.ip) > 0:
+        return list(device.ip.values())[0]
+    return None
+
+
+def dump(data: Any) -> str:
+    return yaml.dump(data, Dumper=SafeDumper, default_flow_style=False)
+
+
+class State:
+    # hashes of exported records, to export only changed devices next time
+    def __init__(self, path: Union[str, Path]) -> None:
+        self.path = Path(path).expanduser()
+        self.hashes: Dict[str, str] = {}
+        if self.path.exists():
+            try:
+                with open(self.path) as io:
+                    self.hashes = json.load(io)
+            except (OSError, ValueError) as err:
+                logger.error(f"export: state {self.path}: {err.__class__.__name__}: {err}")
+        self.seen: Set[str] = set()
+
+    def changed(self, device_id: str, record: Record) -> bool:
+        self.seen.add(device_id)
+        digest = hashlib.sha1(json.dumps(record, sort_keys=True, default=str).encode()).hexdigest()
+        if self.hashes.get(device_id) == digest:
+            return False
+        self.hashes[device_id] = digest
+        return True
+
+    def removed(self) -> List[str]:
+        removed = sorted(set(self.hashes) - self.seen)
+        for device_id in removed:
+            del self.hashes[device_id]
+        return removed
+
+    def save(self) -> None:
+        if not self.path.parent.exists():
+            self.path.parent.mkdir(parents=True)
+        tmp = self.path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp, "w") as io:
+            json.dump(self.hashes, io)
+        os.replace(tmp, self.path)
+
+
+class Exporter(metaclass=ABCMeta):
+    # writes devices one by one, with `state` only devices changed since last export:
+    # only line formats could be incremental, document with only changed devices looks complete
+    INCREMENTAL: ClassVar[bool] = True
+
+    def __init__(self, io: TextIO) -> None:
+        self.io = io
+        self.count = 0
+
+    def record(self, device: Device) -> Record:
+        return {
+            "id": device.id,
+            "name": device.name,
+            "site": device.site,
+            "hostname": address(device),
+            "model": device.kwargs.get("model"),
+            "tags": device.kwargs.get("tags") or [],
+        }
+
+    def order(self, devices: Iterable[Device]) -> Iterable[Device]:
+        return devices
+
+    def begin(self) -> None:
+        pass
+
+    @abstractmethod
+    def write(self, device: Device, record: Record) -> None:
+        ...
+
+    def remove(self, device_id: str) -> None:
+        # formats without removal records just skip removed devices
+        pass
+
+    def end(self) -> None:
+        pass
+
+    def check(self, state: Optional[State]) -> None:
+        if state is not None and not self.INCREMENTAL:
+            raise ValueError(f"{self.__class__.__name__.lower()} export could not be incremental")
+
+    def export(self, devices: Iterable[Device], state: Optional[State] = None) -> int:
+        self.check(state)
+        self.begin()
+        for device in self.order(devices):
+            record = self.record(device)
+            if state is not None and not state.changed(device.id, record):
+                continue
+            self.write(device, record)
+            self.count += 1
+        if state is not None:
+            for device_id in state.removed():
+                self.remove(device_id)
+        self.end()
+        return self.count
+
+
+class Rundeck(Exporter):
+    INCREMENTAL = False
+
+    def record(self, device: Device) -> Record:
+        hostname = address(device)
+        return {
+            "nodename": device.id,
+            **({"hostname": hostname} if hostname is not None else {}),
+        }
+
+    def order(self, devices: Iterable[Device]) -> Iterable[Device]:
+        return sorted(devices, key=lambda device: device.id)
+
+    def write(self, device: Device, record: Record) -> None:
+        # top level mapping is a sequence of one key mappings
+        self.io.write(dump({device.id: record}))
+
+    def end(self) -> None:
+        if self.count == 0:
+            self.io.write("{}\n")
+
+
+class Ansible(Exporter):
+    # devices are grouped by site
+    INCREMENTAL = False
+    UNGROUPED = "ungrouped"
+    INDENT = " " * 8
+
+    def record(self, device: Device) -> Record:
+        hostname = address(device)
+        return {
+            **({"ansible_host": hostname} if hostname is not None else {}),
+            **({"model": device.kwargs["model"]} if device.kwargs.get("model") is not None else {}),
+        }
+
+    def order(self, devices: Iterable[Device]) -> Iterable[Device]:
+        return sorted(devices, key=lambda device: (device.site or "", device.id))
+
+    def export(self, devices: Iterable[Device], state: Optional[State] = None) -> int:
+        self.check(state)
+        self.begin()
+        for site, site_devices in groupby(self.order(devices), key=lambda device: device.site):
+            header = False
+            for device in site_devices:
+                record = self.record(device)
+                if self.count == 0:
+                    self.io.write("all:\n  children:\n")
+                if not header:
+                    group = dump({site or self.UNGROUPED: {"hosts": None}}).splitlines()[0]
+                    self.io.write(f"    {group}\n      hosts:\n")
+                    header = True
+                self.write(device, record)
+                self.count += 1
+        self.end()
+        return self.count
+
+    def write(self, device: Device, record: Record) -> None:
+        for line in dump({device.id: record}).splitlines():
+            self.io.write(f"{self.INDENT}{line}\n")
+
+    def end(self) -> None:
+        if self.count == 0:
+            self.io.write("all: {}\n")
+
+
+class JsonLines(Exporter):
+    def write(self, device: Device, record: Record) -> None:
+        self.io.write(json.dumps(record) + "\n")
+
+    def remove(self, device_id: str) -> None:
+        self.io.write(json.dumps({"id": device_id, "removed": True}) + "\n")
+
+
+class Csv(Exporter):
+    FIELDS = ["id", "name", "site", "hostname", "model", "tags", "removed"]
+
+    def __init__(self, io: TextIO) -> None:
+        super().__init__(io)
+        self.writer = csv.DictWriter(io, fieldnames=self.FIELDS)
+
+    def begin(self) -> None:
+        self.writer.writeheader()
+
+    def write(self, device: Device, record: Record) -> None:
+        self.writer.writerow({**record, "tags": " ".join(f"{tag}" for tag in record["tags"]), "removed": ""})
+
+    def remove(self, device_id: str) -> None:
+        self.writer.writerow({"id": device_id, "removed": "true"})
+
+
+EXPORTERS: Dict[str, Type[Exporter]] = {
+    "rundeck": Rundeck,
+    "ansible": Ansible,
+    "jsonl": JsonLines,
+    "csv": Csv,
+}
@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union, cast
+
+import yaml
+
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:  # pragma: no cover
+    from yaml import SafeLoader  # type: ignore[assignment]
+
+try:
+    import _jsonnet
+except ImportError:  # pragma: no cover
+    _jsonnet = None
+
+logger = logging.getLogger(__name__)
+
+SUFFIXES = [".yaml", ".yml", ".json", ".jsonnet"]
+DEFAULT_CACHE_PATH = Path(os.environ.get("XDG_CACHE_HOME", "~/.cache")).expanduser() / "eznet" / "inventory"
+# process pool is started only if there are enough files to parse
+MIN_PARALLEL_FILES = 4
+
+Result = Union[Dict[str, Any], Exception]
+# yaml and json files are cached by (mtime, size),
+# jsonnet files by digest of content of file and all imported files
+Key = Union[Tuple[int, int], str]
+
+
+def files(path: Path) -> List[Path]:
+    if path.is_dir():
+        logger.info(f"inventory: load from {path}/")
+        return [
+            file
+            for child in sorted(path.glob("*"))
+            if child.is_dir() or child.suffix in SUFFIXES
+            for file in files(child)
+        ]
+    return [path]
+
+
+def digest(path: Path, imports: Iterable[str] = (), contents: Optional[List[bytes]] = None) -> str:
+    files = [f"{path}", *imports]
+    if contents is None:
+        contents = [Path(file).read_bytes() for file in files]
+    sha = hashlib.sha256()
+    for file, content in zip(files, contents):
+        sha.update(file.encode() + b"\0" + hashlib.sha256(content).digest())
+    return sha.hexdigest()
+
+
+def evaluate(path: Path) -> Tuple[Dict[str, Any], List[str], str]:
+    # returns evaluated jsonnet, imported files and digest of all evaluated content
+    if _jsonnet is None:
+        raise ImportError("jsonnet is not installed")
+    contents = [path.read_bytes()]
+    imports: List[str] = []
+
+    def import_callback(directory: str, rel: str) -> Tuple[str, bytes]:
+        file = f"{Path(directory) / rel}"
+        content = Path(file).read_bytes()
+        if file not in imports:
+            imports.append(file)
+            contents.append(content)
+        return file, content
+
+    data = json.loads(_jsonnet.evaluate_snippet(f"{path}", contents[0].decode(), import_callback=import_callback))
+    return data, imports, digest(path, imports, contents)
+
+
+def parse(path: Path) -> Tuple[Dict[str, Any], List[str], Optional[Key]]:
+    if path.suffix in [".yaml", ".yml"]:
+        with open(path, "rb") as io:
+            return yaml.load(io, Loader=SafeLoader) or {}, [], None
+    elif path.suffix == ".json":
+        with open(path, "rb") as io:
+            return json.load(io), [], None
+    elif path.suffix == ".jsonnet":
+        return evaluate(path)
+    raise ValueError(f"unknown inventory file format {path.suffix[1:]}")
+
+
+def parse_safe(path: Path) -> Tuple[Result, List[str], Optional[Key]]:
+    try:
+        return parse(path)
+    except Exception as err:
+        return err, [], None
+
+
+class Cache:
+    # parsed files pickled per source file, valid while key of source file is the same
+    def __init__(self, path: Union[str, Path] = DEFAULT_CACHE_PATH) -> None:
+        self.path = Path(path).expanduser()
+
+    @staticmethod
+    def stat(path: Path) -> Tuple[int, int]:
+        stat = path.stat()
+        return stat.st_mtime_ns, stat.st_size
+
+    def file(self, path: Path) -> Path:
+        return self.path / (hashlib.sha1(f"{path.resolve()}".encode()).hexdigest() + ".pickle")
+
+    def get(self, path: Path, key: Optional[Key] = None) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self.file(path), "rb") as io:
+                cached_key, data, imports = pickle.load(io)
+            if key is None:
+                key = digest(path, imports) if path.suffix == ".jsonnet" else self.stat(path)
+        except Exception:
+            return None
+        if cached_key != key:
+            return None
+        return cast(Dict[str, Any], data)
+
+    def set(self, path: Path, data: Dict[str, Any], key: Key, imports: Iterable[str] = ()) -> None:
+        try:
+            self.path.mkdir(parents=True, exist_ok=True)
+            file = self.file(path)
+            tmp = file.with_suffix(f".{os.getpid()}.tmp")
+            with open(tmp, "wb") as io:
+                pickle.dump((key, data, list(imports)), io, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, file)
+        except OSError as err:
+            logger.warning(f"inventory: cache {path}: {err.__class__.__name__}: {err}")
+
+
+def load(
+    paths: Iterable[Path],
+    cache: Optional[Cache] = None,
+    workers: Optional[int] = None,
+) -> List[Tuple[Path, Result]]:
+    paths = list(paths)
+    results: Dict[Path, Result] = {}
+    keys: Dict[Path, Key] = {}
+    misses: List[Path] = []
+    for path in paths:
+        if cache is not None and path.suffix in [".yaml", ".yml", ".json"]:
+            # stat before parsing: file changed during parsing will be parsed again next time
+            try:
+                keys[path] = cache.stat(path)
+            except OSError as err:
+                results[path] = err
+                continue
+        if cache is not None and (data := cache.get(path, keys.get(path))) is not None:
+            results[path] = data
+            continue
+        misses.append(path)
+
+    parsed: Optional[List[Tuple[Result, List[str], Optional[Key]]]] = None
+    if len(misses) >= MIN_PARALLEL_FILES and workers != 1:
+        try:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                parsed = list(executor.map(parse_safe, misses, chunksize=max(1, len(misses) // 64)))
+        except (OSError, BrokenProcessPool) as err:
+            logger.warning(f"inventory: process pool: {err.__class__.__name__}: {err}")
+    if parsed is None:
+        parsed = [parse_safe(path) for path in misses]
+
+    for path, (result, imports, key) in zip(misses, parsed):
+        results[path] = result
+        key = key or keys.get(path)
+        if cache is not None and key is not None and not isinstance(result, Exception):
+            cache.set(path, result, key, imports)
+
+    return [(path, results[path]) for path in paths]
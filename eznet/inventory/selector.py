@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import fnmatch
+import re as regexp
+from typing import List, Optional, Pattern, Set, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from . import Inventory
+
+GLOB_CHARS = set("*?[")
+# attributes selected with `<attribute>:<glob>`, `vars.<path>=<glob>` selects any var
+ATTRIBUTES = {"id", "site", "model", "tag"}
+
+
+class SelectorError(ValueError):
+    pass
+
+
+class Term:
+    def __init__(self, attribute: str, pattern: str, negate: bool = False) -> None:
+        self.attribute = attribute
+        self.pattern = pattern
+        self.negate = negate
+        # exact values are resolved with one dict lookup
+        self.regex: Optional[Pattern[str]] = None
+        if GLOB_CHARS & set(pattern):
+            self.regex = regexp.compile(fnmatch.translate(pattern))
+
+    @classmethod
+    def parse(cls, term: str) -> Term:
+        negate = term.startswith("!")
+        if negate:
+            term = term[1:]
+        if term.startswith("vars.") and "=" in term:
+            attribute, pattern = term.split("=", 1)
+        elif ":" in term and term.split(":", 1)[0] in ATTRIBUTES:
+            attribute, pattern = term.split(":", 1)
+        else:
+            attribute, pattern = "id", term
+        if not pattern:
+            raise SelectorError(f"empty pattern in `{term}`")
+        return cls(attribute, pattern, negate)
+
+    def resolve(self, inventory: Inventory) -> Set[str]:
+        if self.attribute == "id":
+            if self.regex is None:
+                return {self.pattern} if self.pattern in inventory.by_id else set()
+            return {device_id for device_id in inventory.by_id if self.regex.match(device_id)}
+        index = inventory.index(self.attribute)
+        if self.regex is None:
+            return set(index.get(self.pattern, ()))
+        return set().union(*(ids for value, ids in index.items() if self.regex.match(value)))
+
+
+class Selector:
+    # terms separated by spaces are joined with AND, `!` negates term:
+    #   `site:lab* model:mx* !tag:spare`
+    def __init__(self, expression: str) -> None:
+        self.expression = expression
+        self.terms: List[Term] = [Term.parse(term) for term in expression.split()]
+        if not self.terms:
+            raise SelectorError("empty selector")
+
+    def resolve(self, inventory: Inventory) -> Set[str]:
+        positive = [term for term in self.terms if not term.negate]
+        if positive:
+            ids = positive[0].resolve(inventory)
+            for term in positive[1:]:
+                if not ids:
+                    break
+                ids &= term.resolve(inventory)
+        else:
+            ids = set(inventory.by_id)
+        for term in self.terms:
+            if term.negate and ids:
+                ids -= term.resolve(inventory)
+        return ids
+
+    def __repr__(self) -> str:
+        return f"Selector({self.expression!r})"
@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple, TYPE_CHECKING
+
+from . import loader
+from .device import Device
+
+if TYPE_CHECKING:
+    from . import Inventory
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_INTERVAL = 5
+
+
+@dataclass
+class Diff:
+    added: List[Device] = field(default_factory=list)
+    removed: List[Device] = field(default_factory=list)
+    # same device object with new vars
+    modified: List[Device] = field(default_factory=list)
+    # new objects for devices with changed connection parameters,
+    # connections of removed and replaced devices should be closed by caller
+    replaced: List[Tuple[Device, Device]] = field(default_factory=list)
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.removed or self.modified or self.replaced)
+
+    def __str__(self) -> str:
+        return (
+            f"added {len(self.added)}, removed {len(self.removed)}, "
+            f"modified {len(self.modified)}, replaced {len(self.replaced)}"
+        )
+
+
+Stats = Dict[Path, Tuple[int, int]]
+
+
+class Watcher:
+    # polls stat of all files under loaded inventory paths,
+    # parses again only changed files and patches inventory in place
+    def __init__(self, inventory: Inventory, interval: float = DEFAULT_INTERVAL) -> None:
+        self.inventory = inventory
+        self.interval = interval
+        self.stats = self.scan()
+
+    def scan(self) -> Stats:
+        stats: Stats = {}
+        for path in self.inventory.paths:
+            for file in ([path] if path.is_file() else sorted(path.rglob("*"))):
+                try:
+                    if file.is_file():
+                        stats[file] = loader.Cache.stat(file)
+                except OSError:
+                    pass
+        return stats
+
+    def changes(self) -> List[Path]:
+        stats = self.scan()
+        changed = {
+            file for file in set(stats) | set(self.stats)
+            if stats.get(file) != self.stats.get(file)
+        }
+        self.stats = stats
+        files = [file for path in self.inventory.paths if path.exists() for file in loader.files(path)]
+        # any other changed file could be imported by jsonnet
+        if any(file.suffix not in loader.SUFFIXES for file in changed):
+            changed.update(file for file in files if file.suffix == ".jsonnet")
+        removed = [file for file in self.inventory.sources if file in changed and file not in stats]
+        return [file for file in files if file in changed] + removed
+
+    def parse(self, files: List[Path]) -> List[Tuple[Path, loader.Result]]:
+        return loader.load([file for file in files if file.exists()], cache=self.inventory.cache)
+
+    def apply(self, files: List[Path], results: List[Tuple[Path, loader.Result]]) -> Diff:
+        diff = Diff()
+        parsed: Dict[Path, List[Device]] = {file: [] for file in files if not file.exists()}
+        for file, data in results:
+            if isinstance(data, Exception):
+                # devices of broken file are kept as they are
+                logger.error(f"inventory: reload {file}: {data.__class__.__name__}: {data}")
+                continue
+            try:
+                parsed[file] = self.inventory.parse(data, site=file.with_suffix("").name)
+            except Exception as err:
+                logger.error(f"inventory: reload {file}: {err.__class__.__name__}: {err}")
+
+        for file, devices in parsed.items():
+            old_ids = self.inventory.sources.get(file, [])
+            new_ids = {device.id for device in devices}
+            for device_id in old_ids:
+                if device_id not in new_ids and (device := self.inventory.remove(device_id)) is not None:
+                    diff.removed.append(device)
+            ids = []
+            for device in devices:
+                old = self.inventory.device(device.id)
+                if old is None:
+                    if self.inventory.add(device):
+                        diff.added.append(device)
+                        ids.append(device.id)
+                elif device.id not in old_ids:
+                    logger.error(f"inventory: reload {file}: duplicate device with {device.id}")
+                elif old.connection() != device.connection():
+                    self.inventory.replace(old, device)
+                    diff.replaced.append((old, device))
+                    ids.append(device.id)
+                else:
+                    if old.kwargs != device.kwargs:
+                        self.inventory.update(old, device)
+                        diff.modified.append(old)
+                    ids.append(device.id)
+            if file.exists():
+                self.inventory.sources[file] = ids
+            else:
+                self.inventory.sources.pop(file, None)
+
+        if diff:
+            logger.info(f"inventory: reload: {diff}")
+        return diff
+
+    def reload(self) -> Diff:
+        files = self.changes()
+        if not files:
+            return Diff()
+        return self.apply(files, self.parse(files))
+
+    async def watch(self, callback: Optional[Callable[[Diff], None]] = None) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            await asyncio.sleep(self.interval)
+            files = self.changes()
+            if not files:
+                continue
+            # files are parsed out of event loop, inventory is patched in event loop
+            results = await loop.run_in_executor(None, self.parse, files)
+            diff = self.apply(files, results)
+            if diff and callback is not None:
+                callback(diff)
@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+import shutil
+from datetime import datetime
+from pathlib import Path
+from time import monotonic, time
+from typing import Dict, List, Optional, Set, Type, Union
+from types import TracebackType
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_JOBS_PATH = Path("~/.eznet/jobs")
+JOURNAL_FILE = "journal.jsonl"
+STORE_FILE = "store.db"
+# records are flushed immediately, synced to disk not more often than this
+SYNC_INTERVAL = 1.0
+# jobs not updated for this number of seconds are removed
+DEFAULT_JOB_RETENTION = 7 * 24 * 3600
+
+
+class Journal:
+    # append only log of completed steps of every device of a job, job directory is named by job name,
+    # truncated last record of an interrupted job is ignored on resume
+    def __init__(
+        self,
+        jobs_path: Union[str, Path],
+        job_name: str,
+        sync_interval: float = SYNC_INTERVAL,
+    ) -> None:
+        self.job_name = job_name
+        self.path = Path(jobs_path).expanduser() / job_name
+        if not self.path.exists():
+            self.path.mkdir(parents=True)
+        self.sync_interval = sync_interval
+        self.steps: Dict[str, Set[str]] = {}
+        self.devices: Set[str] = set()
+        self.io = open(self.path / JOURNAL_FILE, "a")
+        if not self.load():
+            # new records should not be glued to the truncated one
+            self.io.write("\n")
+        self.synced = monotonic()
+
+    @staticmethod
+    def exists(jobs_path: Union[str, Path], job_name: str) -> bool:
+        return (Path(jobs_path).expanduser() / job_name / JOURNAL_FILE).exists()
+
+    @staticmethod
+    def cleanup(
+        jobs_path: Union[str, Path],
+        retention: float = DEFAULT_JOB_RETENTION,
+        keep: Optional[str] = None,
+    ) -> List[str]:
+        # removes expired jobs with their stores, returns names of removed jobs
+        jobs_path = Path(jobs_path).expanduser()
+        if not jobs_path.is_dir():
+            return []
+        removed: List[str] = []
+        for path in jobs_path.iterdir():
+            if not path.is_dir() or path.name == keep:
+                continue
+            journal_path = path / JOURNAL_FILE
+            try:
+                mtime = (journal_path if journal_path.exists() else path).stat().st_mtime
+                if time() - mtime > retention:
+                    shutil.rmtree(path)
+                    removed.append(path.name)
+            except OSError as err:
+                logger.warning(f"journal {path}: cleanup: {err.__class__.__name__}: {err}")
+        return removed
+
+    def __str__(self) -> str:
+        return f"journal {self.path}"
+
+    def __enter__(self) -> Journal:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        self.close()
+
+    @property
+    def store_path(self) -> Path:
+        return self.path / STORE_FILE
+
+    def load(self) -> bool:
+        # returns False if the last record is not terminated
+        line = "\n"
+        with open(self.path / JOURNAL_FILE) as io:
+            for n, line in enumerate(io, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                    device_id = record["device"]
+                except (ValueError, KeyError, TypeError) as err:
+                    logger.warning(f"{self}: line {n}: {err.__class__.__name__}: {err}")
+                    continue
+                if record.get("step") is None:
+                    self.devices.add(device_id)
+                else:
+                    self.steps.setdefault(device_id, set()).add(record["step"])
+        return line.endswith("\n")
+
+    def done(self, device_id: str, step: Optional[str] = None) -> bool:
+        # without step: all steps of device are done
+        if step is None:
+            return device_id in self.devices
+        return device_id in self.devices or step in self.steps.get(device_id, ())
+
+    def mark(self, device_id: str, step: Optional[str] = None) -> None:
+        if self.done(device_id, step):
+            return
+        if step is None:
+            self.devices.add(device_id)
+        else:
+            self.steps.setdefault(device_id, set()).add(step)
+        record = {"device": device_id, "step": step, "ts": datetime.now().isoformat()}
+        self.io.write(json.dumps(record) + "\n")
+        self.io.flush()
+        if monotonic() - self.synced >= self.sync_interval:
+            self.sync()
+
+    def sync(self) -> None:
+        os.fsync(self.io.fileno())
+        self.synced = monotonic()
+
+    def close(self) -> None:
+        if not self.io.closed:
+            self.sync()
+            self.io.close()
+
+    def remove(self) -> None:
+        # finished job has nothing to resume, its store should be closed before
+        self.close()
+        shutil.rmtree(self.path)
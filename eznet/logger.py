@@ -35,6 +35,7 @@ def config_logger(
     file: Union[None, str, Path] = None,
     force_terminal: Optional[bool] = None,
     width: Optional[int] = None,
+    stderr: bool = False,
 ) -> None:
     logger = logging.getLogger(MODULE)
     logger.setLevel(level)
@@ -45,6 +46,7 @@ def config_logger(
         theme=theme,
         force_terminal=force_terminal,
         width=width,
+        stderr=stderr,
     )
 
     logger.addHandler(
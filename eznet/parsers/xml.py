@@ -1,41 +1,134 @@
+import sys
+from dataclasses import dataclass
 from datetime import datetime
-from typing import Optional
+from typing import Optional, Callable, Any, Dict, Union
 
 from lxml.etree import _Element  # noqa
 
 
+def element_text(e: _Element) -> Optional[str]:
+    return e.text
+
+
+def element_text_strip(e: _Element) -> Optional[str]:
+    if e.text is not None:
+        return e.text.strip()
+    return None
+
+
+def element_symbol(e: _Element) -> Optional[str]:
+    if e.text is not None:
+        return sys.intern(e.text.strip())
+    return None
+
+
+def element_number(e: _Element) -> Optional[int]:
+    if e.text is not None and e.text.isdigit():
+        return int(e.text)
+    return None
+
+
+def element_timestamp(e: _Element) -> Optional[datetime]:
+    if e.text is not None and e.text.isdigit():
+        return datetime.fromtimestamp(float(e.text))
+    e_attrib_seconds = e.attrib.get("seconds")
+    if isinstance(e_attrib_seconds, str) and e_attrib_seconds.isdigit():
+        try:
+            return datetime.fromtimestamp(int(e_attrib_seconds))
+        except ValueError:
+            pass
+    e_attrib_format = e.attrib.get("format")
+    if isinstance(e_attrib_format, str):
+        try:
+            return datetime.strptime(e_attrib_format, "%b %d %Y")
+        except ValueError:
+            pass
+    return None
+
+
+def element(e: _Element) -> _Element:
+    return e
+
+
 def text(xml: _Element, xpath: str, strip: bool = False) -> Optional[str]:
     e = xml.find(xpath)
-    if e is not None and e.text is not None:
+    if e is not None:
         if not strip:
-            return e.text
+            return element_text(e)
         else:
-            return e.text.strip()
+            return element_text_strip(e)
+    return None
+
+
+def symbol(xml: _Element, xpath: str) -> Optional[str]:
+    # interned text for values repeated across many objects: status, speed, family names
+    e = xml.find(xpath)
+    if e is not None:
+        return element_symbol(e)
     return None
 
 
 def number(xml: _Element, xpath: str) -> Optional[int]:
     e = xml.find(xpath)
-    if e is not None and e.text is not None and e.text.isdigit():
-        return int(e.text)
+    if e is not None:
+        return element_number(e)
     return None
 
 
 def timestamp(xml: _Element, xpath: str) -> Optional[datetime]:
     e = xml.find(xpath)
     if e is not None:
-        if e.text is not None and e.text.isdigit():
-            return datetime.fromtimestamp(float(e.text))
-        e_attrib_seconds = e.attrib.get("seconds")
-        if isinstance(e_attrib_seconds, str) and e_attrib_seconds.isdigit():
-            try:
-                return datetime.fromtimestamp(int(e_attrib_seconds))
-            except ValueError:
-                pass
-        e_attrib_format = e.attrib.get("format")
-        if isinstance(e_attrib_format, str):
-            try:
-                return datetime.strptime(e_attrib_format, "%b %d %Y")
-            except ValueError:
-                pass
+        return element_timestamp(e)
     return None
+
+
+@dataclass
+class Field:
+    path: str
+    convert: Callable[[_Element], Any] = element_text
+    many: bool = False
+
+
+Tree = Dict[Any, Any]
+
+
+class Fields:
+    # compiles field paths into a tree of tags once,
+    # then fills all fields in a single walk over children of an element
+    #   - `many=False` fields get converted value of the first matched element (like `xml.find`)
+    #   - `many=True` fields get list of converted values of all matched elements (like `xml.findall`)
+    def __init__(self, **fields: Union[str, Field]) -> None:
+        self.fields = {
+            name: field if isinstance(field, Field) else Field(field)
+            for name, field in fields.items()
+        }
+        self.tree: Tree = {}
+        for name, field in self.fields.items():
+            node = self.tree
+            *path, tag = field.path.split("/")
+            for step in path:
+                node = node.setdefault(step, {}).setdefault("", {})
+            node.setdefault(tag, {}).setdefault(None, []).append((name, field))
+
+    def __call__(self, xml: _Element) -> Dict[str, Any]:
+        values: Dict[str, Any] = {
+            name: [] if field.many else None
+            for name, field in self.fields.items()
+        }
+        found: Dict[str, bool] = {}
+        self.walk(xml, self.tree, values, found)
+        return values
+
+    def walk(self, xml: _Element, tree: Tree, values: Dict[str, Any], found: Dict[str, bool]) -> None:
+        for child in xml:
+            node = tree.get(child.tag)
+            if node is None:
+                continue
+            for name, field in node.get(None, ()):
+                if field.many:
+                    values[name].append(field.convert(child))
+                elif name not in found:
+                    found[name] = True
+                    values[name] = field.convert(child)
+            if "" in node:
+                self.walk(child, node[""], values, found)
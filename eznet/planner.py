@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+import asyncio
+from collections import defaultdict
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple, Union
+from weakref import WeakKeyDictionary
+
+from eznet.data import Data
+
+MAX_SIMULTANEOUS_FETCHES = 4
+
+Target = Union[Data[Any, Any], Tuple[Data[Any, Any], Dict[str, Any]]]
+
+
+class CycleError(Exception):
+    pass
+
+
+# one semaphore per device (or any other object of data) per event loop, dropped with device
+limiters: Dict[asyncio.AbstractEventLoop, WeakKeyDictionary[Any, asyncio.Semaphore]] = defaultdict(WeakKeyDictionary)
+
+
+def limiter(obj: Any, limit: int = MAX_SIMULTANEOUS_FETCHES) -> asyncio.Semaphore:
+    # `limit` is applied when limiter of obj is created
+    semaphores = limiters[asyncio.get_running_loop()]
+    semaphore = semaphores.get(obj)
+    if semaphore is None:
+        semaphore = semaphores[obj] = asyncio.Semaphore(limit)
+    return semaphore
+
+
+class Slot:
+    def __init__(self, semaphore: asyncio.Semaphore) -> None:
+        self.semaphore = semaphore
+        self.held = False
+
+    async def acquire(self) -> None:
+        await self.semaphore.acquire()
+        self.held = True
+
+    def release(self) -> None:
+        if self.held:
+            self.held = False
+            self.semaphore.release()
+
+
+current_slot: ContextVar[Optional[Slot]] = ContextVar("current_slot", default=None)
+
+
+@asynccontextmanager
+async def slot(obj: Any) -> AsyncIterator[None]:
+    # every fetch of the planner and every nested request of a fetcher holds one slot of device limiter
+    current = Slot(limiter(obj))
+    await current.acquire()
+    token = current_slot.set(current)
+    try:
+        yield
+    finally:
+        current_slot.reset(token)
+        current.release()
+
+
+async def gather(obj: Any, *aws: Awaitable[Any], return_exceptions: bool = False) -> List[Any]:
+    # nested requests of a fetcher run under the same device limiter,
+    # slot of the calling fetch is released while it waits for them, so they could not deadlock
+    outer = current_slot.get()
+    if outer is not None and outer.semaphore is not limiter(obj):
+        outer = None
+    if outer is not None:
+        outer.release()
+
+    async def run(aw: Awaitable[Any]) -> Any:
+        async with slot(obj):
+            return await aw
+
+    try:
+        return await asyncio.gather(*(run(aw) for aw in aws), return_exceptions=return_exceptions)
+    finally:
+        if outer is not None:
+            await outer.acquire()
+
+
+def plan(targets: Iterable[Target]) -> List[Tuple[Data[Any, Any], Dict[str, Any]]]:
+    # returns targets with all dependencies, every item goes after its dependencies
+    kwargs: Dict[Data[Any, Any], Dict[str, Any]] = {}
+    for target in targets:
+        if isinstance(target, tuple):
+            data, data_kwargs = target
+            kwargs[data] = data_kwargs
+        else:
+            kwargs[target] = {}
+
+    ordered: List[Tuple[Data[Any, Any], Dict[str, Any]]] = []
+    done: Dict[Data[Any, Any], bool] = {}
+
+    def visit(data: Data[Any, Any]) -> None:
+        if data in done:
+            if not done[data]:
+                raise CycleError(f"dependency cycle on {data}")
+            return
+        done[data] = False
+        for dependency in data.depends:
+            visit(dependency)
+        done[data] = True
+        ordered.append((data, kwargs.get(data, {})))
+
+    for data in kwargs:
+        visit(data)
+    return ordered
+
+
+async def fetch(
+    targets: Iterable[Target],
+    limit: int = MAX_SIMULTANEOUS_FETCHES,
+    max_age: Optional[float] = None,
+    done: Optional[Callable[[Data[Any, Any]], None]] = None,
+) -> Dict[Data[Any, Any], Any]:
+    # independent fetches run concurrently, not more than `limit` at once per device
+    # together with fetches of other planner calls, `done` is called as soon as fetch returns data
+    tasks: Dict[Data[Any, Any], asyncio.Task[Any]] = {}
+
+    async def run(data: Data[Any, Any], kwargs: Dict[str, Any]) -> Any:
+        if data.depends:
+            await asyncio.gather(*(tasks[dependency] for dependency in data.depends))
+        limiter(data.obj, limit)
+        async with slot(data.obj):
+            result = await data.fetch(max_age=max_age, **kwargs)
+        if done is not None and result is not None:
+            done(data)
+        return result
+
+    for data, kwargs in plan(targets):
+        tasks[data] = asyncio.ensure_future(run(data, kwargs))
+
+    try:
+        results = await asyncio.gather(*tasks.values())
+    except BaseException:
+        for task in tasks.values():
+            task.cancel()
+        await asyncio.gather(*tasks.values(), return_exceptions=True)
+        raise
+    return dict(zip(tasks.keys(), results))
@@ -1,9 +1,20 @@
 from __future__ import annotations
 
 from pathlib import Path
-from typing import Union, Iterable, List
+from typing import Iterable, List, Literal, Optional, TextIO, Union
 
 from eznet import Device
+from eznet import planner
+from eznet.journal import Journal
+
+
+def depends(device: Device) -> List[planner.Target]:
+    return [
+        device.info.system.info,
+        device.info.chassis.re,
+        device.info.chassis.fpc,
+        device.info.system.uptime,
+    ]
 
 
 def cli_commands(device: Device) -> Iterable[str]:
@@ -130,48 +141,73 @@ def log_files(device: Device) -> Iterable[str]:
     yield from files
 
 
+def write(io: TextIO, cmd: str, output: Optional[str]) -> None:
+    # output of every command is written at once, so only completed commands are in file
+    print(f"{' ' + cmd + ' ':=^120}", file=io)
+    if output is not None:
+        print(output, file=io)
+    print(f"{' ' + cmd + ' ':^^120}", file=io)
+    print(file=io)
+    io.flush()
+
+
 async def process(
     device: Device,
     job_path: Union[Path, str],
+    journal: Optional[Journal] = None,
 ) -> None:
+    # with journal already done commands are skipped and outputs are appended to files of resumed job
     if isinstance(job_path, str):
         job_path = Path(job_path)
 
-    with open(job_path / f"{device.id}.info", "w") as io:
-        print(await device.info.system.info.fetch(), file=io)
-        print(await device.info.chassis.re.fetch(), file=io)
-        print(await device.info.chassis.fpc.fetch(), file=io)
-        print(await device.info.system.uptime.fetch(), file=io)
-
     if not job_path.exists():
         job_path.mkdir(parents=True)
 
-    with open(job_path / f"{device.id}.cmd", "w") as io:
+    if journal is not None and journal.done(device.id):
+        return
+    mode: Literal["w", "a"] = "w" if journal is None else "a"
+
+    def done(step: str) -> bool:
+        return journal is not None and journal.done(device.id, step)
+
+    failed = False
+
+    def mark(step: str, ok: bool) -> None:
+        # failed step is retried on resume, device is done only when all its steps are
+        nonlocal failed
+        if not ok:
+            failed = True
+        elif journal is not None:
+            journal.mark(device.id, step)
+
+    # cli_commands, host_commands and pfe commands depend on fetched info
+    info = await planner.fetch(depends(device))
+    if any(value is None for value in info.values()):
+        failed = True
+    with open(job_path / f"{device.id}.info", "w") as info_io:
+        for data in info.values():
+            print(data, file=info_io)
+
+    with open(job_path / f"{device.id}.cmd", mode) as cmd_io:
         for cmd in cli_commands(device):
-            print(f"{' ' + cmd + ' ':=^120}", file=io)
-            output = await device.junos.run_cmd(cmd)
-            if output is not None:
-                print(output, file=io)
-            print(f"{' ' + cmd + ' ':^^120}", file=io)
-            print(file=io)
+            if not done(f"cli:{cmd}"):
+                output = await device.junos.run_cmd(cmd)
+                write(cmd_io, cmd, output)
+                mark(f"cli:{cmd}", output is not None)
 
         for cmd in shell_commands(device):
-            print(f"{' ' + cmd + ' ':=^120}", file=io)
-            output = await device.junos.run_shell_cmd(cmd)
-            if output is not None:
-                print(output, file=io)
-            print(f"{' ' + cmd + ' ':^^120}", file=io)
-            print(file=io)
+            if not done(f"shell:{cmd}"):
+                output = await device.junos.run_shell_cmd(cmd)
+                write(cmd_io, cmd, output)
+                mark(f"shell:{cmd}", output is not None)
 
     for fpc_number in device.info.chassis.fpc().keys():
-        with open(job_path / f"{device.id}.fpc{fpc_number}", "w") as io:
+        with open(job_path / f"{device.id}.fpc{fpc_number}", mode) as fpc_io:
             for cmd in pfe_commands(device):
-                print(f"{' ' + cmd + ' ':=^120}", file=io)
-                output = await device.junos.run_pfe_cmd(cmd, fpc=fpc_number)
-                if output is not None:
-                    print(output, file=io)
-                print(f"{' ' + cmd + ' ':^^120}", file=io)
-                print(file=io)
+                if not done(f"fpc{fpc_number}:{cmd}"):
+                    output = await device.junos.run_pfe_cmd(cmd, fpc=fpc_number)
+                    write(fpc_io, cmd, output)
+                    mark(f"fpc{fpc_number}:{cmd}", output is not None)
 
     # for file in log_files(device):
     #     remote_path = Path(file)
@@ -187,7 +223,11 @@ async def process(
     device_job_path = job_path / f"{device.id}"
     if not device_job_path.exists():
         device_job_path.mkdir(parents=True)
-    await device.junos.download("/var/log", device_job_path)
+    if not done("download:/var/log"):
+        mark("download:/var/log", await device.junos.download("/var/log", device_job_path))
+
+    if journal is not None and not failed:
+        journal.mark(device.id)
 
     # with open(job_path / f"{device.id}.rsi", "w") as io:
     #     output = await device.junos.run_cmd("request support information", timeout=600)
@@ -0,0 +1,176 @@
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import logging
+import random
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set
+
+from eznet import Device
+from eznet.data import Data
+from eznet.inventory.device.drivers.base import ConnectError
+
+logger = logging.getLogger(__name__)
+
+# poll interval in seconds per data name
+DEFAULT_INTERVALS: Dict[str, float] = {
+    "system.alarms": 30,
+    "interfaces": 60,
+    "system.uptime": 300,
+    "system.coredumps": 600,
+    "lldp.neighbors": 300,
+    "lldp.local": 3600,
+    "system.info": 3600,
+    "system.sw": 86400,
+}
+# random part of first poll offset and of reschedule of late polls, as a fraction of interval
+DEFAULT_JITTER = 0.1
+MAX_SIMULTANEOUS_POLLS = 256
+RECONNECT_INTERVAL = 60
+
+Kwargs = Callable[[Device, str], Dict[str, Any]]
+
+
+@dataclass(order=True)
+class Job:
+    due: float
+    seq: int
+    device: Device = field(compare=False)
+    data: Data[Any, Any] = field(compare=False)
+    interval: float = field(compare=False)
+    kwargs: Dict[str, Any] = field(compare=False, default_factory=dict)
+
+
+@dataclass
+class Stats:
+    polls: int = 0
+    errors: int = 0
+    connect_errors: int = 0
+    # max delay of poll start after its due time
+    max_lag: float = 0
+
+
+class Scheduler:
+    # heap of next polls of every (device, data), each data is polled on its own interval,
+    # first polls of every data name are spread evenly over its interval
+    def __init__(
+        self,
+        intervals: Optional[Dict[str, float]] = None,
+        kwargs: Optional[Kwargs] = None,
+        limit: int = MAX_SIMULTANEOUS_POLLS,
+        jitter: float = DEFAULT_JITTER,
+    ) -> None:
+        self.intervals = DEFAULT_INTERVALS if intervals is None else intervals
+        self.kwargs = kwargs
+        self.limit = limit
+        self.jitter = jitter
+        self.heap: List[Job] = []
+        self.seq = itertools.count()
+        self.devices: Dict[str, Device] = {}
+        self.stats = Stats()
+        self.tasks: Set[asyncio.Task[None]] = set()
+        self.wakeup: Optional[asyncio.Event] = None
+        self.semaphore: Optional[asyncio.Semaphore] = None
+
+    def now(self) -> float:
+        return asyncio.get_running_loop().time()
+
+    def push(self, job: Job) -> None:
+        heapq.heappush(self.heap, job)
+        if self.wakeup is not None and self.heap[0] is job:
+            self.wakeup.set()
+
+    def scheduled(self, device: Device) -> bool:
+        return self.devices.get(device.id) is device
+
+    def add(self, devices: Iterable[Device]) -> None:
+        # out of `run` due times are relative to its start,
+        # new object of already scheduled device replaces the old one, jobs of old one are dropped when due
+        now = 0 if self.wakeup is None else self.now()
+        devices = [device for device in devices if not self.scheduled(device)]
+        for i, device in enumerate(devices):
+            self.devices[device.id] = device
+            for name, interval in self.intervals.items():
+                offset = interval * (i / len(devices) + random.uniform(0, self.jitter))
+                self.push(Job(
+                    due=now + offset,
+                    seq=next(self.seq),
+                    device=device,
+                    data=device.info.data(name),
+                    interval=interval,
+                    kwargs={} if self.kwargs is None else self.kwargs(device, name),
+                ))
+
+    def remove(self, devices: Iterable[Device]) -> None:
+        # jobs of removed devices are dropped when they are due
+        for device in devices:
+            if self.scheduled(device):
+                del self.devices[device.id]
+
+    async def poll(self, job: Job) -> None:
+        assert self.semaphore is not None
+        next_due = job.due + job.interval
+        try:
+            async with self.semaphore:
+                self.stats.max_lag = max(self.stats.max_lag, self.now() - job.due)
+                ssh = job.device.ssh
+                if ssh is not None and ssh.connection is None:
+                    try:
+                        await ssh.connect()
+                    except ConnectError:
+                        self.stats.connect_errors += 1
+                        next_due = self.now() + min(job.interval, RECONNECT_INTERVAL)
+                        return
+                self.stats.polls += 1
+                try:
+                    await job.data.fetch(**job.kwargs)
+                except Exception as err:
+                    self.stats.errors += 1
+                    logger.error(f"{job.device}: poll {job.data.name}: {err.__class__.__name__}: {err}")
+        finally:
+            now = self.now()
+            if next_due < now:
+                # poll took longer than interval: next one is spread again
+                next_due = now + job.interval * random.uniform(0, self.jitter)
+            if self.scheduled(job.device):
+                job.due = next_due
+                job.seq = next(self.seq)
+                self.push(job)
+
+    async def run(self, devices: Optional[Iterable[Device]] = None, duration: Optional[float] = None) -> None:
+        self.wakeup = asyncio.Event()
+        self.semaphore = asyncio.Semaphore(self.limit)
+        start = self.now()
+        for job in self.heap:
+            job.due += start
+        if devices is not None:
+            self.add(devices)
+        try:
+            while duration is None or self.now() - start < duration:
+                delay = (self.heap[0].due if self.heap else start + (duration or 3600)) - self.now()
+                if duration is not None:
+                    delay = min(delay, start + duration - self.now())
+                if delay > 0:
+                    self.wakeup.clear()
+                    try:
+                        await asyncio.wait_for(self.wakeup.wait(), delay)
+                    except asyncio.TimeoutError:
+                        pass
+                    continue
+                job = heapq.heappop(self.heap)
+                if not self.scheduled(job.device):
+                    continue
+                task = asyncio.create_task(self.poll(job))
+                self.tasks.add(task)
+                task.add_done_callback(self.tasks.discard)
+        finally:
+            for task in list(self.tasks):
+                task.cancel()
+            await asyncio.gather(*self.tasks, return_exceptions=True)
+            # due times are kept relative between runs
+            end = self.now()
+            for job in self.heap:
+                job.due -= end
+            self.wakeup = None
@@ -0,0 +1,47 @@
+import asyncio
+import logging
+from typing import Tuple
+
+import click
+
+from eznet import Inventory
+from eznet.discovery import Discovery, DEFAULT_CONCURRENCY, DEFAULT_DEPTH
+from eznet.logger import config_logger
+
+
+@click.command()
+@click.option(
+    "--inventory", "-i", help="seed devices inventory path", required=True, type=click.types.Path(exists=True)
+)
+@click.option(
+    "--device", "-d", "devices_id", help="seed device selector", default=("*",), multiple=True,
+)
+@click.option(
+    "--output", "-o", help="discovered inventory path (.yaml or .json)", required=True, type=click.types.Path(),
+)
+@click.option(
+    "--site", help="site of discovered devices",
+)
+@click.option(
+    "--depth", help="max crawl depth from seed devices", default=DEFAULT_DEPTH, show_default=True,
+)
+@click.option(
+    "--concurrency", help="max devices explored at once", default=DEFAULT_CONCURRENCY, show_default=True,
+)
+def main(
+    inventory: str,
+    devices_id: Tuple[str, ...],
+    output: str,
+    site: str,
+    depth: int,
+    concurrency: int,
+) -> None:
+    config_logger(logging.INFO)
+    seeds = Inventory().load(inventory).select(*devices_id)
+    discovery = Discovery(site=site, max_depth=depth, concurrency=concurrency)
+    asyncio.run(discovery.crawl(seeds))
+    discovery.save(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,14 +1,53 @@
+import sys
+from typing import Optional, Tuple
+
 import click
 
 from eznet import Inventory
+from eznet.inventory.exporters import EXPORTERS, State
 
 
 @click.command()
 @click.option(
     "--inventory", "-i", required=True, type=click.types.Path(exists=True)
 )
-def main(inventory: str) -> None:
-    print(Inventory().load(inventory).export_as_rundeck())
+@click.option(
+    "--device", "-d", "devices_id", help="device selector", default=("*",), multiple=True,
+)
+@click.option(
+    "--format", "-f", "export_format", help="export format",
+    type=click.Choice(list(EXPORTERS)), default="rundeck", show_default=True,
+)
+@click.option(
+    "--output", "-o", help="output file path, stdout by default", type=click.types.Path(),
+)
+@click.option(
+    "--state", help="export state path: only devices changed since last export are exported, "
+                    "removed devices are exported as removal records; jsonl and csv formats only, "
+                    "whole inventory only",
+    type=click.types.Path(),
+)
+def main(
+    inventory: str,
+    devices_id: Tuple[str, ...],
+    export_format: str,
+    output: Optional[str],
+    state: Optional[str],
+) -> None:
+    if state is not None and not EXPORTERS[export_format].INCREMENTAL:
+        raise click.UsageError(f"--state is not supported by {export_format} format, it is a whole document")
+    if state is not None and devices_id != ("*",):
+        # devices out of selection would be exported as removed and added back by the next full export
+        raise click.UsageError("--state could not be used with device selector, it tracks whole inventory")
+    devices = Inventory().load(inventory).select(*devices_id)
+    export_state = None if state is None else State(state)
+    if output is None:
+        EXPORTERS[export_format](sys.stdout).export(devices, export_state)
+    else:
+        with open(output, "w", newline="" if export_format == "csv" else None) as io:
+            EXPORTERS[export_format](io).export(devices, export_state)
+    if export_state is not None:
+        export_state.save()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import logging
+import pickle
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Iterable, List, Optional, Tuple, Type, Union
+from types import TracebackType
+
+import eznet
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS snapshots (
+    device TEXT NOT NULL,
+    data TEXT NOT NULL,
+    ts REAL NOT NULL,
+    value BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS snapshots_idx ON snapshots (device, data, ts);
+"""
+
+
+class Store:
+    def __init__(self, path: Union[str, Path]) -> None:
+        if isinstance(path, str):
+            path = Path(path)
+        self.path = path.expanduser()
+        if not self.path.parent.exists():
+            self.path.parent.mkdir(parents=True)
+        self.db = sqlite3.connect(self.path)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.executescript(SCHEMA)
+
+    def __str__(self) -> str:
+        return f"store {self.path}"
+
+    def __enter__(self) -> Store:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.db.close()
+
+    def save(self, device_id: str, name: str, value: Any, ts: datetime) -> None:
+        try:
+            blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        except (pickle.PicklingError, TypeError, AttributeError) as err:
+            logger.error(f"{self}: save {device_id} {name}: {err.__class__.__name__}: {err}")
+            return
+        with self.db:
+            self.db.execute(
+                "INSERT INTO snapshots (device, data, ts, value) VALUES (?, ?, ?, ?)",
+                (device_id, name, ts.timestamp(), blob),
+            )
+
+    def load(self, device_id: str, name: str, limit: Optional[int] = None) -> List[Tuple[Any, datetime]]:
+        # returns snapshots from the oldest to the latest
+        rows = self.db.execute(
+            "SELECT value, ts FROM snapshots WHERE device = ? AND data = ? ORDER BY ts DESC LIMIT ?",
+            (device_id, name, -1 if limit is None else limit),
+        ).fetchall()
+        snapshots: List[Tuple[Any, datetime]] = []
+        for blob, ts in reversed(rows):
+            try:
+                snapshots.append((pickle.loads(blob), datetime.fromtimestamp(ts)))
+            except Exception as err:
+                logger.error(f"{self}: load {device_id} {name}: {err.__class__.__name__}: {err}")
+        return snapshots
+
+    def purge(self, before: datetime) -> None:
+        with self.db:
+            self.db.execute("DELETE FROM snapshots WHERE ts < ?", (before.timestamp(),))
+
+    def attach(self, devices: Iterable[eznet.Device]) -> None:
+        for device in devices:
+            for data in device.info:
+                data.store = self
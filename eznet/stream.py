@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import dataclasses
+import json
+import sys
+from abc import ABCMeta, abstractmethod
+from datetime import datetime
+from enum import Enum
+from typing import Any, Dict, List, Optional, TextIO
+
+from rich.console import Console
+from rich.table import Table as RichTable
+from rich.text import Text
+
+from eznet import Device
+
+
+def jsonable(value: Any) -> Any:
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return {f.name: jsonable(getattr(value, f.name)) for f in dataclasses.fields(value)}
+    if isinstance(value, dict):
+        return {f"{k}": jsonable(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple, set)):
+        return [jsonable(v) for v in value]
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.name
+    return f"{value}"
+
+
+def error_text(error: Optional[BaseException]) -> Optional[str]:
+    if error is None:
+        return None
+    return f"{error.__class__.__name__}: {error}" if f"{error}" else error.__class__.__name__
+
+
+class Stream(metaclass=ABCMeta):
+    # results of every device are written as soon as device is processed
+    def __init__(self) -> None:
+        self.devices = 0
+        self.errors = 0
+
+    def device(self, device: Device, error: Optional[BaseException], duration: float) -> None:
+        self.devices += 1
+        if error is not None:
+            self.errors += 1
+        self.write(device, error, duration)
+
+    @abstractmethod
+    def write(self, device: Device, error: Optional[BaseException], duration: float) -> None:
+        ...
+
+    def summary(self, duration: float) -> None:
+        pass
+
+
+class JsonLines(Stream):
+    def __init__(self, io: TextIO = sys.stdout) -> None:
+        super().__init__()
+        self.io = io
+
+    def emit(self, record: Dict[str, Any]) -> None:
+        self.io.write(json.dumps(record) + "\n")
+        self.io.flush()
+
+    def write(self, device: Device, error: Optional[BaseException], duration: float) -> None:
+        self.emit({
+            "device": device.id,
+            "status": "ok" if error is None else "error",
+            "error": error_text(error),
+            "duration": round(duration, 3),
+            "data": {data.name: jsonable(data.v) for data in device.info if data.v is not None},
+        })
+
+    def summary(self, duration: float) -> None:
+        self.emit({"summary": {
+            "devices": self.devices,
+            "errors": self.errors,
+            "duration": round(duration, 3),
+        }})
+
+
+class Rows(Stream):
+    # rows of one table printed one by one: every row is a table with the same column widths
+    FIELDS: List[str] = ["device", "status", "duration", "hostname", "model", "version", "alarms", "error"]
+    WIDTHS: Dict[str, int] = {"status": 6, "duration": 8, "alarms": 6}
+
+    def __init__(self, console: Console) -> None:
+        super().__init__()
+        self.console = console
+        self.header = False
+
+    def table(self, show_header: bool) -> RichTable:
+        table = RichTable(expand=True, show_header=show_header, show_edge=False, box=None)
+        for field in self.FIELDS:
+            table.add_column(field, width=self.WIDTHS.get(field), ratio=None if field in self.WIDTHS else 1)
+        return table
+
+    def write(self, device: Device, error: Optional[BaseException], duration: float) -> None:
+        info = device.info.system.info.v
+        alarms = device.info.system.alarms.v
+        table = self.table(show_header=not self.header)
+        self.header = True
+        table.add_row(
+            device.id,
+            Text("ok", style="green") if error is None else Text("error", style="bold red reverse"),
+            f"{duration:.1f}s",
+            "" if info is None else info.hostname or "",
+            "" if info is None else info.hw_model or "",
+            "" if info is None else info.sw_version or "",
+            "" if alarms is None else f"{len(alarms)}",
+            error_text(error) or "",
+        )
+        self.console.print(table)
+
+    def summary(self, duration: float) -> None:
+        self.console.print(f"{self.devices} devices processed in {duration:.1f}s, {self.errors} with errors")
@@ -1,9 +1,11 @@
 from __future__ import annotations
 
-from typing import Iterable, Tuple, Dict, Any
+from typing import Iterable, Tuple, Dict, Any, Optional
 
-from eznet.verify import Table, calc
+from eznet.verify import Table, calc, NoData
 from eznet import Inventory, Device
+from eznet.topology import Topology, Link
+from eznet.inventory.device.vars.interfaces import Peer
 
 __all__ = ["Interfaces", "Members"]
 
@@ -27,16 +29,43 @@ class Members(Table):
         "vars_peer_interface",
     ]
 
-    def __init__(self, inventory: Inventory, device: Device, interface_name: str) -> None:
+    def __init__(
+        self,
+        inventory: Inventory,
+        device: Device,
+        interface_name: str,
+        topology: Optional[Topology] = None,
+    ) -> None:
         def main() -> Iterable[Dict[str, Any]]:
+            nonlocal topology
+            if topology is None:
+                topology = Topology.build(inventory.devices)
             for member_name, member in device.vars.interfaces[interface_name].members.items():
+                link = topology.peer(device.id, member_name)
+
+                def info_link() -> Link:
+                    if link is None:
+                        raise NoData()
+                    return link
+
+                def vars_peer() -> Peer:
+                    if member.peer is None:
+                        raise NoData()
+                    return member.peer
+
                 yield dict(
                     member=member_name,
                     state=calc(lambda: interface_state(device, member_name), "up"),
-                    vars_peer_device=calc(lambda: member.peer.device),
-                    # info_peer_device=calc(ref=lambda: member.peer.device),
-                    vars_peer_interface=calc(lambda: member.peer.interface),
-                    # info_peer_interface=calc(ref=lambda: member.peer.interface),
+                    vars_peer_device=calc(lambda: vars_peer().device),
+                    info_peer_device=calc(
+                        lambda: info_link().peer_device or info_link().neighbor.system_name,
+                        lambda: topology.device_id(vars_peer().device, device.site),
+                    ),
+                    vars_peer_interface=calc(lambda: vars_peer().interface),
+                    info_peer_interface=calc(
+                        lambda: info_link().peer_interface,
+                        lambda: vars_peer().interface,
+                    ),
                 )
         super().__init__(main)
 
@@ -48,13 +77,16 @@ class Interfaces(Table):
     ]
     TABLE = Members
 
-    def __init__(self, inventory: Inventory, device: Device):
+    def __init__(self, inventory: Inventory, device: Device, topology: Optional[Topology] = None):
         def main() -> Iterable[Tuple[Dict[str, Any], Members]]:
+            nonlocal topology
+            if topology is None:
+                topology = Topology.build(inventory.devices)
             for interface_name, interface in device.vars.interfaces.items():
                 yield dict(
                     interface=interface_name,
                     state=calc(lambda: interface_state(device, interface_name), "up"),
-                ), Members(inventory, device, interface_name)
+                ), Members(inventory, device, interface_name, topology=topology)
         super().__init__(main)
 
 
@@ -5,6 +5,7 @@ from typing import Iterable, Tuple, Callable, Dict, Any
 from eznet.verify import Table, calc
 from eznet import Inventory, Device
 from eznet import tables
+from eznet.topology import Topology
 
 __all__ = ["DevStatus", "DevInterfaces"]
 
@@ -81,11 +82,12 @@ class DevInterfaces(Table):
         device_filter: Callable[[Device], bool] = lambda _: True,
     ) -> None:
         def main() -> Iterable[Tuple[Dict[str, Any], Table]]:
+            topology = Topology.build(inventory.devices)
             for device in inventory.devices:
                 if device_filter(device):
                     yield dict(
                         device=device.id,
-                    ), tables.device.Interfaces(inventory, device)
+                    ), tables.device.Interfaces(inventory, device, topology=topology)
         super().__init__(main)
 
 
@@ -0,0 +1,172 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from dataclasses import dataclass
+from enum import Enum, auto
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from eznet import Device
+from eznet import planner
+from eznet.inventory.device.info.lldp import Neighbor
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Link:
+    device: str
+    interface: str
+    peer_device: Optional[str]
+    peer_interface: Optional[str]
+    neighbor: Neighbor
+
+
+class Status(Enum):
+    PASS = auto()
+    NO_LLDP = auto()
+    UNKNOWN_PEER = auto()
+    WRONG_DEVICE = auto()
+    WRONG_INTERFACE = auto()
+
+    def __repr__(self) -> str:
+        return self.name
+
+    def __str__(self) -> str:
+        return self.name
+
+
+@dataclass
+class Cabling:
+    device: str
+    interface: str
+    expected_device: Optional[str]
+    expected_interface: Optional[str]
+    link: Optional[Link]
+    status: Status
+
+
+async def fetch(devices: Iterable[Device], max_age: Optional[float] = None) -> None:
+    # devices should be already connected
+    async def fetch_device(device: Device) -> None:
+        await planner.fetch([
+            device.info.lldp.neighbors,
+            device.info.lldp.local,
+            device.info.system.info,
+        ], max_age=max_age)
+
+    devices = list(devices)
+    for device, result in zip(devices, await asyncio.gather(
+        *(fetch_device(device) for device in devices), return_exceptions=True,
+    )):
+        if isinstance(result, BaseException):
+            logger.error(f"{device}: topology: {result.__class__.__name__}: {result}")
+
+
+class Topology:
+    def __init__(self) -> None:
+        self.devices: Dict[str, Device] = {}
+        self.by_chassis_id: Dict[str, str] = {}
+        # the same name could be used by devices of different sites
+        self.by_name: Dict[str, Set[str]] = {}
+        self.links: Dict[Tuple[str, str], Link] = {}
+
+    @staticmethod
+    def names(device: Device) -> List[str]:
+        names = [device.id, device.name]
+        if not device.loaded("info"):
+            return [name.lower() for name in names]
+        if device.info.system.info and (hostname := device.info.system.info().hostname) is not None:
+            names.append(hostname)
+        if device.info.lldp.local and (system_name := device.info.lldp.local().system_name) is not None:
+            names.append(system_name)
+        return [name.lower() for name in names]
+
+    @classmethod
+    def build(cls, devices: Iterable[Device]) -> Topology:
+        topology = cls()
+        devices = list(devices)
+        for device in devices:
+            topology.devices[device.id] = device
+            for name in cls.names(device):
+                topology.by_name.setdefault(name, set()).add(device.id)
+                # short hostname if it is fqdn
+                topology.by_name.setdefault(name.split(".")[0], set()).add(device.id)
+            if (
+                device.loaded("info") and device.info.lldp.local
+                and (chassis_id := device.info.lldp.local().chassis_id) is not None
+            ):
+                topology.by_chassis_id[chassis_id.lower()] = device.id
+
+        for device in devices:
+            if not device.loaded("info") or not device.info.lldp.neighbors:
+                continue
+            for interface, neighbor in device.info.lldp.neighbors().items():
+                topology.links[device.id, interface] = Link(
+                    device=device.id,
+                    interface=interface,
+                    peer_device=topology.resolve(neighbor, site=device.site),
+                    peer_interface=neighbor.port,
+                    neighbor=neighbor,
+                )
+        return topology
+
+    def lookup(self, name: str, site: Optional[str] = None) -> Optional[str]:
+        # name used by devices of different sites is resolved to the device of the same site only
+        name = name.lower()
+        device_ids = self.by_name.get(name) or self.by_name.get(name.split(".")[0]) or set()
+        if len(device_ids) > 1:
+            device_ids = {device_id for device_id in device_ids if self.devices[device_id].site == site}
+            if len(device_ids) != 1:
+                logger.warning(f"topology: ambiguous name `{name}`{'' if site is None else f' from site {site}'}")
+                return None
+        return next(iter(device_ids), None)
+
+    def resolve(self, neighbor: Neighbor, site: Optional[str] = None) -> Optional[str]:
+        if neighbor.chassis_id is not None and (device_id := self.by_chassis_id.get(neighbor.chassis_id.lower())):
+            return device_id
+        if neighbor.system_name is not None:
+            return self.lookup(neighbor.system_name, site)
+        return None
+
+    def peer(self, device_id: str, interface: str) -> Optional[Link]:
+        return self.links.get((device_id, interface))
+
+    def device_id(self, name: Optional[str], site: Optional[str] = None) -> Optional[str]:
+        if name is None:
+            return None
+        return self.lookup(name, site)
+
+    def audit(self, devices: Optional[Iterable[Device]] = None) -> List[Cabling]:
+        # every `vars` member peer is joined with lldp links by (device, interface),
+        # devices with invalid vars have no expected cabling
+        cabling: List[Cabling] = []
+        for device in (self.devices.values() if devices is None else devices):
+            if (error := device.validate()) is not None:
+                logger.warning(f"topology: {device.id}: vars validation error, not audited: {error.messages}")
+                continue
+            for interface in device.vars.interfaces.values():
+                for member_name, member in interface.members.items():
+                    peer = member.peer or interface.peer
+                    if peer is None:
+                        continue
+                    link = self.links.get((device.id, member_name))
+                    if link is None:
+                        status = Status.NO_LLDP
+                    elif link.peer_device is None:
+                        status = Status.UNKNOWN_PEER
+                    elif peer.device is not None and link.peer_device != self.device_id(peer.device, device.site):
+                        status = Status.WRONG_DEVICE
+                    elif peer.interface is not None and link.peer_interface != peer.interface:
+                        status = Status.WRONG_INTERFACE
+                    else:
+                        status = Status.PASS
+                    cabling.append(Cabling(
+                        device=device.id,
+                        interface=member_name,
+                        expected_device=peer.device,
+                        expected_interface=peer.interface,
+                        link=link,
+                        status=status,
+                    ))
+        return cabling
@@ -20,7 +20,11 @@ setup(
         "console_scripts": [
             "eznet=eznet.__main__:run",
             "eznet_to_rundeck=eznet.scripts.export:main",
+            "eznet_discover=eznet.scripts.discover:main",
         ]
     },
     install_requires=install_requires,
+    extras_require={
+        "jsonnet": ["jsonnet"],
+    },
 )
@@ -0,0 +1,50 @@
+from types import SimpleNamespace
+
+import pytest
+from lxml import etree
+
+from eznet.inventory.device.info.chassis import FPC
+
+SHOW_CHASSIS_FPC = """<rpc-reply><fpc-information>
+    <fpc><slot>0</slot><state>Online</state>
+        <pic><pic-slot>0</pic-slot><pic-state>Online</pic-state><pic-type>48x10G</pic-type></pic>
+        <pic><pic-slot>1</pic-slot><pic-state>Online</pic-state><pic-type>4x100G</pic-type></pic>
+    </fpc>
+</fpc-information></rpc-reply>"""
+
+SHOW_CHASSIS_PIC = """<rpc-reply><fpc-information><fpc><pic-detail><port-information>
+    <port><port-number>0</port-number><cable-type>100GBASE LR4</cable-type></port>
+</port-information></pic-detail></fpc></fpc-information></rpc-reply>"""
+
+
+class Device(SimpleNamespace):
+    # planner keeps limiters of devices in weak dict
+    __hash__ = object.__hash__
+
+
+class Junos:
+    def __init__(self):
+        self.cmds = []
+
+    async def run_xml_cmd(self, cmd, timeout=None, cache=False):
+        self.cmds.append(cmd)
+        if cmd == "show chassis fpc pic-status":
+            return etree.fromstring(SHOW_CHASSIS_FPC)
+        return etree.fromstring(SHOW_CHASSIS_PIC)
+
+
+@pytest.mark.asyncio
+async def test_fpc_fetch_ports():
+    device = Device(
+        junos=Junos(),
+        info=SimpleNamespace(chassis=SimpleNamespace(fpc=SimpleNamespace(v=None))),
+    )
+    fpc = await FPC.fetch(device, get_ports=True)
+    assert len(device.junos.cmds) == 3
+    assert fpc[0].pics[1].ports[0].cable_type == "100GBASE LR4"
+
+    device.info.chassis.fpc.v = fpc
+    device.junos.cmds = []
+    fpc = await FPC.fetch(device, get_ports=True)
+    assert device.junos.cmds == ["show chassis fpc pic-status"]
+    assert fpc[0].pics[0].ports[0].cable_type == "100GBASE LR4"
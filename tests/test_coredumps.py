@@ -0,0 +1,152 @@
+import asyncio
+import logging
+from collections import defaultdict
+from datetime import datetime
+from time import time
+
+import pytest
+
+from eznet import Device
+from eznet.coredumps import Pipeline, StartRate, Tracker
+from eznet.inventory.device.drivers.junos import Junos as JunosDriver
+from eznet.inventory.device.info.system import CoreDump
+
+
+def test_tracker(tmp_path):
+    device = Device(name="r1")
+    core0 = CoreDump("/var/crash/core.rpd.0.gz", 1000, datetime(2024, 1, 1), "re0")
+    core1 = CoreDump("/var/crash/core.rpd.1.gz", 2000, datetime(2024, 1, 2), "re1")
+
+    tracker = Tracker(tmp_path / "cores.json")
+    assert tracker.new(device, [core0]) == [core0]
+    assert tracker.new(device, [core0, core1], mark=False) == [core1]
+    assert tracker.new(device, [core0, core1]) == [core1]
+    assert tracker.new(device, [core0, core1]) == []
+    tracker.checksums["0" * 64] = "r1/re0/core.rpd.0.gz"
+    tracker.save()
+
+    tracker = Tracker(tmp_path / "cores.json")
+    assert tracker.new(device, [core0, core1]) == []
+    assert tracker.checksums == {"0" * 64: "r1/re0/core.rpd.0.gz"}
+
+
+class Junos:
+    def __init__(self, checksums, fail=()):
+        self.checksums = checksums
+        self.fail = fail
+        self.downloads = []
+        self.running = defaultdict(int)
+        self.max_running = defaultdict(int)
+
+    async def run_cmd(self, cmd):
+        path = cmd.split()[-1].split(":")[-1]
+        return f"SHA256 ({path}) = {self.checksums[path]}"
+
+    async def download(self, remote_path, local_path, re="", host=False):
+        for key in [(re, host), "all"]:
+            self.running[key] += 1
+            self.max_running[key] = max(self.max_running[key], self.running[key])
+        await asyncio.sleep(0.01)
+        for key in [(re, host), "all"]:
+            self.running[key] -= 1
+        self.downloads.append((re, host, remote_path))
+        return remote_path not in self.fail
+
+
+def device_with_cores(cores, checksums, fail=()):
+    device = Device(name="r1")
+    device.junos = Junos(checksums, fail)
+
+    async def fetch(device, both_re=True):
+        return cores
+
+    device.info.system.coredumps.fetcher = fetch
+    return device
+
+
+@pytest.mark.asyncio
+async def test_pipeline_dedupe(tmp_path):
+    # the same core on both REs is downloaded once
+    cores = [
+        CoreDump("/var/crash/core.rpd.0.gz", 1000, datetime(2024, 1, 1), "re0"),
+        CoreDump("/var/crash/core.rpd.0.gz", 1000, datetime(2024, 1, 1), "re1"),
+    ]
+    device = device_with_cores(cores, {"/var/crash/core.rpd.0.gz": "a" * 64})
+    pipeline = Pipeline(Tracker(), tmp_path)
+    assert await pipeline.process(device) == cores
+    assert len(device.junos.downloads) == 1
+    assert list(pipeline.tracker.checksums) == ["a" * 64]
+
+    # already seen cores are not processed again
+    assert await pipeline.process(device) == []
+    assert len(device.junos.downloads) == 1
+
+
+@pytest.mark.asyncio
+async def test_pipeline_failed(tmp_path):
+    # failed download is retried next time, its checksum is not recorded
+    core = CoreDump("/var/crash/core.rpd.0.gz", 1000, datetime(2024, 1, 1), "re0")
+    device = device_with_cores([core], {"/var/crash/core.rpd.0.gz": "a" * 64}, fail=[core.name])
+    pipeline = Pipeline(Tracker(), tmp_path)
+    assert await pipeline.process(device) == []
+    assert pipeline.tracker.checksums == {}
+    device.junos.fail = ()
+    assert await pipeline.process(device) == [core]
+    assert len(device.junos.downloads) == 2
+
+
+@pytest.mark.asyncio
+async def test_pipeline_queues(tmp_path):
+    # downloads run one by one per RE and host, concurrently between them
+    cores = [
+        CoreDump(f"/var/crash/core.{re}.{host}.{i}.gz", 1000, datetime(2024, 1, 1), re, host)
+        for re in ["re0", "re1"] for host in [False, True] for i in range(2)
+    ]
+    device = device_with_cores(cores, {
+        f"{'/var' if not core.host else '/hostvar'}{core.name[len('/var'):]}": f"{n:064x}"
+        for n, core in enumerate(cores)
+    })
+    assert len(await Pipeline(Tracker(), tmp_path).process(device)) == 8
+    assert len(device.junos.downloads) == 8
+    assert all(device.junos.max_running[re, host] == 1 for re in ["re0", "re1"] for host in [False, True])
+    assert device.junos.max_running["all"] == 4
+
+
+@pytest.mark.asyncio
+async def test_start_rate():
+    start_rate = StartRate(rate=100_000)
+    t0 = time()
+    await start_rate.acquire(100_000)
+    assert time() - t0 < 0.05
+    # bucket is empty: 10 KB more takes 0.1s
+    await start_rate.acquire(10_000)
+    assert time() - t0 >= 0.09
+
+
+class SSH:
+    def __init__(self, errors=(), files=()):
+        self.connection = object()
+        self.logger = logging.getLogger("eznet.device.r1")
+        self.errors = errors
+        self.files = files
+        self.cmds = []
+
+    async def execute(self, cmd, timeout=None):
+        self.cmds.append(cmd)
+        if any(cmd.startswith(error) for error in self.errors):
+            return f"{cmd}\nerror: could not copy", ""
+        return f"{cmd}\n", ""
+
+    async def download(self, src, dst):
+        return [dst] if src in self.files else []
+
+
+@pytest.mark.asyncio
+async def test_junos_download(tmp_path):
+    ssh = SSH(files=["/var/crash/core.0.gz"])
+    assert await JunosDriver(ssh).download("/var/crash/core.0.gz", tmp_path)
+    assert not await JunosDriver(ssh).download("/var/crash/core.1.gz", tmp_path)
+    # failed copy from other RE
+    ssh = SSH(errors=["file copy re1:"])
+    assert not await JunosDriver(ssh).download("/var/crash/core.0.gz", tmp_path, re="re1")
+    assert not any(cmd.startswith("file delete") for cmd in ssh.cmds)
@@ -0,0 +1,98 @@
+import numpy as np
+import pytest
+from lxml import etree
+
+from eznet import Device
+from eznet.counters import Poller, Series, parse, speed_bps, COUNTER_INDEX
+from eznet.inventory.device.drivers.base import ConnectError
+
+
+def show_interfaces(input_bytes: int, output_bytes: int) -> etree._Element:
+    return etree.fromstring(f"""<rpc-reply>
+    <interface-information>
+        <physical-interface>
+            <name>et-0/0/0</name>
+            <speed>100Gbps</speed>
+            <traffic-statistics>
+                <input-bytes>{input_bytes}</input-bytes>
+                <output-bytes>{output_bytes}</output-bytes>
+                <input-packets>10</input-packets>
+                <output-packets>10</output-packets>
+            </traffic-statistics>
+        </physical-interface>
+        <physical-interface>
+            <name>lo0</name>
+        </physical-interface>
+    </interface-information>
+</rpc-reply>""")
+
+
+def test_speed_bps():
+    assert speed_bps("100Gbps") == 100 * 10 ** 9
+    assert speed_bps("1000mbps") == 10 ** 9
+    assert speed_bps("Unspecified") is None
+
+
+def test_series():
+    series = Series(depth=3)
+    for ts, (input_bytes, output_bytes) in enumerate([(0, 0), (1000, 2 ** 64 - 100), (3000, 900), (1000, 1900)]):
+        series.append(ts * 10.0, *parse(show_interfaces(input_bytes, output_bytes)))
+    assert len(series) == 3
+    assert list(series.interfaces) == ["et-0/0/0"]
+    _, rates = series.rates()
+    input_bytes = rates[:, 0, COUNTER_INDEX["input_bytes"]]
+    output_bytes = rates[:, 0, COUNTER_INDEX["output_bytes"]]
+    # counter reset: delta is the counter itself
+    assert list(input_bytes) == [200, 100]
+    # counter wrap
+    assert list(output_bytes) == [100, 100]
+    assert series.rate("et-0/0/0", "input_bytes") == 100
+    _, utilization = series.utilization()
+    assert np.isclose(utilization[-1, 0, 0], 800 / 10 ** 11)
+
+
+class SSH:
+    def __init__(self, fail: bool = False) -> None:
+        self.fail = fail
+        self.connection = None
+        self.connects = 0
+
+    async def connect(self):
+        self.connects += 1
+        if self.fail:
+            raise ConnectError()
+        self.connection = object()
+
+    def disconnect(self):
+        self.connection = None
+
+
+class Junos:
+    def __init__(self, ssh: SSH) -> None:
+        self.ssh = ssh
+        self.input_bytes = 0
+
+    async def run_xml_cmd(self, cmd):
+        if self.ssh.connection is None:
+            raise AssertionError("Not connected")
+        self.input_bytes += 1000
+        return show_interfaces(self.input_bytes, 0)
+
+
+@pytest.mark.asyncio
+async def test_poller():
+    devices = [Device(name="r1"), Device(name="r2")]
+    for device, fail in zip(devices, [False, True]):
+        device.ssh = SSH(fail)
+        device.junos = Junos(device.ssh)
+
+    poller = Poller(devices, interval=0)
+    await poller.run(count=3)
+    r1, r2 = devices
+    # connection is kept between polls and closed at the end
+    assert r1.ssh.connects == 1
+    assert r1.ssh.connection is None
+    assert len(poller.series[r1.id]) == 3
+    assert poller.series[r1.id].rate("et-0/0/0", "input_bytes") > 0
+    assert r2.ssh.connects == 3
+    assert len(poller.series[r2.id]) == 0
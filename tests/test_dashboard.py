@@ -0,0 +1,64 @@
+import asyncio
+
+import pytest
+from rich.console import Console
+
+from eznet import Device
+from eznet.dashboard import Dashboard
+from eznet.inventory.device.drivers.ssh import SSH, CmdRequest, FileRequest, Registry, request_registry
+
+
+@pytest.mark.asyncio
+async def test_slot():
+    ssh = SSH("10.0.0.1", user_name="user", device_id="r1")
+    registry = request_registry[asyncio.get_running_loop()]
+    semaphore = asyncio.Semaphore(1)
+    first, second = CmdRequest("show version"), CmdRequest("show chassis hardware")
+    entered = asyncio.Event()
+    release = asyncio.Event()
+
+    async def run(request: CmdRequest) -> None:
+        async with ssh.slot(semaphore, request):
+            request.stdout_bytes += b"output"
+            entered.set()
+            await release.wait()
+
+    tasks = [asyncio.create_task(run(first)), asyncio.create_task(run(second))]
+    await entered.wait()
+    assert set(registry.requests) == {first, second} == ssh.requests
+    assert first.started is not None and second.started is None
+
+    release.set()
+    await asyncio.gather(*tasks)
+    assert len(registry) == 0 and not ssh.requests
+    assert registry.commands == 2
+    assert registry.received == 12
+
+
+def test_snapshot():
+    ssh = SSH("10.0.0.1", user_name="user", device_id="r1")
+    registry = Registry()
+    cmd = CmdRequest("show version")
+    cmd.start()
+    cmd.queued -= 30
+    transfer = FileRequest("/var/log/messages", received_bytes=512, total_bytes=1024)
+    transfer.start()
+    queued = FileRequest("/var/log/chassisd")
+    for request in [cmd, transfer, queued]:
+        registry.add(ssh, request)
+
+    dashboard = Dashboard([Device(name="r1")], Console(width=120))
+    snapshot = dashboard.snapshot(registry)
+    assert snapshot.cmd_running == 1 and snapshot.cmd_queued == 0
+    assert snapshot.transfer_running == 1 and snapshot.transfer_queued == 1
+    assert snapshot.received == 512
+    assert [row[:2] for row in snapshot.slowest] == [("r1", "show version")]
+    assert snapshot.transfers == [("r1", "/var/log/messages", 512, 1024, 0)]
+
+    registry.remove(cmd)
+    assert registry.commands == 1
+    console = Console(width=120, record=True)
+    console.print(dashboard.render(dashboard.snapshot(registry), (0, 0)))
+    text = console.export_text()
+    assert "1 done" in text
+    assert "/var/log/messages" in text
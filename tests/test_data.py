@@ -0,0 +1,129 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+
+from eznet.data import Data, DataError, History
+from eznet.changes import Collector, Kind
+
+
+class Obj:
+    def __init__(self) -> None:
+        self.calls = 0
+
+    async def fetch(self, value: int = 1, delay: float = 0):
+        self.calls += 1
+        await asyncio.sleep(delay)
+        return value
+
+
+@pytest.mark.asyncio
+async def test_fetch():
+    obj = Obj()
+    data = Data(obj, Obj.fetch)
+    assert not data
+    with pytest.raises(DataError):
+        data()
+    assert await data.fetch(1) == 1
+    assert await data.fetch(2) == 2
+    assert data() == 2
+    assert data(1) == 1
+    assert data.stats.fetches == 2
+
+
+@pytest.mark.asyncio
+async def test_fetch_max_age():
+    obj = Obj()
+    data = Data(obj, Obj.fetch)
+    await data.fetch(1)
+    assert await data.fetch(1, max_age=60) == 1
+    assert obj.calls == 1
+    assert data.stats.hits == 1
+    # value fetched with other arguments is not reused
+    assert await data.fetch(2, max_age=60) == 2
+    assert obj.calls == 2
+    assert await data.fetch(1, max_age=60) == 1
+    assert await data.fetch(2, max_age=60) == 2
+    assert obj.calls == 2
+    assert data.stats.hits == 3
+    assert await data.fetch(2, max_age=0) == 2
+    assert obj.calls == 3
+
+
+@pytest.mark.asyncio
+async def test_fetch_single_flight():
+    obj = Obj()
+    data = Data(obj, Obj.fetch)
+    results = await asyncio.gather(*(data.fetch(1, delay=0.01) for _ in range(5)))
+    assert results == [1] * 5
+    assert obj.calls == 1
+    assert data.stats.merged == 4
+    assert len(data.data) == 1
+    assert not data.pending
+
+
+def test_history():
+    history = History(depth=3)
+    t0 = datetime(2024, 1, 1)
+    for i in range(5):
+        history.append(i, t0 + timedelta(minutes=i))
+    assert len(history) == 3
+    assert [v for v, _ in history] == [4, 3, 2]
+    assert history[0][0] == 4
+    assert history[-1][0] == 2
+    with pytest.raises(IndexError):
+        history[3]
+    assert history.as_of(t0 + timedelta(minutes=3, seconds=30))[0] == 3
+    assert history.as_of(t0 + timedelta(minutes=10))[0] == 4
+    assert history.as_of(t0) is None
+
+
+def test_history_max_age():
+    history = History(depth=10, max_age=90)
+    t0 = datetime(2024, 1, 1)
+    for i in range(5):
+        history.append(i, t0 + timedelta(minutes=i))
+    assert [v for v, _ in history] == [4, 3]
+
+
+@pytest.mark.asyncio
+async def test_fetch_changes():
+    obj = Obj()
+    data = Data(obj, Obj.fetch, "value")
+    collector = Collector(["val*"])
+    try:
+        await data.fetch({"ge-0/0/0": "up", "ge-0/0/1": "up"})
+        assert [change.kind for change in collector.changes] == [Kind.ADDED]
+        collector.reset()
+        await data.fetch({"ge-0/0/0": "down", "ge-0/0/1": "up", "ge-0/0/2": "up"})
+        assert [(change.path, change.kind) for change in collector.changes] == [
+            (("ge-0/0/0",), Kind.CHANGED),
+            (("ge-0/0/2",), Kind.ADDED),
+        ]
+        assert collector.devices == {f"{obj}"}
+    finally:
+        collector.close()
+
+
+@pytest.mark.asyncio
+async def test_fetch_changes_key():
+    interfaces = {"ge-0/0/0": "up", "ge-0/0/1": "up"}
+
+    async def fetch(obj, names=None):
+        return {name: state for name, state in interfaces.items() if names is None or name in names}
+
+    obj = Obj()
+    data = Data(obj, fetch, "value")
+    collector = Collector(["val*"])
+    try:
+        await data.fetch()
+        collector.reset()
+        # first filtered fetch is new value, not removal of filtered out interfaces
+        await data.fetch(names=("ge-0/0/0",))
+        assert [(change.path, change.kind) for change in collector.changes] == [((), Kind.ADDED)]
+        collector.reset()
+        interfaces["ge-0/0/1"] = "down"
+        await data.fetch()
+        assert [(change.path, change.kind) for change in collector.changes] == [(("ge-0/0/1",), Kind.CHANGED)]
+    finally:
+        collector.close()
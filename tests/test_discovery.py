@@ -0,0 +1,37 @@
+import pytest
+from eznet import Device, Inventory
+from eznet.discovery import Discovery, Found
+
+NETWORK = {
+    "10.0.0.1": ("r1", [("r2", "10.0.0.2", "02"), ("r3", "10.0.0.3", "03")]),
+    "10.0.0.2": ("r2", [("r1", "10.0.0.1", "01"), ("r3", "10.0.0.3", "03"), ("r4", "10.0.0.4", "04")]),
+    "10.0.0.3": ("r3", [("r1", "10.0.0.1", "01"), ("r2", "10.0.0.2", "02")]),
+    "10.0.0.4": ("r4", [("r2", "10.0.0.2", "02")]),
+}
+
+
+class FakeDiscovery(Discovery):
+    explored = 0
+
+    async def explore(self, device, found: Found):
+        self.explored += 1
+        return NETWORK[device.ssh.ip][1]
+
+
+@pytest.mark.asyncio
+async def test_discovery(tmp_path, monkeypatch):
+    monkeypatch.setenv("USER", "user")
+    discovery = FakeDiscovery(user_name="user", max_depth=1)
+    await discovery.crawl([Device(name="r1", ip="10.0.0.1", user_name="user")])
+    assert sorted(discovery.found) == ["r1", "r2", "r3"]
+    assert discovery.explored == 3
+
+    discovery = FakeDiscovery(user_name="user")
+    await discovery.crawl([Device(name="r1", ip="10.0.0.1", user_name="user")])
+    assert {found.name: found.depth for found in discovery.found.values()} == {"r1": 0, "r2": 1, "r3": 1, "r4": 2}
+    assert discovery.explored == 4
+
+    path = tmp_path / "discovered.yaml"
+    discovery.save(path)
+    inventory = Inventory().load(path)
+    assert [device.ssh.ip for device in inventory.devices] == ["10.0.0.1", "10.0.0.2", "10.0.0.3", "10.0.0.4"]
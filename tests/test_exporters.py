@@ -0,0 +1,81 @@
+import json
+from io import StringIO
+
+import pytest
+import yaml
+from click.testing import CliRunner
+
+from eznet import Inventory
+from eznet.inventory.exporters import Ansible, Csv, JsonLines, State
+from eznet.scripts.export import main
+
+
+def inventory():
+    inventory = Inventory()
+    inventory.imp0rt({"devices": [
+        {"name": "r2", "ip": ["10.0.0.2"], "model": "mx480"},
+        {"name": "r1", "ip": "10.0.0.1", "tags": ["core"]},
+    ]}, site="lab")
+    inventory.imp0rt({"devices": [{"name": "r3"}]})
+    return inventory
+
+
+def test_rundeck():
+    devices = inventory()
+    assert yaml.safe_load(devices.export_as_rundeck()) == {
+        "lab.r1": {"nodename": "lab.r1", "hostname": "10.0.0.1"},
+        "lab.r2": {"nodename": "lab.r2", "hostname": "10.0.0.2"},
+        "r3": {"nodename": "r3"},
+    }
+    assert Inventory().export_as_rundeck() == yaml.safe_dump({})
+
+
+def test_ansible():
+    io = StringIO()
+    Ansible(io).export(inventory().devices)
+    assert yaml.safe_load(io.getvalue()) == {"all": {"children": {
+        "lab": {"hosts": {
+            "lab.r1": {"ansible_host": "10.0.0.1"},
+            "lab.r2": {"ansible_host": "10.0.0.2", "model": "mx480"},
+        }},
+        "ungrouped": {"hosts": {"r3": {}}},
+    }}}
+
+
+def test_csv():
+    io = StringIO()
+    Csv(io).export(inventory().devices)
+    assert io.getvalue().splitlines()[:2] == [
+        "id,name,site,hostname,model,tags,removed",
+        "lab.r2,r2,lab,10.0.0.2,mx480,,",
+    ]
+
+
+def test_incremental(tmp_path):
+    devices = inventory()
+    state = State(tmp_path / "state.json")
+    assert JsonLines(StringIO()).export(devices.devices, state) == 3
+    state.save()
+
+    devices.remove("r3")
+    devices.device("lab.r1").kwargs["model"] = "mx960"
+    io = StringIO()
+    state = State(tmp_path / "state.json")
+    assert JsonLines(io).export(devices.devices, state) == 1
+    assert [json.loads(line) for line in io.getvalue().splitlines()] == [
+        {"id": "lab.r1", "name": "r1", "site": "lab", "hostname": "10.0.0.1", "model": "mx960", "tags": ["core"]},
+        {"id": "r3", "removed": True},
+    ]
+
+
+def test_incremental_document(tmp_path):
+    with pytest.raises(ValueError):
+        Ansible(StringIO()).export(inventory().devices, State(tmp_path / "state.json"))
+
+
+def test_incremental_selection(tmp_path):
+    (tmp_path / "lab.yaml").write_text("devices: [{name: r1}, {name: r2}]")
+    state = tmp_path / "state.json"
+    result = CliRunner().invoke(main, ["-i", f"{tmp_path}", "-d", "lab.r1", "-f", "jsonl", "--state", f"{state}"])
+    assert result.exit_code == 2
+    assert not state.exists()
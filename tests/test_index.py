@@ -0,0 +1,53 @@
+import asyncio
+
+from eznet import Device
+from eznet.data import Data
+from eznet.index import Index, Entry
+from eznet.inventory.device.info.interfaces import AF, Interface, Traffic, Unit, UnitTraffic
+
+
+def interface(description, units):
+    return Interface(
+        admin="up", oper="up", description=description, speed=None, ae=None,
+        traffic=Traffic(input_bps=0, input_pps=0, output_bps=0, output_pps=0),
+        units={
+            unit_id: Unit(
+                description=unit_description,
+                family={"inet": AF(address=address, network=network)},
+                traffic=UnitTraffic(input_packets=0, output_packets=0),
+            )
+            for unit_id, (unit_description, address, network) in units.items()
+        },
+    )
+
+
+def test_index():
+    r1 = Device(name="r1")
+    r1.info.interfaces.data.append({
+        "xe-0/0/0": interface("uplink-to-core", {0: ("p2p r2", "10.20.30.40", "10.20.30.40/31")}),
+        "xe-0/0/1": interface("Uplink to Edge", {0: (None, "10.20.31.1", "10.20.31.0/24")}),
+    })
+    index = Index.build([r1])
+
+    assert index.address("10.20.30.41") == [Entry("r1", "xe-0/0/0", 0, "inet", "10.20.30.40/31")]
+    assert {entry.prefix for entry in index.address("10.20.30.40/31")} == {"10.20.30.40/31", "10.20.30.40"}
+    assert {entry.prefix for entry in index.address("10.20.0.0/16")} == {
+        "10.20.30.40/31", "10.20.30.40", "10.20.31.0/24", "10.20.31.1",
+    }
+    assert index.address("10.0.0.1") == []
+    assert index.description("uplink-to-core") == [Entry("r1", "xe-0/0/0")]
+    assert index.description("uplink") == [Entry("r1", "xe-0/0/0"), Entry("r1", "xe-0/0/1")]
+    assert index.description("r2") == [Entry("r1", "xe-0/0/0", 0)]
+
+    # incremental update via changes of `interfaces` data
+    async def fetch(device):
+        return {"xe-0/0/1": interface("uplink-to-core", {0: (None, "10.20.31.1", "10.20.31.0/24")})}
+
+    index.attach()
+    try:
+        asyncio.run(Data(r1, fetch, "interfaces").fetch())
+    finally:
+        index.close()
+    assert index.address("10.20.30.41") == []
+    assert index.description("uplink-to-core") == [Entry("r1", "xe-0/0/1")]
+    assert index.description("edge") == []
@@ -0,0 +1,81 @@
+import logging
+from types import SimpleNamespace
+
+import pytest
+from lxml import etree
+
+from eznet.inventory.device.info.interfaces import Interface
+from eznet.inventory.device.drivers.base import RequestError
+
+
+class Device(SimpleNamespace):
+    # planner keeps limiters of devices in weak dict
+    __hash__ = object.__hash__
+
+
+def show_interfaces(*names: str) -> str:
+    return "<rpc-reply><interface-information>" + "".join(
+        f"<physical-interface><name>{name}</name><oper-status>up</oper-status></physical-interface>"
+        for name in names
+    ) + "</interface-information></rpc-reply>"
+
+
+class Junos:
+    def __init__(self, outputs):
+        self.outputs = outputs
+        self.cmds = []
+
+    async def run_xml_cmd(self, cmd, timeout=None):
+        self.cmds.append(cmd)
+        if cmd in self.outputs:
+            return etree.fromstring(self.outputs[cmd])
+        return None
+
+
+@pytest.mark.asyncio
+async def test_fetch_all():
+    junos = Junos({"show interfaces": show_interfaces("ge-0/0/0", "lo0", "ae0")})
+    interfaces = await Interface.fetch(Device(junos=junos))
+    assert list(interfaces) == ["ge-0/0/0", "ae0"]
+
+
+@pytest.mark.asyncio
+async def test_fetch_names():
+    junos = Junos({
+        "show interfaces ge-0/0/0 terse": show_interfaces("ge-0/0/0"),
+        "show interfaces ae0 terse": show_interfaces("ae0"),
+    })
+    interfaces = await Interface.fetch(
+        Device(junos=junos), names=["ae0", "ge-0/0/0", "ge-0/0/9"], fields=["oper"],
+    )
+    assert sorted(junos.cmds) == [
+        "show interfaces ae0 terse", "show interfaces ge-0/0/0 terse", "show interfaces ge-0/0/9 terse",
+    ]
+    assert sorted(interfaces) == ["ae0", "ge-0/0/0"]
+    assert interfaces["ae0"].oper == "up"
+
+
+@pytest.mark.asyncio
+async def test_fetch_shards():
+    class ShardJunos(Junos):
+        logger = logging.getLogger(__name__)
+
+        async def run_xml_cmd(self, cmd, timeout=None):
+            if cmd == "show interfaces xe-1/*":
+                raise RequestError("TimeoutError")
+            return await super().run_xml_cmd(cmd, timeout)
+
+    async def fetch_fpc(max_age=None):
+        return {0: SimpleNamespace(state="Online"), 1: SimpleNamespace(state="Online")}
+
+    junos = ShardJunos({
+        "show interfaces ae*": show_interfaces("ae0", "ae1"),
+        "show interfaces xe-0/*": show_interfaces("xe-0/0/0", "xe-0/0/1"),
+    })
+    device = Device(
+        junos=junos,
+        info=SimpleNamespace(chassis=SimpleNamespace(fpc=SimpleNamespace(fetch=fetch_fpc))),
+    )
+    interfaces = await Interface.fetch(device, shard=True)
+    assert len(junos.cmds) == 6
+    assert sorted(interfaces) == ["ae0", "ae1", "xe-0/0/0", "xe-0/0/1"]
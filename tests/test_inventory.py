@@ -4,3 +4,47 @@ from eznet import Inventory
 def test_load():
     inventory = Inventory()
     inventory.load("inventory/devices/")
+
+
+def test_select():
+    inventory = Inventory()
+    inventory.imp0rt({"devices": [
+        {"name": "r1", "model": "mx480", "tags": ["core"]},
+        {"name": "r2", "model": "mx960", "tags": ["core", "spare"]},
+        {"name": "s1", "model": "qfx5120", "system": {"hostname": "s1.lab"}},
+        {"name": "r1"},
+    ]}, site="lab")
+    inventory.imp0rt({"devices": [{"name": "r1", "model": "mx480"}]}, site="dc")
+
+    assert len(inventory.devices) == 4
+    assert inventory.device("lab.r2").vars.model == "mx960"
+    assert [device.id for device in inventory.sites["lab"]] == ["lab.r1", "lab.r2", "lab.s1"]
+
+    def select(*expressions):
+        return [device.id for device in inventory.select(*expressions)]
+
+    assert select("*") == ["lab.r1", "lab.r2", "lab.s1", "dc.r1"]
+    assert select("lab.r*", "dc.r1") == ["lab.r1", "lab.r2", "dc.r1"]
+    assert select("model:mx*") == ["lab.r1", "lab.r2", "dc.r1"]
+    assert select("site:lab model:mx*") == ["lab.r1", "lab.r2"]
+    assert select("tag:core !tag:spare") == ["lab.r1"]
+    assert select("vars.system.hostname=*.lab") == ["lab.s1"]
+    assert select("lab.r9") == []
+
+    # indexes built by selectors are updated on import
+    inventory.imp0rt({"devices": [{"name": "r3", "model": "mx480"}]}, site="lab")
+    assert select("site:lab model:mx480") == ["lab.r1", "lab.r3"]
+
+
+def test_lazy():
+    inventory = Inventory()
+    inventory.imp0rt({"devices": [
+        {"name": "r1", "interfaces": {"ae0": {}}},
+        {"name": "r2", "interfaces": "ae0"},
+    ]})
+    r1, r2 = inventory.devices
+    assert not r1.loaded("vars") and not r1.loaded("info")
+    assert [device.id for device in inventory.select("vars.interfaces=ae0")] == ["r1", "r2"]
+    assert not r2.loaded("vars")
+    assert list(inventory.validate()) == ["r2"]
+    assert list(r1.vars.interfaces) == ["ae0"]
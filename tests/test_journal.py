@@ -0,0 +1,103 @@
+import asyncio
+import os
+from time import time
+
+import pytest
+
+from eznet.data import Data
+from eznet.journal import Journal, JOURNAL_FILE
+from eznet import planner
+
+
+def test_resume(tmp_path):
+    with Journal(tmp_path, "20240101-000000") as journal:
+        journal.mark("r1", "system.info")
+        journal.mark("r1", "system.info")
+        journal.mark("r2", "system.info")
+        journal.mark("r2")
+    assert Journal.exists(tmp_path, "20240101-000000")
+    assert not Journal.exists(tmp_path, "20240101-000001")
+
+    with Journal(tmp_path, "20240101-000000") as journal:
+        assert journal.done("r1", "system.info")
+        assert not journal.done("r1", "interfaces")
+        assert not journal.done("r1")
+        assert journal.done("r2")
+        assert journal.done("r2", "interfaces")
+    assert len((tmp_path / "20240101-000000" / JOURNAL_FILE).read_text().splitlines()) == 3
+
+
+def test_cleanup(tmp_path):
+    with Journal(tmp_path, "old"):
+        pass
+    with Journal(tmp_path, "new"):
+        pass
+    with Journal(tmp_path, "current"):
+        pass
+    old = time() - 3600
+    for name in ["old", "current"]:
+        os.utime(tmp_path / name / JOURNAL_FILE, (old, old))
+
+    assert Journal.cleanup(tmp_path, retention=60, keep="current") == ["old"]
+    assert not Journal.exists(tmp_path, "old")
+    assert Journal.exists(tmp_path, "new")
+    assert Journal.exists(tmp_path, "current")
+    assert Journal.cleanup(tmp_path / "none") == []
+
+    journal = Journal(tmp_path, "new")
+    journal.remove()
+    assert not (tmp_path / "new").exists()
+
+
+def test_truncated(tmp_path):
+    with Journal(tmp_path, "job") as journal:
+        journal.mark("r1", "a")
+    with open(tmp_path / "job" / JOURNAL_FILE, "a") as io:
+        io.write('{"device": "r1", "st')
+
+    with Journal(tmp_path, "job") as journal:
+        assert journal.done("r1", "a")
+        assert not journal.done("r1", "b")
+        journal.mark("r1", "b")
+    with Journal(tmp_path, "job") as journal:
+        assert journal.done("r1", "b")
+
+
+class Obj:
+    def __str__(self) -> str:
+        return "r1"
+
+
+def fetcher(name: str):
+    async def fetch(obj: Obj):
+        if name == "error":
+            await asyncio.sleep(0.05)
+            raise ValueError(name)
+        await asyncio.sleep(0)
+        return None if name == "none" else name
+    return fetch
+
+
+@pytest.mark.asyncio
+async def test_fetch_done(tmp_path):
+    obj = Obj()
+    a = Data(obj, fetcher("a"), name="a")
+    b = Data(obj, fetcher("b"), name="b", depends=[a])
+    c = Data(obj, fetcher("error"), name="c")
+    with Journal(tmp_path, "job") as journal:
+        with pytest.raises(ValueError):
+            await planner.fetch([b, c], done=lambda data: journal.mark(f"{obj}", data.name))
+        assert journal.done("r1", "a")
+        assert journal.done("r1", "b")
+        assert not journal.done("r1", "c")
+
+
+@pytest.mark.asyncio
+async def test_fetch_no_data(tmp_path):
+    obj = Obj()
+    a = Data(obj, fetcher("a"), name="a")
+    b = Data(obj, fetcher("none"), name="b")
+    with Journal(tmp_path, "job") as journal:
+        await planner.fetch([a, b], done=lambda data: journal.mark(f"{obj}", data.name))
+        assert journal.done("r1", "a")
+        assert not journal.done("r1", "b")
@@ -0,0 +1,64 @@
+import json
+
+import pytest
+import yaml
+
+from eznet import Inventory
+from eznet.inventory import loader
+
+
+def test_load(tmp_path, monkeypatch):
+    monkeypatch.setenv("USER", "user")
+    path = tmp_path / "inventory"
+    (path / "dc").mkdir(parents=True)
+    for i in range(loader.MIN_PARALLEL_FILES):
+        with open(path / f"site{i}.yaml", "w") as io:
+            yaml.safe_dump({"devices": [{"name": "r1", "ip": f"10.0.0.{i}"}]}, io)
+    with open(path / "dc" / "dc1.json", "w") as io:
+        json.dump({"devices": [{"name": "r1"}, {"name": "r2"}]}, io)
+    with open(path / "broken.yaml", "w") as io:
+        io.write("devices: [")
+
+    cache = tmp_path / "cache"
+    inventory = Inventory().load(path, cache=cache)
+    assert [device.id for device in inventory.devices] == [
+        "dc1.r1", "dc1.r2", "site0.r1", "site1.r1", "site2.r1", "site3.r1",
+    ]
+    assert len(list(cache.glob("*.pickle"))) == loader.MIN_PARALLEL_FILES + 1
+
+    # warm run: cached files are not parsed
+    parsed = []
+    parse_safe = loader.parse_safe
+    monkeypatch.setattr(loader, "parse_safe", lambda file: parsed.append(file) or parse_safe(file))
+    with open(path / "site0.yaml", "w") as io:
+        yaml.safe_dump({"devices": [{"name": "r1"}, {"name": "r2"}]}, io)
+    inventory = Inventory().load(path, cache=cache, workers=1)
+    assert sorted(file.name for file in parsed) == ["broken.yaml", "site0.yaml"]
+    assert inventory.device("site0.r2") is not None
+
+
+def test_load_jsonnet(tmp_path, monkeypatch):
+    pytest.importorskip("_jsonnet")
+    path = tmp_path / "inventory"
+    path.mkdir()
+    with open(path / "lib.libsonnet", "w") as io:
+        io.write('{ device(name):: { name: name, model: "mx480" } }')
+    with open(path / "lab.jsonnet", "w") as io:
+        io.write('local lib = import "lib.libsonnet"; { devices: [lib.device("r%d" % i) for i in [1, 2]] }')
+
+    cache = tmp_path / "cache"
+    inventory = Inventory().load(path, cache=cache)
+    assert [device.id for device in inventory.devices] == ["lab.r1", "lab.r2"]
+
+    parsed = []
+    parse_safe = loader.parse_safe
+    monkeypatch.setattr(loader, "parse_safe", lambda file: parsed.append(file) or parse_safe(file))
+    assert len(Inventory().load(path, cache=cache, workers=1).devices) == 2
+    assert parsed == []
+
+    # change of imported file invalidates evaluated output
+    with open(path / "lib.libsonnet", "w") as io:
+        io.write('{ device(name):: { name: name, model: "mx960" } }')
+    inventory = Inventory().load(path, cache=cache, workers=1)
+    assert [file.name for file in parsed] == ["lab.jsonnet"]
+    assert inventory.device("lab.r1").vars.model == "mx960"
@@ -0,0 +1,102 @@
+from datetime import datetime
+
+from lxml import etree
+
+from eznet.parsers.xml import Fields, Field, element_number, text
+from eznet.inventory.device.info.chassis import FW
+from eznet.inventory.device.info.interfaces import Interface
+from eznet.inventory.device.info.system import CoreDump
+
+XML = """<physical-interface>
+    <name>xe-0/0/1</name>
+    <admin-status>up</admin-status>
+    <oper-status>down</oper-status>
+    <speed>10Gbps</speed>
+    <traffic-statistics>
+        <input-bps>100</input-bps>
+        <input-pps>1</input-pps>
+        <output-bps>200</output-bps>
+        <output-pps>2</output-pps>
+    </traffic-statistics>
+    <logical-interface>
+        <name>xe-0/0/1.0</name>
+        <address-family>
+            <address-family-name>aenet</address-family-name>
+            <ae-bundle-name>ae1.0</ae-bundle-name>
+        </address-family>
+    </logical-interface>
+    <logical-interface>
+        <name>xe-0/0/1.16386</name>
+        <description>second</description>
+    </logical-interface>
+</physical-interface>"""
+
+
+def test_fields():
+    xml = etree.fromstring(XML)
+    fields = Fields(
+        name="name",
+        missing="missing",
+        input_bps=Field("traffic-statistics/input-bps", element_number),
+        units=Field("logical-interface/name", many=True),
+        description="logical-interface/description",
+    )
+    assert fields(xml) == {
+        "name": "xe-0/0/1",
+        "missing": None,
+        "input_bps": 100,
+        "units": ["xe-0/0/1.0", "xe-0/0/1.16386"],
+        "description": text(xml, "logical-interface/description"),
+    }
+
+
+def test_interface_from_xml():
+    interface = Interface.from_xml(etree.fromstring(XML))
+    assert interface.admin == "up"
+    assert interface.oper == "down"
+    assert interface.ae == "ae1"
+    assert interface.traffic.output_bps == 200
+    assert list(interface.units) == [0, 16386]
+    assert list(interface.units[0].family) == ["aenet"]
+    assert interface.units[16386].description == "second"
+
+
+def test_core_dumps_from_xml():
+    xml = etree.fromstring("""<rpc-reply>
+    <multi-routing-engine-results>
+        <multi-routing-engine-item>
+            <re-name>re0</re-name>
+            <directory-list>
+                <directory>
+                    <file-information>
+                        <file-name>/var/crash/core.rpd.0.gz</file-name>
+                        <file-size>1000</file-size>
+                        <file-date seconds="1704067200"/>
+                    </file-information>
+                </directory>
+            </directory-list>
+            <directory-list style="host">
+                <directory>
+                    <file-information>
+                        <file-name>/var/crash/core.host.gz</file-name>
+                        <file-size>2000</file-size>
+                    </file-information>
+                </directory>
+            </directory-list>
+        </multi-routing-engine-item>
+    </multi-routing-engine-results>
+</rpc-reply>""")
+    assert CoreDump.parse(xml) == [
+        CoreDump("/var/crash/core.rpd.0.gz", 1000, datetime.fromtimestamp(1704067200), "re0"),
+        CoreDump("/var/crash/core.host.gz", 2000, None, "re0", True),
+    ]
+
+
+def test_fw_from_xml():
+    xml = etree.fromstring("""<chassis-module>
+    <name>FPC 0</name>
+    <firmware><type>ROM</type><firmware-version> 1.0 </firmware-version></firmware>
+    <firmware><type>ONIE/DIAG</type><firmware-version>2.0/3.0</firmware-version></firmware>
+    <firmware><type>O/S</type></firmware>
+</chassis-module>""")
+    assert FW.from_xml(xml) == FW(fw={"ROM": "1.0", "ONIE": "2.0", "DIAG": "3.0"})
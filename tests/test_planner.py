@@ -0,0 +1,94 @@
+import asyncio
+
+import pytest
+
+from eznet.data import Data
+from eznet import Device, planner
+
+
+class Obj:
+    def __init__(self) -> None:
+        self.log = []
+        self.running = 0
+        self.max_running = 0
+
+
+def fetcher(name: str):
+    async def fetch(obj: Obj):
+        obj.running += 1
+        obj.max_running = max(obj.max_running, obj.running)
+        await asyncio.sleep(0.01)
+        obj.log.append(name)
+        obj.running -= 1
+        return name
+    return fetch
+
+
+def test_plan_cycle():
+    obj = Obj()
+    a = Data(obj, fetcher("a"))
+    b = Data(obj, fetcher("b"), depends=[a])
+    a.depends.append(b)
+    with pytest.raises(planner.CycleError):
+        planner.plan([a])
+
+
+@pytest.mark.asyncio
+async def test_fetch():
+    obj = Obj()
+    a = Data(obj, fetcher("a"))
+    b = Data(obj, fetcher("b"), depends=[a])
+    c = Data(obj, fetcher("c"))
+    d = Data(obj, fetcher("d"))
+    results = await planner.fetch([b, c, d], limit=2)
+    assert results == {a: "a", b: "b", c: "c", d: "d"}
+    assert obj.log.index("a") < obj.log.index("b")
+    assert obj.max_running == 2
+
+
+@pytest.mark.asyncio
+async def test_fetch_limit_per_object():
+    obj = Obj()
+
+    async def nested(obj: Obj):
+        await planner.gather(obj, *(fetcher(f"n{i}")(obj) for i in range(6)))
+        return "nested"
+
+    first = [Data(obj, fetcher(f"a{i}")) for i in range(3)] + [Data(obj, nested)]
+    second = [Data(obj, fetcher(f"b{i}")) for i in range(3)] + [Data(obj, nested)]
+    # limit is shared by concurrent planner calls and nested requests, without deadlock
+    await asyncio.wait_for(asyncio.gather(planner.fetch(first), planner.fetch(second)), 1)
+    assert len(obj.log) == 18
+    assert obj.max_running == planner.MAX_SIMULTANEOUS_FETCHES
+
+
+@pytest.mark.asyncio
+async def test_fetch_device_shards():
+    log = []
+
+    async def fetch_fpc(device):
+        await asyncio.sleep(0.01)
+        log.append("chassis.fpc")
+        return {}
+
+    async def run_xml_cmd(cmd, timeout=None):
+        log.append(cmd)
+        return None
+
+    def device():
+        device = Device(name="r1")
+        device.info.chassis.fpc.fetcher = fetch_fpc
+        device.junos.run_xml_cmd = run_xml_cmd
+        return device
+
+    # plain fetch of interfaces does not wait for chassis.fpc
+    r1 = device()
+    assert [data for data, _ in planner.plan([r1.info.interfaces])] == [r1.info.interfaces]
+    await planner.fetch([r1.info.interfaces])
+    assert log == ["show interfaces"]
+
+    # sharded fetch plans shards by FPCs within the device limit, without deadlock
+    log.clear()
+    r1 = device()
+    await asyncio.wait_for(planner.fetch([(r1.info.interfaces, {"shard": True})], limit=1), 1)
+    assert log == ["chassis.fpc", "show interfaces"]
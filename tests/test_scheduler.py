@@ -0,0 +1,67 @@
+import asyncio
+from collections import Counter
+
+import pytest
+
+from eznet import Device
+from eznet.scheduler import Scheduler
+
+
+@pytest.mark.asyncio
+async def test_scheduler():
+    polls = []
+    devices = [Device(name=f"r{i}") for i in range(4)]
+    for device in devices:
+        for data in (device.info.system.alarms, device.info.system.sw):
+            async def fetch(device, name=data.name, **kwargs):
+                polls.append((asyncio.get_running_loop().time(), device.id, name, kwargs))
+                return name
+            data.fetcher = fetch
+
+    scheduler = Scheduler(
+        intervals={"system.alarms": 0.05, "system.sw": 0.4},
+        kwargs=lambda device, name: {"both_re": True} if name == "system.alarms" else {},
+        jitter=0,
+    )
+    await scheduler.run(devices, duration=0.3)
+
+    counts = Counter((device_id, name) for _, device_id, name, _ in polls)
+    for device in devices:
+        assert 5 <= counts[device.id, "system.alarms"] <= 7
+        assert device.info.system.alarms.v == "system.alarms"
+    # first polls of data spread over its interval
+    first_sw = sorted(ts for ts, _, name, _ in polls if name == "system.sw")
+    assert len(first_sw) == 3
+    assert first_sw[-1] - first_sw[0] >= 0.15
+    assert all(kwargs == {"both_re": True} for _, _, name, kwargs in polls if name == "system.alarms")
+    assert scheduler.stats.errors == 0
+
+    # removed devices are not polled anymore
+    scheduler.remove(devices[1:])
+    polls.clear()
+    await scheduler.run(duration=0.1)
+    assert {device_id for _, device_id, _, _ in polls} == {"r0"}
+
+
+@pytest.mark.asyncio
+async def test_scheduler_replace():
+    polls = []
+
+    def device():
+        device = Device(name="r1")
+
+        async def fetch(device, **kwargs):
+            polls.append(device)
+            return "alarms"
+        device.info.system.alarms.fetcher = fetch
+        return device
+
+    old, new = device(), device()
+    scheduler = Scheduler(intervals={"system.alarms": 0.05}, jitter=0)
+    scheduler.add([old])
+    # new object of the same device replaces old one, stale remove is ignored
+    scheduler.add([new])
+    scheduler.remove([old])
+    await scheduler.run(duration=0.2)
+    assert polls and all(device is new for device in polls)
+    assert scheduler.devices == {"r1": new}
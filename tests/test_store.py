@@ -0,0 +1,21 @@
+from datetime import datetime
+
+from eznet import Device
+from eznet.inventory.device.info.system import Info
+from eznet.store import Store
+
+
+def test_store(tmp_path):
+    info = Info(hostname="r1", sw_family="junos", sw_version="23.4R1", hw_model="mx480", hw_sn="sn")
+    ts = datetime(2024, 1, 1, 12, 0)
+
+    with Store(tmp_path / "store.sqlite") as store:
+        store.save("site.r1", "system.info", info, ts)
+        assert store.load("site.r1", "system.info") == [(info, ts)]
+        assert store.load("site.r1", "system.alarms") == []
+
+    device = Device(name="r1", site="site")
+    with Store(tmp_path / "store.sqlite") as store:
+        store.attach([device])
+        assert device.info.system.info() == info
+        assert device.info.system.info.ts == ts
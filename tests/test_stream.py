@@ -0,0 +1,44 @@
+import json
+from io import StringIO
+
+from rich.console import Console
+
+from eznet import Device
+from eznet.inventory.device.info.system import Info
+from eznet.stream import JsonLines, Rows
+
+
+def device():
+    device = Device(name="r1", site="lab")
+    device.info.system.info.data.append(Info(
+        hostname="r1.lab", sw_family="junos", sw_version="23.4R1", hw_model="mx480", hw_sn=None,
+    ))
+    return device
+
+
+def test_json_lines():
+    io = StringIO()
+    stream = JsonLines(io)
+    stream.device(device(), None, 1.5)
+    stream.device(Device(name="r2"), ConnectionRefusedError(), 0.1)
+    stream.summary(2)
+    records = [json.loads(line) for line in io.getvalue().splitlines()]
+    assert records[0] == {
+        "device": "lab.r1", "status": "ok", "error": None, "duration": 1.5,
+        "data": {"system.info": {
+            "hostname": "r1.lab", "sw_family": "junos", "sw_version": "23.4R1", "hw_model": "mx480", "hw_sn": None,
+        }},
+    }
+    assert records[1]["error"] == "ConnectionRefusedError"
+    assert records[2] == {"summary": {"devices": 2, "errors": 1, "duration": 2}}
+
+
+def test_rows():
+    console = Console(file=StringIO(), width=120)
+    stream = Rows(console)
+    stream.device(device(), None, 1.5)
+    stream.device(Device(name="r2"), ConnectionRefusedError("refused"), 0.1)
+    lines = [line for line in console.file.getvalue().splitlines() if line.strip()]
+    assert lines[0].split()[:3] == ["device", "status", "duration"]
+    assert lines[1].split()[:6] == ["lab.r1", "ok", "1.5s", "r1.lab", "mx480", "23.4R1"]
+    assert lines[2].split()[:3] == ["r2", "error", "0.1s"]
@@ -0,0 +1,63 @@
+from eznet import Device
+from eznet.inventory.device.info.lldp import Neighbor, Local
+from eznet.topology import Topology, Status
+
+
+def test_topology():
+    r1 = Device(name="r1", site="s", interfaces={
+        "ae0": {"members": {
+            "xe-0/0/0": {"peer": {"device": "r2", "interface": "xe-0/0/0"}},
+            "xe-0/0/1": {"peer": {"device": "r2", "interface": "xe-0/0/1"}},
+            "xe-0/0/2": {"peer": {"device": "r3", "interface": "xe-0/0/2"}},
+            "xe-0/0/3": {"peer": {"device": "r2", "interface": "xe-0/0/3"}},
+        }},
+    })
+    r2 = Device(name="r2", site="s")
+    r1.info.lldp.local.data.append(Local(chassis_id="00:00:00:00:00:01", system_name="r1"))
+    r2.info.lldp.local.data.append(Local(chassis_id="00:00:00:00:00:02", system_name="r2.example.net"))
+    r1.info.lldp.neighbors.data.append({
+        "xe-0/0/0": Neighbor(system_name="r2", chassis_id="00:00:00:00:00:02", port_id="xe-0/0/0"),
+        "xe-0/0/1": Neighbor(system_name="r2", chassis_id="00:00:00:00:00:02", port_id="xe-0/0/5"),
+        "xe-0/0/2": Neighbor(system_name="r2", chassis_id="00:00:00:00:00:02", port_id="xe-0/0/2"),
+    })
+
+    topology = Topology.build([r1, r2])
+    assert topology.peer("s.r1", "xe-0/0/0").peer_device == "s.r2"
+    assert {cabling.interface: cabling.status for cabling in topology.audit()} == {
+        "xe-0/0/0": Status.PASS,
+        "xe-0/0/1": Status.WRONG_INTERFACE,
+        "xe-0/0/2": Status.WRONG_DEVICE,
+        "xe-0/0/3": Status.NO_LLDP,
+    }
+
+
+def test_topology_invalid_vars():
+    r1 = Device(name="r1", site="s", interfaces={
+        "ae0": {"members": {"xe-0/0/0": {"peer": {"device": "r2", "interface": "xe-0/0/0"}}}},
+    })
+    r2 = Device(name="r2", site="s", interfaces={"xe-0/0/0": {"members": 1}})
+    assert r2.validate() is not None
+
+    topology = Topology.build([r1, r2])
+    assert [(cabling.device, cabling.interface) for cabling in topology.audit()] == [("s.r1", "xe-0/0/0")]
+
+
+def test_topology_same_names():
+    # r1 of both sites see `r2` without chassis id
+    devices = {site: [Device(name="r1", site=site), Device(name="r2", site=site)] for site in ["a", "b"]}
+    for site, (r1, r2) in devices.items():
+        r1.info.lldp.neighbors.data.append({
+            "xe-0/0/0": Neighbor(system_name="r2", chassis_id=None, port_id="xe-0/0/0"),
+        })
+    third = Device(name="r3", site="c")
+    third.info.lldp.neighbors.data.append({
+        "xe-0/0/0": Neighbor(system_name="r2", chassis_id=None, port_id="xe-0/0/0"),
+    })
+
+    topology = Topology.build([*devices["a"], *devices["b"], third])
+    assert topology.peer("a.r1", "xe-0/0/0").peer_device == "a.r2"
+    assert topology.peer("b.r1", "xe-0/0/0").peer_device == "b.r2"
+    # ambiguous out of the site
+    assert topology.peer("c.r3", "xe-0/0/0").peer_device is None
+    assert topology.device_id("r2") is None
+    assert topology.device_id("a.r2") == "a.r2"
@@ -0,0 +1,64 @@
+import asyncio
+
+import yaml
+
+from eznet import Inventory
+from eznet.inventory.watcher import Watcher
+
+
+def dump(path, devices):
+    with open(path, "w") as io:
+        yaml.safe_dump({"devices": devices}, io)
+
+
+def test_reload(tmp_path, monkeypatch):
+    monkeypatch.setenv("USER", "user")
+    dump(tmp_path / "s1.yaml", [{"name": "r1", "ip": "10.0.0.1"}, {"name": "r2", "ip": "10.0.0.2"}])
+    dump(tmp_path / "s2.yaml", [{"name": "r1", "ip": "10.0.1.1"}])
+    inventory = Inventory().load(tmp_path)
+    watcher = Watcher(inventory)
+    assert not watcher.reload()
+
+    r1, r2 = inventory.sites["s1"]
+    s2_r1 = inventory.device("s2.r1")
+    ssh = r1.ssh
+    dump(tmp_path / "s1.yaml", [
+        {"name": "r1", "ip": "10.0.0.1", "model": "mx480"},
+        {"name": "r2", "ip": "10.0.0.22"},
+        {"name": "r3", "ip": "10.0.0.3"},
+    ])
+    (tmp_path / "s3.yaml").write_text("devices: [")
+    diff = watcher.reload()
+    assert [device.id for device in diff.added] == ["s1.r3"]
+    assert diff.modified == [r1] and r1.ssh is ssh and r1.vars.model == "mx480"
+    assert [(old, new.ssh.ip) for old, new in diff.replaced] == [(r2, "10.0.0.22")]
+    assert inventory.device("s2.r1") is s2_r1
+    assert [device.id for device in inventory.devices] == ["s1.r1", "s1.r2", "s2.r1", "s1.r3"]
+    assert [device.id for device in inventory.select("model:mx480")] == ["s1.r1"]
+
+    (tmp_path / "s2.yaml").unlink()
+    diff = watcher.reload()
+    assert diff.removed == [s2_r1]
+    assert "s2" not in inventory.sites
+
+
+def test_watch(tmp_path, monkeypatch):
+    monkeypatch.setenv("USER", "user")
+    dump(tmp_path / "s1.yaml", [{"name": "r1"}])
+    inventory = Inventory().load(tmp_path)
+    watcher = Watcher(inventory, interval=0.01)
+
+    async def main():
+        diffs = []
+        task = asyncio.create_task(watcher.watch(diffs.append))
+        await asyncio.sleep(0.05)
+        dump(tmp_path / "s1.yaml", [{"name": "r1"}, {"name": "r2"}])
+        for _ in range(100):
+            if diffs:
+                break
+            await asyncio.sleep(0.01)
+        task.cancel()
+        return diffs
+
+    diffs = asyncio.run(main())
+    assert [device.id for device in diffs[0].added] == ["s1.r2"]